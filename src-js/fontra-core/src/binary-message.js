@@ -0,0 +1,54 @@
+// Decoder for the "binary" websocket message encoding, see
+// src/fontra/core/binarymessage.py for a description of the format.
+// In short: a JSON header, followed by a binary section containing packed
+// little endian float64 arrays and raw bytes, which are referenced from the
+// header by byte offset and length.
+
+const ARRAY_MARKER_KEY = "__binary-array__";
+const BYTES_MARKER_KEY = "__binary-bytes__";
+
+export function decodeBinaryMessage(buffer) {
+  const dataView = new DataView(buffer);
+  const headerLength = dataView.getUint32(0, true);
+  const header = new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength));
+  let segmentsStart = 4 + headerLength;
+  segmentsStart += (8 - (segmentsStart % 8)) % 8;
+
+  return JSON.parse(header, (key, value) => {
+    if (value === null || typeof value !== "object") {
+      return value;
+    }
+    const arrayInfo = value[ARRAY_MARKER_KEY];
+    const bytesInfo = value[BYTES_MARKER_KEY];
+    if (
+      (arrayInfo === undefined && bytesInfo === undefined) ||
+      Object.keys(value).length !== 1
+    ) {
+      return value;
+    }
+    if (arrayInfo !== undefined) {
+      const [offset, count] = arrayInfo;
+      return Array.from(new Float64Array(buffer, segmentsStart + offset, count));
+    } else {
+      const [offset, length] = bytesInfo;
+      return new Uint8Array(buffer, segmentsStart + offset, length);
+    }
+  });
+}
+
+export function joinMessageChunks(chunks, encoding) {
+  // Reassemble a message that was sent in chunks by the server: the chunks
+  // are Uint8Arrays, containing either UTF-8 encoded JSON ("json" encoding)
+  // or a binary message ("binary" encoding)
+  const totalLength = chunks.reduce((total, chunk) => total + chunk.length, 0);
+  const data = new Uint8Array(totalLength);
+  let offset = 0;
+  for (const chunk of chunks) {
+    data.set(chunk, offset);
+    offset += chunk.length;
+  }
+  if (encoding === "json") {
+    return JSON.parse(new TextDecoder().decode(data));
+  }
+  return decodeBinaryMessage(data.buffer);
+}
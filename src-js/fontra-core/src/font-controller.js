@@ -13,7 +13,6 @@ import { FontSourcesInstancer } from "./font-sources-instancer.js";
 import { StaticGlyphController, VariableGlyphController } from "./glyph-controller.js";
 import { KerningController } from "./kerning-controller.js";
 import { LRUCache } from "./lru-cache.js";
-import { setPopFirst } from "./set-ops.js";
 import { TaskPool } from "./task-pool.js";
 import {
   assert,
@@ -40,6 +39,7 @@ import {
 const GLYPH_CACHE_SIZE = 2000;
 const BACKGROUND_IMAGE_CACHE_SIZE = 100;
 const NUM_TASKS = 12;
+const GLYPH_BATCH_SIZE = 100; // max number of glyphs per getGlyphs() call
 
 export class FontController {
   /**
@@ -362,6 +362,9 @@ export class FontController {
     // will resolve once all requested glyphs have been loaded.
     // The loading will be done in parallel: this is much faster if
     // the server supports parallelism (for example fontra-rcjk).
+    // All glyphs of a round (the requested glyphs, then their components,
+    // etc.) are requested at once, so they are fetched in batches, see
+    // _fetchGlyph().
     if (this._loadGlyphsTodo) {
       for (const glyphName of glyphNames) {
         if (!this._loadGlyphsDone.has(glyphName)) {
@@ -382,24 +385,25 @@ export class FontController {
         }
         done.add(glyphName);
 
-        await this.getGlyph(glyphName);
+        try {
+          await this.getGlyph(glyphName);
+        } catch (error) {
+          console.error(error);
+          return;
+        }
 
         for (const subGlyphName of this.iterGlyphsMadeOfRecursively(glyphName)) {
           todo.add(subGlyphName);
         }
       };
 
-      const pool = new TaskPool(NUM_TASKS);
-
       const t = performance.now();
       let count = 0;
       while (todo.size) {
-        while (todo.size) {
-          const glyphName = setPopFirst(todo);
-          count++;
-          await pool.schedule(async () => await loadGlyph(glyphName));
-        }
-        await pool.wait();
+        const glyphNames = [...todo];
+        todo.clear();
+        count += glyphNames.length;
+        await Promise.all(glyphNames.map(loadGlyph));
       }
       const elapsed = performance.now() - t;
       // console.log("loadGlyphs", count, elapsed);
@@ -427,7 +431,7 @@ export class FontController {
   }
 
   async _getGlyph(glyphName) {
-    let glyph = await this.font.getGlyph(glyphName);
+    let glyph = await this._fetchGlyph(glyphName);
     if (glyph !== null) {
       glyph = this.makeVariableGlyphController(VariableGlyph.fromObject(glyph));
       this.updateGlyphDependencies(glyph);
@@ -435,6 +439,48 @@ export class FontController {
     return glyph;
   }
 
+  _fetchGlyph(glyphName) {
+    // Glyphs that are requested during the same event loop turn, for example
+    // those of all cells that scrolled into view, are fetched together with
+    // getGlyphs(), instead of with a getGlyph() call each. Large batches are
+    // split, so the first glyphs arrive while the server still reads the others.
+    if (!this._glyphFetchQueue) {
+      this._glyphFetchQueue = new Map();
+      setTimeout(() => this._fetchQueuedGlyphs(), 0);
+    }
+    let request = this._glyphFetchQueue.get(glyphName);
+    if (!request) {
+      request = {};
+      request.promise = new Promise((resolve, reject) => {
+        request.resolve = resolve;
+        request.reject = reject;
+      });
+      this._glyphFetchQueue.set(glyphName, request);
+    }
+    return request.promise;
+  }
+
+  _fetchQueuedGlyphs() {
+    const requests = this._glyphFetchQueue;
+    delete this._glyphFetchQueue;
+    const glyphNames = [...requests.keys()];
+    for (let i = 0; i < glyphNames.length; i += GLYPH_BATCH_SIZE) {
+      const batchGlyphNames = glyphNames.slice(i, i + GLYPH_BATCH_SIZE);
+      this.font.getGlyphs(batchGlyphNames).then(
+        (glyphs) => {
+          for (const glyphName of batchGlyphNames) {
+            requests.get(glyphName).resolve(glyphs[glyphName] ?? null);
+          }
+        },
+        (error) => {
+          for (const glyphName of batchGlyphNames) {
+            requests.get(glyphName).reject(error);
+          }
+        }
+      );
+    }
+  }
+
   makeVariableGlyphController(glyph) {
     return new VariableGlyphController(glyph, this);
   }
@@ -1,3 +1,4 @@
+import { decodeBinaryMessage, joinMessageChunks } from "./binary-message.js";
 import { RemoteError } from "./errors.js";
 
 export async function getRemoteProxy(wsURL) {
@@ -35,6 +36,7 @@ export class RemoteObject {
 
     this.wsURL = wsURL;
     this._callReturnCallbacks = {};
+    this._messageChunks = {};
     this._handlers = {
       close: this._default_onclose,
       error: this._default_onerror,
@@ -88,6 +90,7 @@ export class RemoteObject {
       throw new Error("assert -- trying to open new websocket while we still have one");
     }
     this.websocket = new WebSocket(this.wsURL);
+    this.websocket.binaryType = "arraybuffer";
     this.websocket.onmessage = (event) => this._handleIncomingMessage(event);
     this._connectPromise = new Promise((resolve, reject) => {
       this.websocket.onopen = (event) => {
@@ -97,6 +100,7 @@ export class RemoteObject {
         this.websocket.onerror = (event) => this._trigger("error", event);
         const message = {
           "client-uuid": this.clientUUID,
+          "encoding": "binary",
         };
         this.websocket.send(JSON.stringify(message));
       };
@@ -118,7 +122,17 @@ export class RemoteObject {
   }
 
   async _handleIncomingMessage(event) {
-    const message = JSON.parse(event.data);
+    let message =
+      event.data instanceof ArrayBuffer
+        ? decodeBinaryMessage(event.data)
+        : JSON.parse(event.data);
+    if (message["chunked-message-id"] !== undefined) {
+      message = this._addMessageChunk(message);
+      if (message === undefined) {
+        // More chunks are to come
+        return;
+      }
+    }
     const clientCallID = message["client-call-id"];
     const serverCallID = message["server-call-id"];
     const initializationError = message["initialization-error"];
@@ -158,6 +172,21 @@ export class RemoteObject {
     }
   }
 
+  _addMessageChunk(chunkMessage) {
+    const chunkedMessageID = chunkMessage["chunked-message-id"];
+    let chunks = this._messageChunks[chunkedMessageID];
+    if (chunks === undefined) {
+      chunks = [];
+      this._messageChunks[chunkedMessageID] = chunks;
+    }
+    chunks.push(chunkMessage["chunk"]);
+    if (chunkMessage["more"]) {
+      return undefined;
+    }
+    delete this._messageChunks[chunkedMessageID];
+    return joinMessageChunks(chunks, chunkMessage["encoding"]);
+  }
+
   async _doCall(methodName, args) {
     // console.log("--- doCall", methodName);
     const clientCallID = this._getNextClientCallID();
@@ -0,0 +1,78 @@
+import { expect } from "chai";
+
+import { decodeBinaryMessage, joinMessageChunks } from "@fontra/core/binary-message.js";
+
+function encodeBinaryMessage(header, arrays) {
+  // Mirrors src/fontra/core/binarymessage.py
+  const headerBytes = new TextEncoder().encode(JSON.stringify(header));
+  let arraysStart = 4 + headerBytes.length;
+  arraysStart += (8 - (arraysStart % 8)) % 8;
+  const numItems = arrays.reduce((total, array) => total + array.length, 0);
+  const buffer = new ArrayBuffer(arraysStart + 8 * numItems);
+  new DataView(buffer).setUint32(0, headerBytes.length, true);
+  new Uint8Array(buffer, 4, headerBytes.length).set(headerBytes);
+  new Float64Array(buffer, arraysStart, numItems).set(arrays.flat());
+  return buffer;
+}
+
+describe("decodeBinaryMessage", () => {
+  it("no arrays", () => {
+    const message = { "client-call-id": 1, "return-value": { A: [65, 97] } };
+    expect(decodeBinaryMessage(encodeBinaryMessage(message, []))).to.deep.equal(
+      message
+    );
+  });
+
+  it("arrays", () => {
+    const header = {
+      "client-call-id": 2,
+      "return-value": [
+        { coordinates: { "__binary-array__": [0, 4] } },
+        { coordinates: { "__binary-array__": [32, 0] } },
+        { coordinates: { "__binary-array__": [32, 2] } },
+      ],
+    };
+    const buffer = encodeBinaryMessage(header, [
+      [0, 1.5, 100, -20],
+      [],
+      [3, 4],
+    ]);
+    expect(decodeBinaryMessage(buffer)).to.deep.equal({
+      "client-call-id": 2,
+      "return-value": [
+        { coordinates: [0, 1.5, 100, -20] },
+        { coordinates: [] },
+        { coordinates: [3, 4] },
+      ],
+    });
+  });
+
+  it("bytes", () => {
+    const header = { chunk: { "__binary-bytes__": [0, 3] } };
+    const buffer = encodeBinaryMessage(header, []);
+    const data = new Uint8Array(buffer.byteLength + 8);
+    data.set(new Uint8Array(buffer));
+    data.set([1, 2, 3], buffer.byteLength); // the bytes segment
+    const message = decodeBinaryMessage(data.buffer);
+    expect(Array.from(message.chunk)).to.deep.equal([1, 2, 3]);
+  });
+});
+
+describe("joinMessageChunks", () => {
+  it("json chunks", () => {
+    const data = new TextEncoder().encode('{"a": [1, 2], "b": "\u00e9\u00e8"}');
+    // Split the UTF-8 encoded text in the middle of a character
+    const chunks = [data.slice(0, 5), data.slice(5, 21), data.slice(21)];
+    expect(joinMessageChunks(chunks, "json")).to.deep.equal({
+      a: [1, 2],
+      b: "\u00e9\u00e8",
+    });
+  });
+
+  it("binary chunks", () => {
+    const message = { coordinates: { "__binary-array__": [0, 2] } };
+    const data = new Uint8Array(encodeBinaryMessage(message, [[1, 2]]));
+    const chunks = [data.slice(0, 5), data.slice(5, 20), data.slice(20)];
+    expect(joinMessageChunks(chunks, "binary")).to.deep.equal({ coordinates: [1, 2] });
+  });
+});
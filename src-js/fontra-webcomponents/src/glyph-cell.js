@@ -20,6 +20,24 @@ const UNSCALED_CELL_HEIGHT = 75;
 
 const cellObserver = new IntersectionObserver(
   (entries, observer) => {
+    // Load the glyphs of all cells that became visible at once, so they are
+    // fetched in batches rather than one by one by the glyph instance requests
+    const visibleGlyphNames = new Map(); // font controller -> glyph names
+    for (const entry of entries) {
+      if (entry.intersectionRatio > 0) {
+        const cell = entry.target;
+        if (!visibleGlyphNames.has(cell.fontController)) {
+          visibleGlyphNames.set(cell.fontController, []);
+        }
+        visibleGlyphNames.get(cell.fontController).push(cell.glyphName);
+      }
+    }
+    for (const [fontController, glyphNames] of visibleGlyphNames) {
+      if (!fontController.areGlyphsCached(glyphNames)) {
+        fontController.loadGlyphs(glyphNames);
+      }
+    }
+
     entries.forEach((entry) => {
       const cell = entry.target;
       if (entry.intersectionRatio > 0) {
@@ -31,6 +31,11 @@ def main() -> None:
         "--launch", action="store_true", help="Launch the default browser"
     )
     parser.add_argument("--content-root", type=pathlib.Path)
+    parser.add_argument(
+        "--no-websocket-compression",
+        action="store_true",
+        help="Disable permessage-deflate compression of websocket messages",
+    )
     parser.add_argument(
         "-V",
         "--version",
@@ -70,6 +75,7 @@ def main() -> None:
         launchWebBrowser=args.launch,
         versionToken=secrets.token_hex(4),
         contentRoot=args.content_root,
+        websocketCompression=not args.no_websocket_compression,
     )
     server.setup()
     server.run()
@@ -1,20 +1,112 @@
+from __future__ import annotations
+
 import argparse
 import asyncio
+import concurrent.futures
+import hashlib
+import json
 import logging
+import os
 import pathlib
 import shutil
-from contextlib import aclosing, asynccontextmanager
-
+from contextlib import AsyncExitStack, aclosing, asynccontextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from typing import AsyncContextManager, Callable, Collection
+
+from ..core.classes import ImageData, VariableGlyph, unstructure
+from ..core.filecache import FileStatCache, getProjectCachePath
+from ..core.iterglyphs import iterGlyphs
 from ..core.protocols import (
+    GlyphFingerprints,
     ReadableFontBackend,
     ReadBackgroundImage,
     WritableFontBackend,
     WriteBackgroundImage,
+    WriteGlyphs,
 )
 from . import getFileSystemBackend, newFileSystemBackend
 
 logger = logging.getLogger(__name__)
 
+# The number of glyphs passed to a single putGlyphs() call, for backends that
+# support bulk writes. This bounds the number of glyphs kept in memory.
+GLYPH_WRITE_BATCH_SIZE = 1000
+
+# The number of glyphs read from the source with a single iterGlyphs() call
+GLYPH_READ_CHUNK_SIZE = 64
+
+# The number of glyphs a worker process reads per job, when copying with
+# multiple processes
+GLYPH_READ_SHARD_SIZE = 64
+
+# The name and format version of the incremental copy manifest, which is stored
+# in the persistent cache folder, see core/filecache.py
+COPY_MANIFEST_CACHE_NAME = "copy-manifest"
+COPY_MANIFEST_FORMAT_VERSION = 2
+
+
+@dataclass(kw_only=True)
+class CopyManifest:
+    # What an incremental copy wrote to the destination: for each glyph, the
+    # source fingerprint and the content hash of the glyph. A glyph whose source
+    # fingerprint didn't change is not read again, and a glyph whose content
+    # hash didn't change is not written again. The source fingerprints come from
+    # the source backend (see GlyphFingerprints in core/protocols.py): without
+    # them every glyph is read and hashed.
+    glyphs: FileStatCache = field(
+        default_factory=lambda: FileStatCache(
+            path=None, formatVersion=COPY_MANIFEST_FORMAT_VERSION
+        )
+    )
+    sourceFingerprints: dict[str, list | None] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: pathlib.Path | None) -> CopyManifest:
+        return cls(glyphs=FileStatCache.load(path, COPY_MANIFEST_FORMAT_VERSION))
+
+    def save(self) -> None:
+        self.glyphs.save()
+
+    async def findChangedGlyphs(
+        self,
+        sourceBackend: ReadableFontBackend,
+        glyphMap: dict[str, list[int]],
+        glyphNames: list[str],
+    ) -> list[str]:
+        # Return the glyphs whose source fingerprint changed, or is unknown. The
+        # fingerprints are taken before the glyphs are read, so a glyph that is
+        # modified during the copy is copied again next time.
+        if not isinstance(sourceBackend, GlyphFingerprints):
+            return glyphNames
+        changedGlyphNames = []
+        for glyphName in glyphNames:
+            fingerprint = await sourceBackend.getGlyphFingerprint(glyphName)
+            if fingerprint is not None:
+                fingerprint = [fingerprint, glyphMap.get(glyphName, [])]
+            self.sourceFingerprints[glyphName] = fingerprint
+            found, _ = self.glyphs.lookup(glyphName, fingerprint)
+            if not found:
+                changedGlyphNames.append(glyphName)
+        return changedGlyphNames
+
+    def updateGlyph(
+        self, glyphName: str, glyph: VariableGlyph, codePoints: list[int]
+    ) -> bool:
+        # Record the glyph, return True if its contents changed
+        glyphHash = hashlib.sha256(
+            json.dumps([unstructure(glyph), codePoints], sort_keys=True).encode()
+        ).hexdigest()
+        entry = self.glyphs.entries.get(glyphName)
+        # Store an entry even without a fingerprint, for the content hash
+        fingerprint = self.sourceFingerprints.get(glyphName)
+        self.glyphs.entries[glyphName] = [fingerprint, glyphHash]
+        self.glyphs.dirty = True
+        return entry is None or entry[1] != glyphHash
+
+    def prune(self, glyphNames: Collection[str]) -> None:
+        self.glyphs.prune(glyphNames)
+
 
 async def copyFont(
     sourceBackend: ReadableFontBackend,
@@ -22,9 +114,18 @@ async def copyFont(
     *,
     glyphNames=None,
     numTasks=1,
+    numProcesses=1,
+    sourcePath=None,
+    sourceOpener: SourceOpener | None = None,
     progressInterval=0,
     continueOnError=False,
+    manifest: CopyManifest | None = None,
 ) -> None:
+    # With numProcesses > 1, glyphs are read by worker processes, which each open
+    # their own source backend, with sourceOpener, or else from sourcePath.
+    # If a manifest is given, the destination is updated incrementally: glyphs
+    # that did not change since the manifest was written are not read or not
+    # written again, and glyphs that no longer exist in the source are deleted.
     if glyphNames is not None:
         from ..workflow.actions.subset import SubsetGlyphs
 
@@ -38,8 +139,12 @@ async def copyFont(
             sourceBackend,
             destBackend,
             numTasks=numTasks,
+            numProcesses=numProcesses,
+            sourcePath=sourcePath,
+            sourceOpener=sourceOpener,
             progressInterval=progressInterval,
             continueOnError=continueOnError,
+            manifest=manifest,
         )
 
 
@@ -48,8 +153,12 @@ async def _copyFont(
     destBackend: WritableFontBackend,
     *,
     numTasks=1,
+    numProcesses=1,
+    sourcePath=None,
+    sourceOpener: SourceOpener | None = None,
     progressInterval=0,
     continueOnError=False,
+    manifest: CopyManifest | None = None,
 ) -> None:
     await destBackend.putUnitsPerEm(await sourceBackend.getUnitsPerEm())
     await destBackend.putFontInfo(await sourceBackend.getFontInfo())
@@ -58,6 +167,60 @@ async def _copyFont(
     await destBackend.putCustomData(await sourceBackend.getCustomData())
     glyphMap = await sourceBackend.getGlyphMap()
     glyphNamesToCopy = sorted(glyphMap)
+    if manifest is not None:
+        glyphNamesToCopy = await manifest.findChangedGlyphs(
+            sourceBackend, glyphMap, glyphNamesToCopy
+        )
+        logger.info(
+            f"{len(glyphMap) - len(glyphNamesToCopy)} glyphs are unchanged, "
+            f"{len(glyphNamesToCopy)} glyphs to copy"
+        )
+
+    if numProcesses > 1:
+        if sourceOpener is None:
+            assert (
+                sourcePath is not None
+            ), "copying with processes requires a source path or opener"
+            sourceOpener = partial(openFileSystemBackend, sourcePath)
+        await copyGlyphsInSubProcesses(
+            sourceOpener,
+            destBackend,
+            glyphMap,
+            glyphNamesToCopy,
+            numProcesses,
+            progressInterval,
+            continueOnError,
+            manifest,
+        )
+    else:
+        await copyGlyphsInTasks(
+            sourceBackend,
+            destBackend,
+            glyphMap,
+            glyphNamesToCopy,
+            numTasks,
+            progressInterval,
+            continueOnError,
+            manifest,
+        )
+
+    if manifest is not None:
+        await deleteObsoleteGlyphs(destBackend, glyphMap, manifest)
+
+    await destBackend.putKerning(await sourceBackend.getKerning())
+    await destBackend.putFeatures(await sourceBackend.getFeatures())
+
+
+async def copyGlyphsInTasks(
+    sourceBackend: ReadableFontBackend,
+    destBackend: WritableFontBackend,
+    glyphMap: dict[str, list[int]],
+    glyphNamesToCopy: list[str],
+    numTasks: int,
+    progressInterval: int,
+    continueOnError: bool,
+    manifest: CopyManifest | None = None,
+) -> None:
     glyphNamesCopied: set[str] = set()
 
     tasks = [
@@ -70,6 +233,7 @@ async def _copyFont(
                 glyphNamesCopied,
                 progressInterval,
                 continueOnError,
+                manifest,
             )
         )
         for i in range(numTasks)
@@ -96,9 +260,6 @@ async def _copyFont(
                 if imageData is not None:
                     await destBackend.putBackgroundImage(imageIdentifier, imageData)
 
-    await destBackend.putKerning(await sourceBackend.getKerning())
-    await destBackend.putFeatures(await sourceBackend.getFeatures())
-
 
 async def copyGlyphs(
     sourceBackend: ReadableFontBackend,
@@ -108,46 +269,260 @@ async def copyGlyphs(
     glyphNamesCopied: set[str],
     progressInterval: int,
     continueOnError: bool,
+    manifest: CopyManifest | None = None,
 ) -> list:
     backgroundImageIdentifiers = []
+    glyphsToWrite: dict[str, tuple[VariableGlyph, list[int]]] = {}
 
     while glyphNamesToCopy:
         glyphNamesCopied.update(glyphNamesToCopy)
-        if progressInterval and not (len(glyphNamesToCopy) % progressInterval):
-            logger.info(f"{len(glyphNamesToCopy)} glyphs left to copy")
-        glyphName = glyphNamesToCopy.pop(0)
-        logger.debug(f"reading {glyphName}")
-
-        try:
-            glyph = await sourceBackend.getGlyph(glyphName)
-        except Exception as e:
-            if not continueOnError:
-                raise
-            logger.error(f"glyph {glyphName} caused an error: {e!r}")
-            continue
+        numGlyphsLeft = len(glyphNamesToCopy)
+        # Take a chunk of glyph names, so the source backend can stream them
+        glyphNamesToRead = glyphNamesToCopy[:GLYPH_READ_CHUNK_SIZE]
+        del glyphNamesToCopy[:GLYPH_READ_CHUNK_SIZE]
+
+        async for glyphName, glyph in iterGlyphs(
+            sourceBackend, glyphNamesToRead, logGlyphError if continueOnError else None
+        ):
+            if progressInterval and not (numGlyphsLeft % progressInterval):
+                logger.info(f"{numGlyphsLeft} glyphs left to copy")
+            numGlyphsLeft -= 1
+            logger.debug(f"read {glyphName}")
+
+            if glyph is None:
+                logger.warning(f"glyph {glyphName} not found")
+                continue
+
+            componentNames = {
+                compo.name
+                for layer in glyph.layers.values()
+                for compo in layer.glyph.components
+            }
+            glyphNamesToCopy.extend(sorted(componentNames - glyphNamesCopied))
+            glyphNamesCopied.update(componentNames)
+
+            if manifest is not None and not manifest.updateGlyph(
+                glyphName, glyph, glyphMap[glyphName]
+            ):
+                logger.debug(f"skipping unchanged {glyphName}")
+                continue
+
+            logger.debug(f"writing {glyphName}")
+
+            for layer in glyph.layers.values():
+                if layer.glyph.backgroundImage is not None:
+                    backgroundImageIdentifiers.append(
+                        layer.glyph.backgroundImage.identifier
+                    )
+
+            glyphsToWrite[glyphName] = (glyph, glyphMap[glyphName])
+            if len(glyphsToWrite) >= GLYPH_WRITE_BATCH_SIZE:
+                await writeGlyphs(destBackend, glyphsToWrite)
+                glyphsToWrite = {}
+
+    await writeGlyphs(destBackend, glyphsToWrite)
 
-        if glyph is None:
-            logger.warning(f"glyph {glyphName} not found")
-            continue
+    return backgroundImageIdentifiers
 
-        logger.debug(f"writing {glyphName}")
 
-        componentNames = {
-            compo.name
-            for layer in glyph.layers.values()
-            for compo in layer.glyph.components
-        }
-        glyphNamesToCopy.extend(sorted(componentNames - glyphNamesCopied))
+async def copyGlyphsInSubProcesses(
+    sourceOpener: SourceOpener,
+    destBackend: WritableFontBackend,
+    glyphMap: dict[str, list[int]],
+    glyphNamesToCopy: list[str],
+    numProcesses: int,
+    progressInterval: int,
+    continueOnError: bool,
+    manifest: CopyManifest | None = None,
+) -> None:
+    # The glyphs are read by worker processes, in shards of glyph names. Writing
+    # is done here, as most backends do not support concurrent writers. This
+    # process also takes care of the component closure and of collecting the
+    # background images. The shards are handled in the order they were submitted,
+    # so the glyphs are written in a deterministic order.
+    glyphNamesToCopy = list(glyphNamesToCopy)
+    glyphNamesCopied = set(glyphNamesToCopy)
+    readImages = isinstance(destBackend, WriteBackgroundImage)
+    imageIdentifiersToCopy: set[str] = set()
+    imageIdentifiersCopied: set[str] = set()
+    glyphsToWrite: dict[str, tuple[VariableGlyph, list[int]]] = {}
+    numGlyphsRead = 0
+
+    loop = asyncio.get_running_loop()
+    pool = concurrent.futures.ProcessPoolExecutor(
+        numProcesses, initializer=_initCopyWorker, initargs=(sourceOpener,)
+    )
+    try:
+        pending: list[asyncio.Future] = []
+        while glyphNamesToCopy or pending:
+            while glyphNamesToCopy and len(pending) < 2 * numProcesses:
+                shard = glyphNamesToCopy[:GLYPH_READ_SHARD_SIZE]
+                del glyphNamesToCopy[:GLYPH_READ_SHARD_SIZE]
+                pending.append(
+                    loop.run_in_executor(
+                        pool, _readGlyphsInWorker, shard, continueOnError, readImages
+                    )
+                )
 
-        for layer in glyph.layers.values():
-            if layer.glyph.backgroundImage is not None:
-                backgroundImageIdentifiers.append(
+            glyphs, images = await pending.pop(0)
+
+            for glyphName, glyph in glyphs.items():
+                if glyph is None:
+                    logger.warning(f"glyph {glyphName} not found")
+                    continue
+
+                componentNames = {
+                    compo.name
+                    for layer in glyph.layers.values()
+                    for compo in layer.glyph.components
+                }
+                for componentName in sorted(componentNames - glyphNamesCopied):
+                    glyphNamesCopied.add(componentName)
+                    if componentName in glyphMap:
+                        glyphNamesToCopy.append(componentName)
+                    else:
+                        logger.warning(f"glyph {componentName} not found")
+
+                if manifest is not None and not manifest.updateGlyph(
+                    glyphName, glyph, glyphMap[glyphName]
+                ):
+                    logger.debug(f"skipping unchanged {glyphName}")
+                    continue
+
+                glyphsToWrite[glyphName] = (glyph, glyphMap[glyphName])
+                imageIdentifiersToCopy.update(
                     layer.glyph.backgroundImage.identifier
+                    for layer in glyph.layers.values()
+                    if layer.glyph.backgroundImage is not None
                 )
 
-        await destBackend.putGlyph(glyphName, glyph, glyphMap[glyphName])
+            for imageIdentifier, imageData in images.items():
+                if (
+                    imageIdentifier not in imageIdentifiersToCopy
+                    or imageIdentifier in imageIdentifiersCopied
+                ):
+                    continue
+                imageIdentifiersCopied.add(imageIdentifier)
+                if imageData is not None:
+                    assert isinstance(destBackend, WriteBackgroundImage)
+                    await destBackend.putBackgroundImage(imageIdentifier, imageData)
 
-    return backgroundImageIdentifiers
+            previousNumGlyphsRead = numGlyphsRead
+            numGlyphsRead += len(glyphs)
+            if progressInterval and (
+                numGlyphsRead // progressInterval
+                != previousNumGlyphsRead // progressInterval
+            ):
+                numGlyphsLeft = len(glyphNamesToCopy) + GLYPH_READ_SHARD_SIZE * len(
+                    pending
+                )
+                logger.info(f"about {numGlyphsLeft} glyphs left to copy")
+
+            if len(glyphsToWrite) >= GLYPH_WRITE_BATCH_SIZE:
+                await writeGlyphs(destBackend, glyphsToWrite)
+                glyphsToWrite = {}
+
+        await writeGlyphs(destBackend, glyphsToWrite)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+async def deleteObsoleteGlyphs(
+    destBackend: WritableFontBackend,
+    glyphMap: dict[str, list[int]],
+    manifest: CopyManifest,
+) -> None:
+    for glyphName in sorted(set(await destBackend.getGlyphMap()) - set(glyphMap)):
+        logger.debug(f"deleting {glyphName}")
+        await destBackend.deleteGlyph(glyphName)
+    manifest.prune(glyphMap)
+
+
+def logGlyphError(glyphName: str, error: Exception) -> None:
+    logger.error(f"glyph {glyphName} caused an error: {error!r}")
+
+
+async def writeGlyphs(
+    destBackend: WritableFontBackend,
+    glyphs: dict[str, tuple[VariableGlyph, list[int]]],
+) -> None:
+    if not glyphs:
+        return
+    if isinstance(destBackend, WriteGlyphs):
+        await destBackend.putGlyphs(glyphs)
+    else:
+        for glyphName, (glyph, codePoints) in glyphs.items():
+            await destBackend.putGlyph(glyphName, glyph, codePoints)
+
+
+# A picklable callable that returns an async context manager, which yields the
+# source backend for a worker process, for example:
+#     partial(openFileSystemBackend, sourcePath)
+SourceOpener = Callable[[], AsyncContextManager[ReadableFontBackend]]
+
+
+@asynccontextmanager
+async def openFileSystemBackend(path: os.PathLike):
+    backend = getFileSystemBackend(path)
+    async with aclosing(backend):
+        yield backend
+
+
+# Per worker process state, for copyGlyphsInSubProcesses()
+_workerSourceBackend: ReadableFontBackend | None = None
+_workerEventLoop: asyncio.AbstractEventLoop | None = None
+# The worker's source backend stays open for the lifetime of the process
+_workerExitStack: AsyncExitStack | None = None
+
+
+def _initCopyWorker(sourceOpener: SourceOpener) -> None:
+    global _workerSourceBackend, _workerEventLoop, _workerExitStack
+
+    _workerEventLoop = asyncio.new_event_loop()
+    _workerExitStack = AsyncExitStack()
+    _workerSourceBackend = _workerEventLoop.run_until_complete(
+        _workerExitStack.enter_async_context(sourceOpener())
+    )
+
+
+def _readGlyphsInWorker(
+    glyphNames: list[str], continueOnError: bool, readImages: bool
+) -> tuple[dict[str, VariableGlyph | None], dict[str, ImageData | None]]:
+    assert _workerEventLoop is not None and _workerSourceBackend is not None
+    return _workerEventLoop.run_until_complete(
+        _readGlyphs(_workerSourceBackend, glyphNames, continueOnError, readImages)
+    )
+
+
+async def _readGlyphs(
+    sourceBackend: ReadableFontBackend,
+    glyphNames: list[str],
+    continueOnError: bool,
+    readImages: bool,
+) -> tuple[dict[str, VariableGlyph | None], dict[str, ImageData | None]]:
+    glyphs: dict[str, VariableGlyph | None] = {}
+    images: dict[str, ImageData | None] = {}
+
+    async for glyphName, glyph in iterGlyphs(
+        sourceBackend, glyphNames, logGlyphError if continueOnError else None
+    ):
+        logger.debug(f"read {glyphName}")
+        glyphs[glyphName] = glyph
+        if glyph is None or not readImages:
+            continue
+
+        for layer in glyph.layers.values():
+            backgroundImage = layer.glyph.backgroundImage
+            if backgroundImage is None or backgroundImage.identifier in images:
+                continue
+            # Image identifiers may be specific to a backend instance, so the
+            # image data needs to be read by this same worker process
+            assert isinstance(sourceBackend, ReadBackgroundImage), type(sourceBackend)
+            images[backgroundImage.identifier] = await sourceBackend.getBackgroundImage(
+                backgroundImage.identifier
+            )
+
+    return glyphs, images
 
 
 class PathChecker:
@@ -194,12 +569,26 @@ async def mainAsync() -> None:
     )
     parser.add_argument("--progress-interval", type=int, default=0)
     parser.add_argument("--num-tasks", type=int, default=1)
+    parser.add_argument(
+        "--num-processes",
+        type=int,
+        default=1,
+        help="The number of worker processes to read glyphs with. The default "
+        "is 1, which means glyphs are read by the main process.",
+    )
     parser.add_argument(
         "--continue-on-error",
         action="store_true",
         help="Continue copying if reading or processing a glyph causes an error. "
         "The error will be logged, but the glyph will not be present in the output.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Update an existing destination that was written by a previous "
+        "incremental copy: only write glyphs that changed, and delete glyphs that "
+        "no longer exist in the source.",
+    )
 
     args = parser.parse_args()
 
@@ -212,17 +601,44 @@ async def mainAsync() -> None:
     sourcePath = args.source
     destPath = args.destination
 
-    # Delete destination.
-    # TODO: move the destination to a tmp location, only delete when copy succeeds
-    if destPath.is_dir():
-        shutil.rmtree(destPath)
-    elif destPath.exists():
-        destPath.unlink()
+    manifest = None
+    manifestPath = None
+    if args.incremental:
+        # The manifest is stored outside of the destination, so it doesn't end
+        # up in the font
+        manifestPath = getProjectCachePath(destPath, COPY_MANIFEST_CACHE_NAME)
+        if manifestPath is None:
+            logger.warning(
+                "persistent caches are disabled, doing a full copy instead of "
+                "an incremental one"
+            )
+    if manifestPath is not None and destPath.exists() and manifestPath.exists():
+        manifest = CopyManifest.load(manifestPath)
+        # Remove the manifest while copying, so an interrupted copy will
+        # result in a full copy next time
+        manifestPath.unlink()
+        manifest.glyphs.dirty = True
+
+    destBackend: ReadableFontBackend
+    if manifest is not None:
+        destBackend = getFileSystemBackend(destPath)
+    else:
+        # Delete destination.
+        # TODO: move the destination to a tmp location, only delete when copy succeeds
+        if destPath.is_dir():
+            shutil.rmtree(destPath)
+        elif destPath.exists():
+            destPath.unlink()
+        destBackend = newFileSystemBackend(destPath)
+        if manifestPath is not None:
+            manifest = CopyManifest(
+                glyphs=FileStatCache(
+                    path=manifestPath, formatVersion=COPY_MANIFEST_FORMAT_VERSION
+                )
+            )
 
+    assert isinstance(destBackend, WritableFontBackend)
     sourceBackend = getFileSystemBackend(sourcePath)
-    destBackend = newFileSystemBackend(destPath)
-
-    # TODO: determine numTasks based on whether either backend supports parallelism
 
     async with aclosing(sourceBackend), aclosing(destBackend):
         await copyFont(
@@ -230,10 +646,16 @@ async def mainAsync() -> None:
             destBackend,
             glyphNames=glyphNames if glyphNames else None,
             numTasks=args.num_tasks,
+            numProcesses=args.num_processes,
+            sourcePath=sourcePath,
             progressInterval=args.progress_interval,
             continueOnError=args.continue_on_error,
+            manifest=manifest,
         )
 
+    if manifest is not None:
+        manifest.save()
+
 
 @asynccontextmanager
 async def async_nullcontext(item):
@@ -13,7 +13,7 @@ from datetime import datetime
 from functools import cache, cached_property, partial, singledispatch
 from os import PathLike
 from types import SimpleNamespace
-from typing import Any, Awaitable, Callable
+from typing import Any, Awaitable, Callable, Iterable, Sequence
 
 from fontTools.designspaceLib import (
     AxisDescriptor,
@@ -22,11 +22,12 @@ from fontTools.designspaceLib import (
     DiscreteAxisDescriptor,
     SourceDescriptor,
 )
+from fontTools.misc import plistlib
 from fontTools.misc.transform import DecomposedTransform, Transform
 from fontTools.pens.pointPen import AbstractPointPen
 from fontTools.pens.recordingPen import RecordingPointPen
 from fontTools.ufoLib import UFOLibError, UFOReaderWriter
-from fontTools.ufoLib.glifLib import GlyphSet
+from fontTools.ufoLib.glifLib import CONTENTS_FILENAME, GlyphSet
 
 from ..core.async_property import async_property
 from ..core.classes import (
@@ -53,16 +54,36 @@ from ..core.classes import (
     StaticGlyph,
     VariableGlyph,
 )
-from ..core.glyphdependencies import GlyphDependencies
+from ..core.filecache import FileStatCache, getFileFingerprint, getProjectCachePath
+from ..core.glyphdependencies import (
+    GLYPH_DEPENDENCIES_CACHE_FORMAT_VERSION,
+    GLYPH_DEPENDENCIES_CACHE_NAME,
+    GlyphDependencies,
+)
 from ..core.path import PackedPathPointPen
 from ..core.protocols import WritableFontBackend
 from ..core.subprocess import runInSubProcess
+from ..core.threading import runInThread
 from ..core.varutils import locationToTuple, makeDenseLocation, makeSparseLocation
 from .filewatcher import Change, FileWatcher
 from .ufo_utils import extractGlyphNameAndCodePoints
 
 logger = logging.getLogger(__name__)
 
+# The name and format version of the persistent cache for the code points of
+# the default layer's .glif files, see core/filecache.py
+GLYPH_MAP_CACHE_NAME = "glyph-map"
+GLYPH_MAP_CACHE_FORMAT_VERSION = 1
+
+# When building the glyph map requires parsing at least this many .glif files,
+# they are parsed in chunks, in the process pool
+GLYPH_MAP_SUBPROCESS_THRESHOLD = 2000
+GLYPH_MAP_SUBPROCESS_CHUNK_SIZE = 2000
+
+# getGlyph() parses the non-default layers of a glyph in worker threads if
+# there are at least this many
+GLYPH_LAYERS_THREAD_THRESHOLD = 8
+
 
 VARIABLE_COMPONENTS_LIB_KEY = "com.black-foundry.variable-components"
 GLYPH_DESIGNSPACE_LIB_KEY = "com.black-foundry.glyph-designspace"
@@ -241,18 +262,19 @@ class DesignspaceBackend:
         )
         self.ufoManager = UFOManager()
         self.updateAxisInfo()
+        # The UFO layers' glyph sets, the glif file name mapping and the glyph
+        # map are all loaded lazily, on first use, to make opening large projects
+        # fast
         self.loadUFOLayers()
-        self.buildGlyphFileNameMapping()
-        self.glyphMap = (
-            {}
-            if self.defaultDSSource is None
-            else getGlyphMapFromGlyphSet(self.defaultDSSource.layer.glyphSet)
-        )
+        self._glifFileNames: dict[str, str] | None = None
+        self._glyphMap: dict[str, list[int]] | None = None
+        self._glyphMapTask: asyncio.Task[dict[str, list[int]]] | None = None
+        self._glyphLayerIndex: GlyphLayerIndex | None = None
         self.savedGlyphModificationTimes: dict[str, set] = {}
         self.zombieDSSources: dict[str, DSSource] = {}
 
     def startOptionalBackgroundTasks(self) -> None:
-        self._backgroundTasksTask = asyncio.create_task(self.glyphDependencies)
+        self._backgroundTasksTask = asyncio.ensure_future(self.glyphDependencies)
 
     @property
     def familyName(self) -> str:
@@ -270,12 +292,20 @@ class DesignspaceBackend:
         if self._glyphDependenciesTask is None:
             self._glyphDependenciesTask = asyncio.create_task(
                 extractGlyphDependenciesFromUFO(
-                    self.defaultDSSource.layer.path, self.defaultDSSource.layer.name
+                    self.defaultDSSource.layer.path,
+                    self.defaultDSSource.layer.name,
+                    getProjectCachePath(
+                        self.defaultDSSource.layer.path, GLYPH_DEPENDENCIES_CACHE_NAME
+                    ),
                 )
             )
 
             def setResult(task):
-                if not task.cancelled() and task.exception() is None:
+                if (
+                    task is self._glyphDependenciesTask
+                    and not task.cancelled()
+                    and task.exception() is None
+                ):
                     self._glyphDependencies = task.result()
 
             self._glyphDependenciesTask.add_done_callback(setResult)
@@ -287,6 +317,10 @@ class DesignspaceBackend:
 
     def _reloadDesignSpaceFromFile(self):
         self._initialize(DesignSpaceDocument.fromfile(self.dsDoc.path))
+        # The default source may have changed: rebuild the glyph dependencies
+        # when needed, which is cheap thanks to the persistent cache
+        self._glyphDependencies = None
+        self._glyphDependenciesTask = None
 
     def updateAxisInfo(self):
         self.dsDoc.findDefault()
@@ -317,6 +351,8 @@ class DesignspaceBackend:
     async def aclose(self) -> None:
         if self.fileWatcher is not None:
             await self.fileWatcher.aclose()
+        if self._glyphMapTask is not None:
+            self._glyphMapTask.cancel()
         if self._glyphDependenciesTask is not None:
             self._glyphDependenciesTask.cancel()
         if self._backgroundTasksTask is not None:
@@ -427,24 +463,107 @@ class DesignspaceBackend:
                 fontraLayerName = ufoLayerName
         return fontraLayerName
 
+    @property
+    def glyphMap(self) -> dict[str, list[int]]:
+        # Async code should use _getGlyphMap() instead, which doesn't block the
+        # event loop while loading the glyph map
+        if self._glyphMap is None:
+            self._glyphMap = (
+                {}
+                if self.defaultDSSource is None
+                else getGlyphMapFromGlyphSet(
+                    self.defaultUFOLayer.glyphSet, self._glyphMapCachePath
+                )
+            )
+        return self._glyphMap
+
+    async def _getGlyphMap(self) -> dict[str, list[int]]:
+        if self._glyphMap is not None:
+            return self._glyphMap
+
+        if self.defaultDSSource is None:
+            self._glyphMap = {}
+            return self._glyphMap
+
+        # Concurrent callers share a single load task
+        if self._glyphMapTask is None:
+            self._glyphMapTask = asyncio.create_task(
+                getGlyphMapFromUFOLayer(self.defaultUFOLayer, self._glyphMapCachePath)
+            )
+        glyphMapTask = self._glyphMapTask
+
+        try:
+            # Don't cancel the shared task if this caller is cancelled
+            glyphMap = await asyncio.shield(glyphMapTask)
+        except Exception:
+            if glyphMapTask is self._glyphMapTask:
+                # Try again next time
+                self._glyphMapTask = None
+            raise
+
+        if glyphMapTask is not self._glyphMapTask:
+            # The .designspace file was reloaded in the meantime
+            return await self._getGlyphMap()
+
+        if self._glyphMap is None:
+            # It may have been loaded, and modified, in the meantime
+            self._glyphMap = glyphMap
+        return self._glyphMap
+
+    @property
+    def _glyphMapCachePath(self) -> pathlib.Path | None:
+        return getProjectCachePath(self.defaultUFOLayer.path, GLYPH_MAP_CACHE_NAME)
+
+    @property
+    def glyphLayerIndex(self) -> GlyphLayerIndex:
+        if (
+            self._glyphLayerIndex is None
+            or self._glyphLayerIndex.ufoLayers is not self.ufoLayers
+        ):
+            self._glyphLayerIndex = GlyphLayerIndex(self.ufoLayers)
+        return self._glyphLayerIndex
+
+    @property
+    def glifFileNames(self) -> dict[str, str]:
+        if self._glifFileNames is None:
+            self.buildGlyphFileNameMapping()
+            assert self._glifFileNames is not None
+        return self._glifFileNames
+
     def buildGlyphFileNameMapping(self):
         glifFileNames = {}
         for glyphSet in self.ufoLayers.iterAttrs("glyphSet"):
             for glyphName, fileName in glyphSet.contents.items():
                 glifFileNames[fileName] = glyphName
-        self.glifFileNames = glifFileNames
+        self._glifFileNames = glifFileNames
 
     def updateGlyphSetContents(self, glyphSet):
         glyphSet.writeContents()
-        glifFileNames = self.glifFileNames
+        if self._glifFileNames is None:
+            # The mapping will be built when needed
+            return
+        glifFileNames = self._glifFileNames
         for glyphName, fileName in glyphSet.contents.items():
             glifFileNames[fileName] = glyphName
 
-    def ensureGlyphInGlyphOrder(self, reader, glyphName):
+    def updateGlyphOrder(self, reader, glyphOrderChanges):
+        # glyphOrderChanges is a list of (glyphName, isAdded) tuples
         lib = reader.readLib()
         glyphOrder = lib.get("public.glyphOrder")
-        if glyphOrder is not None and glyphName not in glyphOrder:
-            glyphOrder.append(glyphName)
+        if glyphOrder is None:
+            return
+        glyphOrderSet = set(glyphOrder)
+        modified = False
+        for glyphName, isAdded in glyphOrderChanges:
+            if isAdded and glyphName not in glyphOrderSet:
+                glyphOrder.append(glyphName)
+                glyphOrderSet.add(glyphName)
+                modified = True
+            elif not isAdded and glyphName in glyphOrderSet:
+                glyphOrder.remove(glyphName)
+                glyphOrderSet.discard(glyphName)
+                modified = True
+        if modified:
             reader.writeLib(lib)
 
     def ensureGlyphNotInGlyphOrder(self, reader, glyphName):
@@ -455,13 +574,23 @@ class DesignspaceBackend:
             reader.writeLib(lib)
 
     async def getGlyphMap(self) -> dict[str, list[int]]:
-        return dict(self.glyphMap)
+        return dict(await self._getGlyphMap())
 
     async def putGlyphMap(self, value: dict[str, list[int]]) -> None:
         pass
 
+    async def getGlyphFingerprint(self, glyphName: str) -> list | None:
+        if glyphName not in await self._getGlyphMap():
+            return None
+        # The .designspace file determines how the UFO layers map to glyph
+        # sources and layers, so it is part of each glyph's fingerprint
+        fingerprints = [getFileFingerprint(self.dsDoc.path) if self.dsDoc.path else []]
+        for ufoLayer in self.glyphLayerIndex.getLayers(glyphName):
+            fingerprints.append(getGLIFFingerprint(ufoLayer.glyphSet, glyphName))
+        return None if None in fingerprints else fingerprints
+
     async def getGlyph(self, glyphName: str) -> VariableGlyph | None:
-        if glyphName not in self.glyphMap:
+        if glyphName not in await self._getGlyphMap():
             return None
 
         axes = []
@@ -490,16 +619,14 @@ class DesignspaceBackend:
         # per glyph source custom data, eg. status color code
         sourcesCustomData = {}
 
-        for ufoLayer in self.ufoLayers:
-            if glyphName not in ufoLayer.glyphSet:
-                continue
-
-            staticGlyph, ufoGlyph = (
-                (defaultStaticGlyph, defaultUFOGlyph)
-                if ufoLayer == self.defaultUFOLayer
-                else ufoLayerToStaticGlyph(ufoLayer.glyphSet, glyphName)
-            )
+        glyphUFOLayers = self.glyphLayerIndex.getLayers(glyphName)
+        layerGlyphs = await self._readLayerGlyphs(
+            glyphName, glyphUFOLayers, (defaultStaticGlyph, defaultUFOGlyph)
+        )
 
+        for ufoLayer, (staticGlyph, ufoGlyph) in zip(
+            glyphUFOLayers, layerGlyphs, strict=True
+        ):
             layerName = layerNameMapping.get(
                 ufoLayer.fontraLayerName, ufoLayer.fontraLayerName
             )
@@ -524,9 +651,9 @@ class DesignspaceBackend:
             if axis.name in self.defaultLocation
         }
 
+        glyphUFOLayersSet = set(glyphUFOLayers)
         for dsSource in self.dsSources:
-            glyphSet = dsSource.layer.glyphSet
-            if glyphName not in glyphSet:
+            if dsSource.layer not in glyphUFOLayersSet:
                 continue
             sources.append(dsSource.asFontraGlyphSource(localDefaultOverride))
 
@@ -554,6 +681,35 @@ class DesignspaceBackend:
             customData=customData,
         )
 
+    async def _readLayerGlyphs(
+        self, glyphName: str, ufoLayers: Sequence[UFOLayer], defaultGlyphs: tuple
+    ) -> list[tuple]:
+        # Parsing .glif files is synchronous: for glyphs with many layers, parse
+        # the layers concurrently in worker threads, so we don't stall the event
+        # loop (and with it every other client) for too long. Glyphs with few
+        # layers are parsed inline, as that is faster for them.
+        defaultUFOLayer = self.defaultUFOLayer
+        otherUFOLayers = [
+            ufoLayer for ufoLayer in ufoLayers if ufoLayer != defaultUFOLayer
+        ]
+        if len(otherUFOLayers) < GLYPH_LAYERS_THREAD_THRESHOLD:
+            otherGlyphs = [
+                ufoLayerToStaticGlyph(ufoLayer.glyphSet, glyphName)
+                for ufoLayer in otherUFOLayers
+            ]
+        else:
+            otherGlyphs = await asyncio.gather(
+                *(
+                    runInThread(ufoLayerToStaticGlyph, ufoLayer.glyphSet, glyphName)
+                    for ufoLayer in otherUFOLayers
+                )
+            )
+        otherGlyphsIter = iter(otherGlyphs)
+        return [
+            defaultGlyphs if ufoLayer == defaultUFOLayer else next(otherGlyphsIter)
+            for ufoLayer in ufoLayers
+        ]
+
     def _unpackLocalDesignSpace(self, dsDict, defaultLayerName):
         axes = [
             GlyphAxis(
@@ -604,10 +760,41 @@ class DesignspaceBackend:
 
     async def putGlyph(
         self, glyphName: str, glyph: VariableGlyph, codePoints: list[int]
+    ) -> None:
+        await self.putGlyphs({glyphName: (glyph, codePoints)})
+
+    async def putGlyphs(
+        self, glyphs: dict[str, tuple[VariableGlyph, list[int]]]
+    ) -> None:
+        # Write all .glif files first, then write each modified layer's
+        # contents.plist and each affected UFO's lib.plist only once
+        modifiedGlyphSets: dict[GlyphSet, None] = {}
+        glyphOrderChanges: dict[UFOReaderWriter, list[tuple[str, bool]]] = defaultdict(
+            list
+        )
+        try:
+            for glyphName, (glyph, codePoints) in glyphs.items():
+                await self._putGlyph(
+                    glyphName, glyph, codePoints, modifiedGlyphSets, glyphOrderChanges
+                )
+        finally:
+            for glyphSet in modifiedGlyphSets:
+                self.updateGlyphSetContents(glyphSet)
+            for reader, changes in glyphOrderChanges.items():
+                self.updateGlyphOrder(reader, changes)
+
+    async def _putGlyph(
+        self,
+        glyphName: str,
+        glyph: VariableGlyph,
+        codePoints: list[int],
+        modifiedGlyphSets: dict[GlyphSet, None],
+        glyphOrderChanges: dict[UFOReaderWriter, list[tuple[str, bool]]],
     ) -> None:
         assert isinstance(codePoints, list)
         assert all(isinstance(cp, int) for cp in codePoints)
-        self.glyphMap[glyphName] = codePoints
+        glyphMap = await self._getGlyphMap()
+        glyphMap[glyphName] = codePoints
 
         if self._glyphDependencies is not None:
             self._glyphDependencies.update(glyphName, componentNamesFromGlyph(glyph))
@@ -732,28 +919,26 @@ class DesignspaceBackend:
                 imageFileName=imageFileName,
             )
             glyphSet.writeGlyph(glyphName, layerGlyph, drawPointsFunc=drawPointsFunc)
+            self.glyphLayerIndex.addLayer(glyphName, ufoLayer)
             if writeGlyphSetContents:
-                # FIXME: this is inefficient if we write many glyphs
-                self.updateGlyphSetContents(glyphSet)
-                self.ensureGlyphInGlyphOrder(ufoLayer.reader, glyphName)
+                modifiedGlyphSets[glyphSet] = None
+                glyphOrderChanges[ufoLayer.reader].append((glyphName, True))
 
             modTimes.add(glyphSet.getGLIFModificationTime(glyphName))
 
         # Prune unused UFO layers
         relevantLayerNames = set(
-            layer.fontraLayerName
-            for layer in self.ufoLayers
-            if glyphName in layer.glyphSet
+            layer.fontraLayerName for layer in self.glyphLayerIndex.getLayers(glyphName)
         )
         layersToDelete = relevantLayerNames - usedLayers
         for layerName in layersToDelete:
             ufoLayer = self.ufoLayers.findItem(fontraLayerName=layerName)
             glyphSet = ufoLayer.glyphSet
             glyphSet.deleteGlyph(glyphName)
-            # FIXME: this is inefficient if we write many glyphs
-            self.updateGlyphSetContents(glyphSet)
+            self.glyphLayerIndex.discardLayer(glyphName, ufoLayer)
+            modifiedGlyphSets[glyphSet] = None
             if ufoLayer.isDefaultLayer:
-                self.ensureGlyphNotInGlyphOrder(ufoLayer.reader, glyphName)
+                glyphOrderChanges[ufoLayer.reader].append((glyphName, False))
             modTimes.add(None)
 
         self.savedGlyphModificationTimes[glyphName] = modTimes
@@ -990,16 +1175,17 @@ class DesignspaceBackend:
         return {**self.defaultLocation, **globalLocation}
 
     async def deleteGlyph(self, glyphName):
-        if glyphName not in self.glyphMap:
+        glyphMap = await self._getGlyphMap()
+        if glyphName not in glyphMap:
             raise KeyError(f"Glyph '{glyphName}' does not exist")
-        for ufoLayer in self.ufoLayers:
+        for ufoLayer in self.glyphLayerIndex.getLayers(glyphName):
             glyphSet = ufoLayer.glyphSet
-            if glyphName in glyphSet:
-                glyphSet.deleteGlyph(glyphName)
-                glyphSet.writeContents()
-                if ufoLayer.isDefaultLayer:
-                    self.ensureGlyphNotInGlyphOrder(ufoLayer.reader, glyphName)
-        del self.glyphMap[glyphName]
+            glyphSet.deleteGlyph(glyphName)
+            glyphSet.writeContents()
+            self.glyphLayerIndex.discardLayer(glyphName, ufoLayer)
+            if ufoLayer.isDefaultLayer:
+                self.ensureGlyphNotInGlyphOrder(ufoLayer.reader, glyphName)
+        del glyphMap[glyphName]
         self.savedGlyphModificationTimes[glyphName] = None
         if self._glyphDependencies is not None:
             self._glyphDependencies.update(glyphName, ())
@@ -1279,7 +1465,7 @@ class DesignspaceBackend:
     async def getFeatures(self) -> OpenTypeFeatures:
         featureText = self.defaultReader.readFeatures()
         featureText = resolveFeatureIncludes(
-            featureText, self.ufoDir, set(self.glyphMap)
+            featureText, self.ufoDir, set(await self._getGlyphMap())
         )
         return OpenTypeFeatures(language="fea", text=featureText)
 
@@ -1411,7 +1597,7 @@ class DesignspaceBackend:
             glyphMapUpdates[glyphName] = codePoints
 
         for glyphName in changedItems.deletedGlyphs:
-            if glyphName in self.glyphMap:
+            if glyphName in await self._getGlyphMap():
                 glyphMapUpdates[glyphName] = None
 
         reloadPattern: dict[str, Any] = (
@@ -1421,15 +1607,38 @@ class DesignspaceBackend:
         )
 
         if glyphMapUpdates:
+            glyphMap = await self._getGlyphMap()
             reloadPattern["glyphMap"] = None
             for glyphName, updatedCodePoints in glyphMapUpdates.items():
                 if updatedCodePoints is None:
-                    del self.glyphMap[glyphName]
+                    del glyphMap[glyphName]
                 else:
-                    self.glyphMap[glyphName] = updatedCodePoints
+                    glyphMap[glyphName] = updatedCodePoints
+
+        self._updateGlyphDependencies(
+            changedItems.changedGlyphs
+            | changedItems.newGlyphs
+            | changedItems.deletedGlyphs
+        )
 
         return reloadPattern
 
+    def _updateGlyphDependencies(self, glyphNames: set[str]) -> None:
+        # Incrementally update the glyph dependencies for externally changed
+        # glyphs, instead of rebuilding them from scratch
+        if self._glyphDependencies is None or self.defaultDSSource is None:
+            return
+        glyphSet = self.defaultUFOLayer.glyphSet
+        for glyphName in sorted(glyphNames):
+            self._glyphDependencies.update(
+                glyphName,
+                (
+                    sorted(readGLIFComponentNames(glyphSet, glyphName))
+                    if glyphName in glyphSet
+                    else ()
+                ),
+            )
+
     async def _analyzeExternalChanges(self, changes) -> SimpleNamespace | None:
         if any(os.path.splitext(path)[1] == ".designspace" for _, path in changes):
             if (
@@ -1448,11 +1657,15 @@ class DesignspaceBackend:
             deletedGlyphs=set(),
             rebuildGlyphSetContents=False,
         )
-        for change, path in sorted(changes):
-            _, fileSuffix = os.path.splitext(path)
-
-            if fileSuffix == ".glif":
-                self._analyzeExternalGlyphChanges(change, path, changedItems)
+        glifChanges = [
+            (change, path)
+            for change, path in sorted(changes)
+            if os.path.splitext(path)[1] == ".glif"
+        ]
+        if glifChanges:
+            glyphMap = await self._getGlyphMap()
+        for change, path in glifChanges:
+            self._analyzeExternalGlyphChanges(change, path, changedItems, glyphMap)
 
         if changedItems.rebuildGlyphSetContents:
             #
@@ -1469,12 +1682,16 @@ class DesignspaceBackend:
             # TODO: come up with a better solution.
             #
             await asyncio.sleep(0.15)
-            for glyphSet in self.ufoLayers.iterAttrs("glyphSet"):
-                glyphSet.rebuildContents()
+            for ufoLayer in self.ufoLayers:
+                if ufoLayer.glyphSetIsLoaded:
+                    ufoLayer.glyphSet.rebuildContents()
+            # The contents of any layer may have changed: rebuild the index
+            # when it is needed next
+            self._glyphLayerIndex = None
 
         return changedItems
 
-    def _analyzeExternalGlyphChanges(self, change, path, changedItems):
+    def _analyzeExternalGlyphChanges(self, change, path, changedItems, glyphMap):
         fileName = os.path.basename(path)
         glyphName = self.glifFileNames.get(fileName)
 
@@ -1484,7 +1701,7 @@ class DesignspaceBackend:
             if path.startswith(os.path.join(self.dsDoc.default.path, "glyphs/")):
                 # The glyph was deleted from the default source,
                 # do a full delete
-                del self.glifFileNames[fileName]
+                self.glifFileNames.pop(fileName, None)
                 changedItems.deletedGlyphs.add(glyphName)
             # else:
             # The glyph was deleted from a non-default source,
@@ -1496,6 +1713,9 @@ class DesignspaceBackend:
                 with open(path, "rb") as f:
                     glyphName, _ = extractGlyphNameAndCodePoints(f.read())
                 self.glifFileNames[fileName] = glyphName
+            # The file name mapping is built lazily, and may already contain
+            # the new file: test against the glyph map instead
+            if glyphName not in glyphMap:
                 changedItems.newGlyphs.add(glyphName)
                 return
         else:
@@ -1816,12 +2036,68 @@ class UFOLayer:
     def glyphSet(self) -> GlyphSet:
         return self.manager.getGlyphSet(self.path, self.name)
 
+    @property
+    def glyphSetIsLoaded(self) -> bool:
+        return "glyphSet" in self.__dict__
+
+    def getGlyphNames(self) -> Iterable[str]:
+        # Use the glyph set if it is loaded, as its contents may not have been
+        # written yet. Otherwise read contents.plist directly: opening the glyph
+        # set would also check that each of its .glif files exists.
+        if not self.glyphSetIsLoaded:
+            try:
+                return readLayerContents(self.reader, self.name).keys()
+            except Exception:
+                # Let the glyph set report the problem
+                pass
+        return self.glyphSet.contents.keys()
+
     @cached_property
     def isDefaultLayer(self) -> bool:
         assert self.name
         return self.name == self.reader.getDefaultLayerName()
 
 
+class GlyphLayerIndex:
+    # Maps glyph names to the UFO layers that contain them, in `ufoLayers` order,
+    # so we don't have to test each layer's glyph set for each glyph access. The
+    # `ufoLayers` list may grow: layers that were added are indexed on demand.
+    # Indexing a layer doesn't load its glyph set.
+    def __init__(self, ufoLayers: ItemList) -> None:
+        self.ufoLayers = ufoLayers
+        self.numIndexedLayers = 0
+        self.layerPositions: dict[UFOLayer, int] = {}
+        self.glyphLayers: dict[str, list[UFOLayer]] = {}
+        self._indexNewLayers()
+
+    def getLayers(self, glyphName: str) -> tuple[UFOLayer, ...]:
+        # Return a copy, as the index may change while the caller awaits
+        self._indexNewLayers()
+        return tuple(self.glyphLayers.get(glyphName, ()))
+
+    def addLayer(self, glyphName: str, ufoLayer: UFOLayer) -> None:
+        self._indexNewLayers()
+        glyphLayers = self.glyphLayers.setdefault(glyphName, [])
+        if ufoLayer not in glyphLayers:
+            glyphLayers.append(ufoLayer)
+            glyphLayers.sort(key=self.layerPositions.__getitem__)
+
+    def discardLayer(self, glyphName: str, ufoLayer: UFOLayer) -> None:
+        glyphLayers = self.glyphLayers.get(glyphName)
+        if glyphLayers is not None and ufoLayer in glyphLayers:
+            glyphLayers.remove(ufoLayer)
+            if not glyphLayers:
+                del self.glyphLayers[glyphName]
+
+    def _indexNewLayers(self) -> None:
+        for position in range(self.numIndexedLayers, len(self.ufoLayers)):
+            ufoLayer = self.ufoLayers.items[position]
+            self.layerPositions[ufoLayer] = position
+            for glyphName in ufoLayer.getGlyphNames():
+                self.glyphLayers.setdefault(glyphName, []).append(ufoLayer)
+        self.numIndexedLayers = len(self.ufoLayers)
+
+
 class ItemList:
     def __init__(self):
         self.items = []
@@ -2089,14 +2365,104 @@ def populateUFOLayerGlyph(
     return pen.replay
 
 
-def getGlyphMapFromGlyphSet(glyphSet):
-    glyphMap = {}
+def getGlyphMapFromGlyphSet(
+    glyphSet: GlyphSet, cachePath: pathlib.Path | None = None
+) -> dict[str, list[int]]:
+    cache = FileStatCache.load(cachePath, GLYPH_MAP_CACHE_FORMAT_VERSION)
+    fingerprints, cachedCodePoints = _lookUpCachedCodePoints(glyphSet, cache)
+    parsedCodePoints = {
+        glyphName: readGLIFCodePoints(glyphSet, glyphName)
+        for glyphName in fingerprints
+        if glyphName not in cachedCodePoints
+    }
+    return _buildGlyphMap(cache, fingerprints, cachedCodePoints, parsedCodePoints)
+
+
+async def getGlyphMapFromUFOLayer(
+    ufoLayer: UFOLayer, cachePath: pathlib.Path | None = None
+) -> dict[str, list[int]]:
+    # Like getGlyphMapFromGlyphSet(), but if many .glif files need parsing, for
+    # example when there's no cache yet, they are parsed in the process pool
+    glyphSet = ufoLayer.glyphSet
+    cache = FileStatCache.load(cachePath, GLYPH_MAP_CACHE_FORMAT_VERSION)
+    fingerprints, cachedCodePoints = _lookUpCachedCodePoints(glyphSet, cache)
+    glyphNamesToRead = [
+        glyphName for glyphName in fingerprints if glyphName not in cachedCodePoints
+    ]
+    parsedCodePoints = {}
+    if len(glyphNamesToRead) < GLYPH_MAP_SUBPROCESS_THRESHOLD:
+        for glyphName in glyphNamesToRead:
+            parsedCodePoints[glyphName] = readGLIFCodePoints(glyphSet, glyphName)
+    else:
+        chunkSize = GLYPH_MAP_SUBPROCESS_CHUNK_SIZE
+        results = await asyncio.gather(
+            *(
+                runInSubProcess(
+                    partial(
+                        _readCodePointsFromUFO,
+                        ufoLayer.path,
+                        ufoLayer.name,
+                        glyphNamesToRead[i : i + chunkSize],
+                    )
+                )
+                for i in range(0, len(glyphNamesToRead), chunkSize)
+            )
+        )
+        for codePoints in results:
+            parsedCodePoints.update(codePoints)
+    return _buildGlyphMap(cache, fingerprints, cachedCodePoints, parsedCodePoints)
+
+
+def _lookUpCachedCodePoints(
+    glyphSet: GlyphSet, cache: FileStatCache
+) -> tuple[dict[str, list | None], dict[str, list[int]]]:
+    fingerprints = {}
+    cachedCodePoints = {}
     for glyphName in glyphSet.keys():
-        glifData = glyphSet.getGLIF(glyphName)
-        gn, codePoints = extractGlyphNameAndCodePoints(glifData)
-        assert gn == glyphName, (gn, glyphName)
-        glyphMap[glyphName] = codePoints
-    return glyphMap
+        fingerprint = getGLIFFingerprint(glyphSet, glyphName)
+        fingerprints[glyphName] = fingerprint
+        found, codePoints = cache.lookup(glyphName, fingerprint)
+        if found:
+            cachedCodePoints[glyphName] = codePoints
+    return fingerprints, cachedCodePoints
+
+
+def _buildGlyphMap(
+    cache: FileStatCache,
+    fingerprints: dict[str, list | None],
+    cachedCodePoints: dict[str, list[int]],
+    parsedCodePoints: dict[str, list[int]],
+) -> dict[str, list[int]]:
+    for glyphName, codePoints in parsedCodePoints.items():
+        cache.store(glyphName, fingerprints[glyphName], codePoints)
+    cache.prune(fingerprints)
+    cache.save()
+    # `fingerprints` has the glyph set's glyph order
+    return {
+        glyphName: (
+            cachedCodePoints[glyphName]
+            if glyphName in cachedCodePoints
+            else parsedCodePoints[glyphName]
+        )
+        for glyphName in fingerprints
+    }
+
+
+def _readCodePointsFromUFO(
+    ufoPath: str, layerName: str, glyphNames: list[str]
+) -> dict[str, list[int]]:
+    reader = UFOReaderWriter(ufoPath)
+    glyphSet = reader.getGlyphSet(layerName=layerName)
+    return {
+        glyphName: readGLIFCodePoints(glyphSet, glyphName) for glyphName in glyphNames
+    }
+
+
+def readGLIFCodePoints(glyphSet: GlyphSet, glyphName: str) -> list[int]:
+    glifData = glyphSet.getGLIF(glyphName)
+    gn, codePoints = extractGlyphNameAndCodePoints(glifData)
+    assert gn == glyphName, (gn, glyphName)
+    return codePoints
 
 
 def uniqueNameMaker(existingNames=()):
@@ -2183,10 +2549,10 @@ class ComponentsOnlyPointPen(PackedPathPointPen):
 
 
 async def extractGlyphDependenciesFromUFO(
-    ufoPath: str, layerName: str
+    ufoPath: str, layerName: str, cachePath: pathlib.Path | None = None
 ) -> GlyphDependencies:
     componentInfo = await runInSubProcess(
-        partial(_extractComponentInfoFromUFO, ufoPath, layerName)
+        partial(_extractComponentInfoFromUFO, ufoPath, layerName, cachePath)
     )
     dependencies = GlyphDependencies()
     for glyphName, componentNames in componentInfo.items():
@@ -2194,19 +2560,57 @@ async def extractGlyphDependenciesFromUFO(
     return dependencies
 
 
-def _extractComponentInfoFromUFO(ufoPath: str, layerName: str) -> dict[str, set[str]]:
+def _extractComponentInfoFromUFO(
+    ufoPath: str, layerName: str, cachePath: pathlib.Path | None = None
+) -> dict[str, set[str]]:
+    # The component names of each glyph are cached persistently, so we only need
+    # to parse the .glif files that changed since the cache was written
+    cache = FileStatCache.load(cachePath, GLYPH_DEPENDENCIES_CACHE_FORMAT_VERSION)
     reader = UFOReaderWriter(ufoPath)
     glyphSet = reader.getGlyphSet(layerName=layerName)
     componentInfo = {}
     for glyphName in glyphSet.keys():
-        glyph, _ = ufoLayerToStaticGlyph(
-            glyphSet, glyphName, penClass=ComponentsOnlyPointPen
-        )
-        if glyph.components:
-            componentInfo[glyphName] = {compo.name for compo in glyph.components}
+        fingerprint = getGLIFFingerprint(glyphSet, glyphName)
+        found, componentNames = cache.lookup(glyphName, fingerprint)
+        if not found:
+            componentNames = sorted(readGLIFComponentNames(glyphSet, glyphName))
+            cache.store(glyphName, fingerprint, componentNames)
+        if componentNames:
+            componentInfo[glyphName] = set(componentNames)
+    cache.prune(glyphSet.contents)
+    cache.save()
     return componentInfo
 
 
+def readGLIFComponentNames(glyphSet: GlyphSet, glyphName: str) -> set[str]:
+    glyph, _ = ufoLayerToStaticGlyph(
+        glyphSet, glyphName, penClass=ComponentsOnlyPointPen
+    )
+    return {compo.name for compo in glyph.components}
+
+
+def readLayerContents(reader: UFOReaderWriter, layerName: str) -> dict[str, str]:
+    # Read the glyph name to file name mapping of a layer, without opening its
+    # glyph set
+    layerDirectories = dict(reader._readLayerContents(False))
+    contentsPath = f"{layerDirectories[layerName]}/{CONTENTS_FILENAME}"
+    contents = plistlib.loads(reader.fs.readbytes(contentsPath))
+    if not isinstance(contents, dict):
+        raise UFOLibError(f"{contentsPath} is not properly formatted")
+    return contents
+
+
+def getGLIFFingerprint(glyphSet: GlyphSet, glyphName: str) -> list | None:
+    try:
+        path = glyphSet.fs.getsyspath(glyphSet.contents[glyphName])
+    except Exception:
+        # Not a plain file system, for example a zipped UFO: don't cache
+        return None
+    fingerprint = getFileFingerprint(path)
+    # Include the path, as the same glyph name may map to a different file
+    return [path, *fingerprint] if fingerprint is not None else None
+
+
 def componentNamesFromGlyph(glyph):
     return {
         compo.name
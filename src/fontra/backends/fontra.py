@@ -2,13 +2,15 @@ import asyncio
 import csv
 import json
 import logging
+import os
 import pathlib
 import shutil
+import threading
 from collections import defaultdict
 from copy import deepcopy
 from dataclasses import dataclass, field
 from functools import partial
-from typing import Any, Callable, Sequence
+from typing import Any, AsyncGenerator, Callable, Iterable, Sequence
 
 from ..core.async_property import async_property
 from ..core.classes import (
@@ -24,13 +26,22 @@ from ..core.classes import (
     structure,
     unstructure,
 )
-from ..core.glyphdependencies import GlyphDependencies
+from ..core.filecache import FileStatCache, getFileFingerprint, getProjectCachePath
+from ..core.glyphdependencies import (
+    GLYPH_DEPENDENCIES_CACHE_FORMAT_VERSION,
+    GLYPH_DEPENDENCIES_CACHE_NAME,
+    GlyphDependencies,
+)
 from ..core.protocols import WritableFontBackend
 from ..core.subprocess import runInSubProcess
+from ..core.threading import runInThread
 from .filenames import fileNameToString, stringToFileName
 
 logger = logging.getLogger(__name__)
 
+# The number of glyph files iterGlyphs() reads ahead, in a thread
+GLYPH_READ_AHEAD_CHUNK_SIZE = 32
+
 
 class FontraBackend:
     glyphInfoFileName = "glyph-info.csv"
@@ -127,6 +138,71 @@ class FontraBackend:
             return None
         return deserializeGlyph(jsonSource, glyphName)
 
+    async def iterGlyphs(
+        self, glyphNames: Iterable[str]
+    ) -> AsyncGenerator[tuple[str, VariableGlyph | None], None]:
+        # Read the glyph files of the next chunk in a thread, while the glyphs
+        # of the current chunk are parsed and consumed
+        glyphNames = list(glyphNames)
+        chunks = [
+            glyphNames[i : i + GLYPH_READ_AHEAD_CHUNK_SIZE]
+            for i in range(0, len(glyphNames), GLYPH_READ_AHEAD_CHUNK_SIZE)
+        ]
+        stopReading = threading.Event()
+        nextChunkData: asyncio.Future | None = None
+        try:
+            for chunkIndex, chunk in enumerate(chunks):
+                if nextChunkData is None:
+                    nextChunkData = asyncio.ensure_future(
+                        runInThread(self._readGlyphDataChunk, chunk, stopReading)
+                    )
+                chunkData = await nextChunkData
+                nextChunkData = (
+                    asyncio.ensure_future(
+                        runInThread(
+                            self._readGlyphDataChunk,
+                            chunks[chunkIndex + 1],
+                            stopReading,
+                        )
+                    )
+                    if chunkIndex + 1 < len(chunks)
+                    else None
+                )
+                for glyphName, jsonSource in zip(chunk, chunkData, strict=True):
+                    if isinstance(jsonSource, Exception):
+                        raise jsonSource
+                    yield glyphName, (
+                        deserializeGlyph(jsonSource, glyphName)
+                        if jsonSource is not None
+                        else None
+                    )
+        finally:
+            if nextChunkData is not None:
+                # The consumer stopped early (or an error occurred): stop the
+                # read-ahead, and wait for the thread to finish, rather than
+                # leaving it to read glyphs nobody will look at. (Cancelling
+                # the future would not stop a thread that is already running.)
+                stopReading.set()
+                await asyncio.wait([nextChunkData])
+
+    def _readGlyphDataChunk(
+        self, glyphNames: list[str], stopReading: threading.Event
+    ) -> list[str | Exception | None]:
+        chunkData: list[str | Exception | None] = []
+        for glyphName in glyphNames:
+            if stopReading.is_set():
+                break
+            try:
+                chunkData.append(
+                    self.getGlyphData(glyphName) if glyphName in self.glyphMap else None
+                )
+            except KeyError:
+                chunkData.append(None)
+            except Exception as e:
+                # Raise the error when it's this glyph's turn
+                chunkData.append(e)
+        return chunkData
+
     async def putGlyph(
         self, glyphName: str, glyph: VariableGlyph, codePoints: list[int]
     ) -> None:
@@ -278,6 +354,13 @@ class FontraBackend:
     def getGlyphFilePath(self, glyphName):
         return self.glyphsDir / (stringToFileName(glyphName) + ".json")
 
+    async def getGlyphFingerprint(self, glyphName: str) -> list | None:
+        if glyphName not in self.glyphMap:
+            return None
+        filePath = self.getGlyphFilePath(glyphName)
+        fingerprint = getFileFingerprint(filePath)
+        return [os.fspath(filePath), *fingerprint] if fingerprint is not None else None
+
     async def findGlyphsThatUseGlyph(self, glyphName):
         return sorted((await self.glyphDependencies).usedBy.get(glyphName, []))
 
@@ -288,7 +371,14 @@ class FontraBackend:
 
         if self._glyphDependenciesTask is None:
             self._glyphDependenciesTask = asyncio.create_task(
-                extractGlyphDependenciesFromFontra(self.glyphsDir)
+                extractGlyphDependenciesFromFontra(
+                    self.glyphsDir,
+                    (
+                        getProjectCachePath(self.path, GLYPH_DEPENDENCIES_CACHE_NAME)
+                        if isinstance(self.path, pathlib.Path)
+                        else None
+                    ),
+                )
             )
 
             def setResult(task):
@@ -300,7 +390,7 @@ class FontraBackend:
         return await self._glyphDependenciesTask
 
     def startOptionalBackgroundTasks(self) -> None:
-        self._backgroundTasksTask = asyncio.create_task(self.glyphDependencies)
+        self._backgroundTasksTask = asyncio.ensure_future(self.glyphDependencies)
 
 
 def _parseCodePoints(cell: str) -> list[int]:
@@ -516,10 +606,10 @@ class Scheduler:
 
 
 async def extractGlyphDependenciesFromFontra(
-    glyphsDir: pathlib.Path,
+    glyphsDir: pathlib.Path, cachePath: pathlib.Path | None = None
 ) -> GlyphDependencies:
     componentInfo = await runInSubProcess(
-        partial(_extractComponentInfoFromUFO, glyphsDir)
+        partial(_extractComponentInfoFromUFO, glyphsDir, cachePath)
     )
 
     dependencies = GlyphDependencies()
@@ -528,12 +618,25 @@ async def extractGlyphDependenciesFromFontra(
     return dependencies
 
 
-def _extractComponentInfoFromUFO(glyphsDir: pathlib.Path) -> dict[str, set[str]]:
+def _extractComponentInfoFromUFO(
+    glyphsDir: pathlib.Path, cachePath: pathlib.Path | None = None
+) -> dict[str, set[str]]:
+    # The component names of each glyph file are cached persistently, so we only
+    # need to parse the glyph files that changed since the cache was written
+    cache = FileStatCache.load(cachePath, GLYPH_DEPENDENCIES_CACHE_FORMAT_VERSION)
     componentInfo = {}
+    fileNames = set()
     for glyphPath in glyphsDir.glob("*.json"):
-        glyphName = fileNameToString(glyphPath.stem)
-        glyphData = json.loads(glyphPath.read_text(encoding="utf-8"))
-        componentInfo[glyphName] = componentNamesFromGlyphData(glyphData)
+        fileNames.add(glyphPath.name)
+        fingerprint = getFileFingerprint(glyphPath)
+        found, componentNames = cache.lookup(glyphPath.name, fingerprint)
+        if not found:
+            glyphData = json.loads(glyphPath.read_text(encoding="utf-8"))
+            componentNames = sorted(componentNamesFromGlyphData(glyphData))
+            cache.store(glyphPath.name, fingerprint, componentNames)
+        componentInfo[fileNameToString(glyphPath.stem)] = set(componentNames)
+    cache.prune(fileNames)
+    cache.save()
     return componentInfo
 
 
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 
 
 class async_property:
@@ -6,7 +7,21 @@ class async_property:
         self.func = func
 
     def __get__(self, obj, objtype=None):
-        return self.func(obj)
+        if obj is None:
+            return self
+        return AsyncPropertyValue(functools.partial(self.func, obj))
+
+
+class AsyncPropertyValue:
+    # What an async_property evaluates to: an awaitable that calls the getter
+    # when it is awaited. Merely looking up the property, as hasattr() and
+    # isinstance() checks against protocols do, doesn't create a coroutine that
+    # is never awaited.
+    def __init__(self, getter):
+        self.getter = getter
+
+    def __await__(self):
+        return self.getter().__await__()
 
 
 class async_cached_property:
@@ -14,6 +29,8 @@ class async_cached_property:
         self.func = func
 
     def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
         cachedFuture = getattr(obj, self.privateName, None)
         if cachedFuture is None:
             cachedFuture = asyncio.ensure_future(self.func(obj))
@@ -0,0 +1,166 @@
+import asyncio
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Coroutine
+
+from .async_property import AsyncPropertyValue, async_property
+
+_missing = object()
+
+
+class ThreadedFontBackend:
+    # Wraps a font backend so that all its code runs in a dedicated thread, with
+    # its own event loop. Our file system backends do blocking I/O (parsing and
+    # writing files) in their async methods, which would otherwise stall the
+    # server's event loop, and with it all other connections and projects.
+    #
+    # Calls are dispatched to the backend loop in the order in which they are
+    # made, and the backend only ever runs in its own thread, so it needs no
+    # locking. The wrapper exposes exactly the methods and async properties
+    # the wrapped backend has, so the isinstance() checks against our
+    # protocols, and hasattr() checks for optional methods, give the same
+    # results.
+    #
+    # Async methods and async properties are awaited as usual. Synchronous
+    # methods don't block the caller: they return an asyncio.Future for their
+    # result, which the caller can await, or ignore.
+    #
+    # Plain attributes and (non-async) properties are not forwarded: they
+    # would be evaluated in the caller's thread, concurrently with the
+    # backend, and a property may build state lazily, like
+    # DesignspaceBackend.glyphMap. Accessing them raises AttributeError.
+
+    def __init__(self, backend):
+        self._backend = backend
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name=f"fontra-backend-{type(backend).__name__}",
+            daemon=True,
+        )
+        self._thread.start()
+
+        # Set up the method wrappers as instance attributes, rather than in
+        # __getattr__(), so repeated lookups return the same object, and so the
+        # wrapper passes protocol checks that use inspect.getattr_static()
+        for name in dir(backend):
+            if name.startswith("_") or name == "aclose":
+                continue
+            staticValue = inspect.getattr_static(backend, name, None)
+            if isinstance(staticValue, async_property):
+                setattr(
+                    self,
+                    name,
+                    AsyncPropertyValue(functools.partial(self._getAsyncProperty, name)),
+                )
+                continue
+            if not inspect.isfunction(staticValue):
+                continue
+            method = getattr(backend, name)
+            if name == "watchExternalChanges":
+                wrapper = self._wrapWatchExternalChanges(method)
+            elif inspect.iscoroutinefunction(method):
+                wrapper = self._wrapAsyncMethod(method)
+            elif inspect.isasyncgenfunction(method):
+                wrapper = self._wrapAsyncGeneratorMethod(method)
+            else:
+                wrapper = self._wrapMethod(method)
+            setattr(self, name, wrapper)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._backend!r})"
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for names that weren't set up in __init__()
+        backend = self.__dict__.get("_backend")
+        if (
+            backend is not None
+            and not name.startswith("__")
+            and inspect.getattr_static(backend, name, _missing) is not _missing
+        ):
+            raise AttributeError(
+                f"{type(self).__name__} doesn't forward {name!r}: only methods "
+                "and async properties of the backend are forwarded"
+            )
+        raise AttributeError(name)
+
+    async def aclose(self) -> None:
+        try:
+            await self._runInBackendLoop(self._backend.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            await asyncio.to_thread(self._thread.join)
+            self._loop.close()
+
+    def _runInBackendLoop(self, coro: Coroutine) -> asyncio.Future:
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    async def _getAsyncProperty(self, name: str) -> Any:
+        async def getValue():
+            return await getattr(self._backend, name)
+
+        return await self._runInBackendLoop(getValue())
+
+    def _wrapAsyncMethod(self, method: Callable) -> Callable:
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            return await self._runInBackendLoop(method(*args, **kwargs))
+
+        return wrapper
+
+    def _wrapAsyncGeneratorMethod(self, method: Callable) -> Callable:
+        # For iterGlyphs(): each step of the iteration runs in the backend loop
+        async def nextItem(iterator):
+            try:
+                return False, await anext(iterator)
+            except StopAsyncIteration:
+                return True, None
+
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            iterator = method(*args, **kwargs)
+            try:
+                while True:
+                    done, item = await self._runInBackendLoop(nextItem(iterator))
+                    if done:
+                        break
+                    yield item
+            finally:
+                await self._runInBackendLoop(iterator.aclose())
+
+        return wrapper
+
+    def _wrapMethod(self, method: Callable) -> Callable:
+        # Synchronous methods (such as startOptionalBackgroundTasks()) may
+        # schedule tasks, so they must run in the backend loop as well. We
+        # don't wait for them, as that would block the caller's loop: the
+        # wrapper returns a future for the result instead. Callers that don't
+        # need the result can ignore it, asyncio reports any error that isn't
+        # retrieved.
+        async def callMethod(args, kwargs):
+            return method(*args, **kwargs)
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs) -> asyncio.Future:
+            return self._runInBackendLoop(callMethod(args, kwargs))
+
+        return wrapper
+
+    def _wrapWatchExternalChanges(self, method: Callable) -> Callable:
+        # The callback belongs to the caller's loop, so we forward the backend's
+        # calls to it
+        @functools.wraps(method)
+        async def wrapper(callback):
+            callerLoop = asyncio.get_running_loop()
+
+            async def callbackInCallerLoop(*args, **kwargs):
+                return await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(
+                        callback(*args, **kwargs), callerLoop
+                    )
+                )
+
+            return await self._runInBackendLoop(method(callbackInCallerLoop))
+
+        return wrapper
@@ -0,0 +1,110 @@
+import json
+import struct
+import sys
+from array import array
+from typing import Any
+
+# A compact binary encoding for websocket messages.
+#
+# A binary message is a JSON header, followed by a section of binary data.
+# The coordinates of packed paths (objects with "coordinates" and "pointTypes"
+# keys, as PackedPath unstructures to) are moved from the JSON header into the
+# binary section as packed float64 arrays, and are replaced by a marker object
+# that refers to them by byte offset and item count. Coordinates that float64
+# can't represent exactly (bools, and ints beyond 2**53) are left in the JSON
+# header, as are numeric lists anywhere else. Likewise, bytes objects are moved
+# to the binary section as is, and are replaced by a marker object with their
+# byte offset and length.
+#
+#     uint32 (little endian): the length of the UTF-8 encoded JSON header
+#     bytes: the JSON header
+#     bytes: zero padding, so the binary section starts at a multiple of 8
+#     bytes: the binary section, each segment padded to a multiple of 8 bytes
+#
+# Packing the coordinates avoids the cost of formatting and parsing many floats
+# as JSON text, and makes the messages considerably smaller.
+
+ARRAY_MARKER_KEY = "__binary-array__"
+BYTES_MARKER_KEY = "__binary-bytes__"
+ARRAY_KEY = "coordinates"
+PACKED_PATH_KEYS = {ARRAY_KEY, "pointTypes"}
+MAX_EXACT_INT = 2**53
+
+
+def encodeBinaryMessage(message: Any) -> bytes:
+    segments: list[bytes] = []
+    header = json.dumps(_extractSegments(message, segments, [0])).encode("utf-8")
+    headerLength = len(header)
+    padding = bytes(-(4 + headerLength) % 8)
+    return b"".join([struct.pack("<I", headerLength), header, padding] + segments)
+
+
+def decodeBinaryMessage(data: bytes) -> Any:
+    (headerLength,) = struct.unpack_from("<I", data)
+    segmentsStart = 4 + headerLength
+    segmentsStart += -segmentsStart % 8
+
+    def objectHook(obj):
+        if len(obj) != 1:
+            return obj
+        if ARRAY_MARKER_KEY in obj:
+            offset, count = obj[ARRAY_MARKER_KEY]
+            start = segmentsStart + offset
+            a = array("d")
+            a.frombytes(data[start : start + 8 * count])
+            if sys.byteorder != "little":
+                a.byteswap()
+            return [int(v) if v.is_integer() else v for v in a]
+        elif BYTES_MARKER_KEY in obj:
+            offset, length = obj[BYTES_MARKER_KEY]
+            start = segmentsStart + offset
+            return bytes(data[start : start + length])
+        return obj
+
+    return json.loads(data[4 : 4 + headerLength], object_hook=objectHook)
+
+
+def _extractSegments(obj, segments, offset):
+    if isinstance(obj, dict):
+        isPackedPath = PACKED_PATH_KEYS.issubset(obj)
+        return {
+            k: (
+                _packArray(v, segments, offset)
+                if isPackedPath and k == ARRAY_KEY and isinstance(v, list)
+                else _extractSegments(v, segments, offset)
+            )
+            for k, v in obj.items()
+        }
+    elif isinstance(obj, (list, tuple)):
+        if not any(isinstance(item, (dict, list, tuple, bytes)) for item in obj):
+            return obj
+        return [_extractSegments(item, segments, offset) for item in obj]
+    elif isinstance(obj, bytes):
+        return {BYTES_MARKER_KEY: [_addSegment(obj, segments, offset), len(obj)]}
+    return obj
+
+
+def _packArray(values, segments, offset):
+    if not all(_isExactFloat(v) for v in values):
+        # The values would not survive the round trip, leave them alone
+        return _extractSegments(values, segments, offset)
+    a = array("d", values)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return {ARRAY_MARKER_KEY: [_addSegment(a.tobytes(), segments, offset), len(a)]}
+
+
+def _isExactFloat(value):
+    # Note: bool is a subclass of int, so we compare the types exactly
+    valueType = type(value)
+    return valueType is float or (
+        valueType is int and -MAX_EXACT_INT <= value <= MAX_EXACT_INT
+    )
+
+
+def _addSegment(data, segments, offset):
+    segmentOffset = offset[0]
+    padding = bytes(-len(data) % 8)
+    segments.append(data + padding if padding else data)
+    offset[0] += len(data) + len(padding)
+    return segmentOffset
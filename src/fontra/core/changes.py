@@ -174,6 +174,125 @@ def matchChangePattern(
     return False
 
 
+class ChangePatternIndex:
+    """An inverted index of the match patterns of many subscribers. It finds the
+    subscribers whose pattern matches a change by walking the change through
+    the combined patterns, instead of calling `matchChangePattern()` for each
+    subscriber. The result is the same.
+
+    Subscribers can be any hashable object.
+    """
+
+    def __init__(self) -> None:
+        self._root = _PatternIndexNode()
+        self._patterns: dict[Any, dict[str | int, Any]] = {}
+
+    def getPattern(self, subscriber: Any) -> dict[str | int, Any]:
+        return self._patterns.get(subscriber, {})
+
+    def setPattern(self, subscriber: Any, matchPattern: dict[str | int, Any]) -> None:
+        oldPattern = self._patterns.pop(subscriber, None)
+        if oldPattern:
+            _updatePatternIndex(self._root, subscriber, oldPattern, -1)
+        if matchPattern:
+            self._patterns[subscriber] = matchPattern
+            _updatePatternIndex(self._root, subscriber, matchPattern, 1)
+
+    def matchChange(self, change: dict[str, Any]) -> set:
+        """Return the set of subscribers whose pattern matches `change`."""
+        matches: set = set()
+        wildcardMatches: set = set()
+        _collectPatternIndexMatches(
+            self._root, change, 0, False, matches, wildcardMatches
+        )
+        # A wildcard in a pattern is only used if there is no exact path element
+        # match, so subscribers found via a wildcard need to be double-checked
+        for subscriber in wildcardMatches - matches:
+            if matchChangePattern(change, self._patterns[subscriber]):
+                matches.add(subscriber)
+        return matches
+
+
+class _PatternIndexNode:
+    __slots__ = ["children", "leafSubscribers", "subtreeSubscribers"]
+
+    def __init__(self) -> None:
+        self.children: dict[str | int, _PatternIndexNode] = {}
+        # The subscribers for which this node is a leaf node
+        self.leafSubscribers: set = set()
+        # The number of pattern nodes at or below this node, per subscriber
+        self.subtreeSubscribers: dict[Any, int] = {}
+
+
+def _updatePatternIndex(
+    node: _PatternIndexNode, subscriber: Any, matchPattern: dict, delta: int
+) -> int:
+    totalCount = 0
+    for key, subPattern in matchPattern.items():
+        childNode = node.children.get(key)
+        if childNode is None:
+            childNode = node.children[key] = _PatternIndexNode()
+        if subPattern is None:
+            count = 1
+            if delta > 0:
+                childNode.leafSubscribers.add(subscriber)
+            else:
+                childNode.leafSubscribers.discard(subscriber)
+        else:
+            count = 1 + _updatePatternIndex(childNode, subscriber, subPattern, delta)
+        subtreeCount = childNode.subtreeSubscribers.get(subscriber, 0) + delta * count
+        if subtreeCount > 0:
+            childNode.subtreeSubscribers[subscriber] = subtreeCount
+        else:
+            childNode.subtreeSubscribers.pop(subscriber, None)
+            if not childNode.subtreeSubscribers:
+                del node.children[key]
+        totalCount += count
+    return totalCount
+
+
+def _collectPatternIndexMatches(
+    node: _PatternIndexNode,
+    change: dict[str, Any],
+    pathIndex: int,
+    viaWildcard: bool,
+    matches: set,
+    wildcardMatches: set,
+) -> None:
+    path = change.get("p", [])
+    if pathIndex < len(path):
+        for key, childViaWildcard in [(path[pathIndex], viaWildcard), (wildcard, True)]:
+            childNode = node.children.get(key)
+            if childNode is None:
+                continue
+            (wildcardMatches if childViaWildcard else matches).update(
+                childNode.leafSubscribers
+            )
+            _collectPatternIndexMatches(
+                childNode,
+                change,
+                pathIndex + 1,
+                childViaWildcard,
+                matches,
+                wildcardMatches,
+            )
+        return
+
+    if change.get("f") in baseChangeFunctions:
+        args = change.get("a")
+        if args:
+            childNode = node.children.get(args[0])
+            if childNode is not None:
+                (wildcardMatches if viaWildcard else matches).update(
+                    childNode.subtreeSubscribers
+                )
+
+    for childChange in change.get("c", []):
+        _collectPatternIndexMatches(
+            node, childChange, 0, viaWildcard, matches, wildcardMatches
+        )
+
+
 def filterChangePattern(
     change: dict[str, Any], matchPattern: dict[str | int, Any], inverse: bool = False
 ) -> dict[str, Any] | None:
@@ -347,3 +466,36 @@ def _iterateChangePaths(
         return
     for childChange in change.get("c", []):
         yield from _iterateChangePaths(childChange, depth, path)
+
+
+setterChangeFunctions = {"=", "=xy"}
+
+
+def collectSetterTargets(change: dict[str, Any]) -> set[tuple] | None:
+    """Return the set of targets that the `change` assigns to, or `None` if the
+    change does anything else than plain assignments ("=" and "=xy").
+
+    Applying change A followed by change B has the same result as only applying
+    change B, if both are plain assignments and the targets of A are a subset of
+    the targets of B.
+    """
+    targets: set[tuple] = set()
+    if not _collectSetterTargets(change, (), targets):
+        return None
+    return targets
+
+
+def _collectSetterTargets(
+    change: dict[str, Any], prefix: tuple, targets: set[tuple]
+) -> bool:
+    path = prefix + tuple(change.get("p", ()))
+    functionName = change.get("f")
+    if functionName is not None:
+        args = change.get("a")
+        if functionName not in setterChangeFunctions or not args:
+            return False
+        targets.add((functionName, path, args[0]))
+    for childChange in change.get("c", []):
+        if not _collectSetterTargets(childChange, path, targets):
+            return False
+    return True
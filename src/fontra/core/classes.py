@@ -292,6 +292,29 @@ def _hasAnyPathType(varGlyph, pathType):
     )
 
 
+def approximateGlyphSize(glyph: VariableGlyph | None) -> int:
+    # A rough estimate of the memory footprint of a glyph, in bytes. It doesn't
+    # need to be accurate, it just needs to be cheap and proportional.
+    if glyph is None:
+        return 64
+    size = 512 + 256 * len(glyph.sources)
+    for layer in glyph.layers.values():
+        staticGlyph = layer.glyph
+        path = staticGlyph.path
+        numPoints = (
+            len(path.pointTypes)
+            if isinstance(path, PackedPath)
+            else sum(len(contour.points) for contour in path.contours)
+        )
+        numItems = (
+            len(staticGlyph.components)
+            + len(staticGlyph.anchors)
+            + len(staticGlyph.guidelines)
+        )
+        size += 512 + 72 * numPoints + 256 * numItems
+    return size
+
+
 def makeSchema(*classes, schema=None):
     if schema is None:
         schema = {}
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Collection
+
+logger = logging.getLogger(__name__)
+
+# Set this environment variable to a folder to use for persistent caches, or to
+# an empty string to disable them
+CACHE_DIR_ENV_VAR = "FONTRA_CACHE_DIR"
+
+
+def getCacheDir() -> pathlib.Path | None:
+    cacheDir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if cacheDir is not None:
+        return pathlib.Path(cacheDir) if cacheDir else None
+
+    home = pathlib.Path.home()
+    if sys.platform == "darwin":
+        baseDir = home / "Library" / "Caches"
+    elif sys.platform == "win32":
+        baseDir = pathlib.Path(
+            os.environ.get("LOCALAPPDATA") or home / "AppData" / "Local"
+        )
+    else:
+        baseDir = pathlib.Path(os.environ.get("XDG_CACHE_HOME") or home / ".cache")
+    return baseDir / "fontra"
+
+
+def getProjectCachePath(
+    projectPath: os.PathLike | str, cacheName: str
+) -> pathlib.Path | None:
+    # Return the path of the sidecar cache file named `cacheName` for the project
+    # at `projectPath`, or None if persistent caches are disabled. The cache files
+    # live in the user's cache folder rather than next to the project, so we
+    # never write into font sources, even read-only ones.
+    cacheDir = getCacheDir()
+    if cacheDir is None:
+        return None
+    projectPath = os.path.abspath(os.fspath(projectPath))
+    projectKey = hashlib.sha256(projectPath.encode("utf-8")).hexdigest()[:32]
+    return cacheDir / cacheName / f"{projectKey}.json"
+
+
+def getFileFingerprint(path: os.PathLike | str) -> list | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+@dataclass(kw_only=True)
+class FileStatCache:
+    # A persistent mapping from keys to values derived from file contents. Each
+    # value is stored together with a "fingerprint" of the file it was derived
+    # from (typically its modification time and size, see getFileFingerprint()),
+    # and a lookup only succeeds if the fingerprint is unchanged.
+    path: pathlib.Path | None
+    formatVersion: int
+    entries: dict[str, list] = field(default_factory=dict)
+    dirty: bool = False
+
+    @classmethod
+    def load(cls, path: pathlib.Path | None, formatVersion: int) -> FileStatCache:
+        cache = cls(path=path, formatVersion=formatVersion)
+        if path is None:
+            return cache
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"can't read cache file {path}: {e!r}")
+        else:
+            if (
+                isinstance(data, dict)
+                and data.get("formatVersion") == formatVersion
+                and isinstance(data.get("entries"), dict)
+            ):
+                cache.entries = data["entries"]
+        return cache
+
+    def lookup(self, key: str, fingerprint: list | None) -> tuple[bool, Any]:
+        entry = self.entries.get(key)
+        if fingerprint is None or entry is None or entry[0] != fingerprint:
+            return False, None
+        return True, entry[1]
+
+    def store(self, key: str, fingerprint: list | None, value: Any) -> None:
+        if fingerprint is None:
+            self.discard(key)
+            return
+        self.entries[key] = [fingerprint, value]
+        self.dirty = True
+
+    def discard(self, key: str) -> None:
+        if self.entries.pop(key, None) is not None:
+            self.dirty = True
+
+    def prune(self, keys: Collection[str]) -> None:
+        # Drop all entries whose key is not in `keys`
+        for key in [key for key in self.entries if key not in keys]:
+            self.discard(key)
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        data = {"formatVersion": self.formatVersion, "entries": self.entries}
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        tempPath = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tempPath.write_text(text, encoding="utf-8")
+            os.replace(tempPath, self.path)
+        except OSError as e:
+            logger.warning(f"can't write cache file {self.path}: {e!r}")
+        else:
+            self.dirty = False
@@ -10,24 +10,35 @@ from dataclasses import dataclass
 from functools import cached_property
 from typing import Any, AsyncGenerator, Awaitable, Callable, Optional
 
+from .backendthread import ThreadedFontBackend
 from .changes import (
+    ChangePatternIndex,
     applyChange,
     collectChangePaths,
+    collectSetterTargets,
     filterChangePattern,
-    matchChangePattern,
     patternDifference,
     patternFromPath,
     patternIntersect,
     patternUnion,
 )
-from .classes import Font, FontInfo, FontSource, ImageData, VariableGlyph
-from .lrucache import LRUCache
+from .classes import (
+    Font,
+    FontInfo,
+    FontSource,
+    ImageData,
+    VariableGlyph,
+    approximateGlyphSize,
+)
+from .lrucache import SizedLRUCache
 from .protocols import (
     ExportManager,
+    GlyphDependenciesProvider,
     MetaInfoProvider,
     ReadableFontBackend,
     WatchableFontBackend,
     WritableFontBackend,
+    WriteGlyphs,
 )
 
 logger = logging.getLogger(__name__)
@@ -42,6 +53,16 @@ def remoteMethod(method):
     return method
 
 
+@dataclass(kw_only=True, frozen=True)
+class GlyphWrite:
+    # A scheduled glyph write. These are queued as records rather than as
+    # partial(putGlyph, ...) calls, so consecutive ones can be batched into a
+    # single putGlyphs() call.
+    glyphName: str
+    glyph: VariableGlyph
+    codePoints: list[int]
+
+
 @dataclass(kw_only=True)
 class FontHandler:
     backend: ReadableFontBackend
@@ -51,14 +72,36 @@ class FontHandler:
     readOnly: bool = False
     dummyEditor: bool = False  # allow editing in read-only mode, don't write to backend
     allConnectionsClosedCallback: Optional[Callable[[], Awaitable[Any]]] = None
+    localDataMaxSize: int = 64 * 1024 * 1024  # approximate, in bytes
+    liveChangesFrameRate: float = 30  # per connection, 0 means no rate limit
+    writeBatchMaxSize: int = 500  # glyphs per putGlyphs() call, 0 means no batching
+    backendThread: bool = False  # run the backend in a dedicated thread
 
     def __post_init__(self):
+        if self.backendThread:
+            # Keep the backend's blocking file I/O off our event loop
+            self.backend = ThreadedFontBackend(self.backend)
         if self.writableBackend is None:
             self.readOnly = True
         self.connections = set()
         self.clientData = defaultdict(dict)
-        self.localData = LRUCache()
+        # Indexes of the client subscription patterns, by client UUID
+        self._changePatternIndexes = {
+            CHANGES_PATTERN_KEY: ChangePatternIndex(),
+            LIVE_CHANGES_PATTERN_KEY: ChangePatternIndex(),
+        }
+        self._connectionsByClientUUID = defaultdict(set)
+        self._connectionsWithoutClientUUID = set()
+        # Root-level data (glyphMap, kerning, etc.) is pinned: only glyphs
+        # count towards the cache size, and only glyphs get evicted
+        self.localData = SizedLRUCache(
+            self.localDataMaxSize,
+            approximateGlyphSize,
+            lambda key: not isinstance(key, tuple),
+        )
         self._dataScheduledForWriting = {}
+        self._liveChangeQueues = {}
+        self._liveChangeSendTimes = {}
         self.glyphMap = {}
 
     @cached_property
@@ -80,12 +123,19 @@ class FontHandler:
         self._writingInProgressEvent.set()
 
     async def aclose(self) -> None:
-        await self.backend.aclose()
         if hasattr(self, "_watcherTask"):
             self._watcherTask.cancel()
         if hasattr(self, "_processWritesTask"):
             await self.finishWriting()  # shield for cancel?
             self._processWritesTask.cancel()
+        # Close the backend after the pending writes are done: a threaded
+        # backend can't be called anymore once it is closed
+        await self.backend.aclose()
+        logger.info(
+            f"local data cache: {self.localData.hits} hits, "
+            f"{self.localData.misses} misses, "
+            f"{self.localData.evictions} evictions"
+        )
 
     async def processExternalChanges(self, reloadPattern) -> None:
         if reloadPattern is not None and "glyphMap" in reloadPattern:
@@ -128,33 +178,94 @@ class FontHandler:
             [], Awaitable[None]
         ]  # inferencing with partial() goes wrong
         while self._dataScheduledForWriting:
-            writeKey, (writeFunc, connection, reloadPattern) = popFirstItem(
-                self._dataScheduledForWriting
-            )
-            logger.info(f"write {writeKey} to backend")
+            glyphWrites = self._popGlyphWritesBatch()
+            if glyphWrites:
+                logger.info(f"write {len(glyphWrites)} glyphs to backend")
+                assert isinstance(self.backend, WriteGlyphs)
+                writeFunc = functools.partial(
+                    self.backend.putGlyphs,
+                    {
+                        glyphWrite.glyphName: (glyphWrite.glyph, glyphWrite.codePoints)
+                        for glyphWrite, _, _ in glyphWrites
+                    },
+                )
+                writes = [
+                    (connection, reloadPattern)
+                    for _, connection, reloadPattern in glyphWrites
+                ]
+            else:
+                writeKey, (write, connection, reloadPattern) = popFirstItem(
+                    self._dataScheduledForWriting
+                )
+                logger.info(f"write {writeKey} to backend")
+                if isinstance(write, GlyphWrite):
+                    assert self.writableBackend is not None
+                    writeFunc = functools.partial(
+                        self.writableBackend.putGlyph,
+                        write.glyphName,
+                        write.glyph,
+                        write.codePoints,
+                    )
+                else:
+                    writeFunc = write
+                writes = [(connection, reloadPattern)]
             try:
                 await writeFunc()
             except Exception as e:
                 logger.error("exception while writing data: %r", e)
                 traceback.print_exc()
-                await self.reloadData(reloadPattern)
-                if connection is not None:
+                await self.reloadData(
+                    functools.reduce(
+                        patternUnion, [reloadPattern for _, reloadPattern in writes]
+                    )
+                )
+                connections = {connection for connection, _ in writes}
+                for connection in connections - {None}:
                     await connection.proxy.messageFromServer(
                         "The data could not be saved due to an error.",
                         f"The edit has been reverted.\n\n{e!r}",
                     )
-                else:
+                if None in connections:
                     # No connection to inform, let's error
                     raise
             await asyncio.sleep(0)
 
+    def _popGlyphWritesBatch(self) -> list[tuple[GlyphWrite, Any, Any]]:
+        # Pop the glyph writes at the front of the write queue, so they can be
+        # written with a single putGlyphs() call. Writes to other data, as well
+        # as glyph deletions, are not reordered with respect to glyph writes.
+        if self.writeBatchMaxSize < 2 or not isinstance(self.backend, WriteGlyphs):
+            return []
+        writeKeys: list[Any] = []
+        for writeKey, (write, _, _) in self._dataScheduledForWriting.items():
+            if len(writeKeys) >= self.writeBatchMaxSize or not isinstance(
+                write, GlyphWrite
+            ):
+                break
+            writeKeys.append(writeKey)
+        if len(writeKeys) < 2:
+            # Not worth a bulk write
+            return []
+        return [self._dataScheduledForWriting.pop(writeKey) for writeKey in writeKeys]
+
     @asynccontextmanager
     async def useConnection(self, connection) -> AsyncGenerator[None, None]:
         self.connections.add(connection)
+        # The client UUID is usually not yet known at this point, as it is sent
+        # in the connection handshake
+        self._connectionsWithoutClientUUID.add(connection)
         try:
             yield
         finally:
             self.connections.remove(connection)
+            self._connectionsWithoutClientUUID.discard(connection)
+            clientConnections = self._connectionsByClientUUID.get(connection.clientUUID)
+            if clientConnections is not None:
+                clientConnections.discard(connection)
+                if not clientConnections:
+                    del self._connectionsByClientUUID[connection.clientUUID]
+            self._liveChangeQueues.pop(connection, None)
+            self._liveChangeSendTimes.pop(connection, None)
             if not self.connections and self.allConnectionsClosedCallback is not None:
                 await self.allConnectionsClosedCallback()
 
@@ -191,6 +302,30 @@ class FontHandler:
             self.localData[("glyphs", glyphName)] = glyph
         return glyph
 
+    @remoteMethod
+    async def getGlyphs(
+        self, glyphNames: list[str], *, connection=None
+    ) -> dict[str, VariableGlyph | None]:
+        # Fetch many glyphs in a single round-trip: glyphs we already have are
+        # taken from the cache, the others are read from the backend concurrently
+        glyphs = {}
+        missingGlyphNames = []
+        for glyphName in dict.fromkeys(glyphNames):
+            glyph = self.localData.get(("glyphs", glyphName))
+            if glyph is None:
+                missingGlyphNames.append(glyphName)
+            else:
+                glyphs[glyphName] = glyph
+
+        fetchedGlyphs = await asyncio.gather(
+            *(self._getGlyph(glyphName) for glyphName in missingGlyphNames)
+        )
+        for glyphName, glyph in zip(missingGlyphNames, fetchedGlyphs, strict=True):
+            self.localData[("glyphs", glyphName)] = glyph
+            glyphs[glyphName] = glyph
+
+        return {glyphName: glyphs[glyphName] for glyphName in glyphNames}
+
     def _getGlyph(self, glyphName) -> Awaitable[VariableGlyph | None]:
         return asyncio.create_task(self._getGlyphFromBackend(glyphName))
 
@@ -328,7 +463,29 @@ class FontHandler:
         )
 
     @remoteMethod
-    async def findGlyphsThatUseGlyph(self, glyphName: str, *, connection) -> list[str]:
+    async def findGlyphsThatUseGlyph(
+        self, glyphName: str, transitive: bool = False, *, connection
+    ) -> list[str]:
+        # If `transitive` is true, also return the glyphs that use the glyph
+        # indirectly, via nested components: those are the glyphs that are
+        # affected by a change to `glyphName`
+        if not transitive:
+            return await self._findGlyphsThatUseGlyph(glyphName)
+
+        if isinstance(self.backend, GlyphDependenciesProvider):
+            dependencies = await self.backend.glyphDependencies
+            return sorted(dependencies.usedByClosure(glyphName))
+
+        usedBy: set[str] = set()
+        glyphNames = [glyphName]
+        while glyphNames:
+            for parentGlyphName in await self._findGlyphsThatUseGlyph(glyphNames.pop()):
+                if parentGlyphName not in usedBy:
+                    usedBy.add(parentGlyphName)
+                    glyphNames.append(parentGlyphName)
+        return sorted(usedBy)
+
+    async def _findGlyphsThatUseGlyph(self, glyphName: str) -> list[str]:
         if hasattr(self.backend, "findGlyphsThatUseGlyph"):
             return await self.backend.findGlyphsThatUseGlyph(glyphName)
         return []
@@ -347,8 +504,9 @@ class FontHandler:
 
     def _adjustMatchPattern(self, func, pathOrPattern, wantLiveChanges, connection):
         key = LIVE_CHANGES_PATTERN_KEY if wantLiveChanges else CHANGES_PATTERN_KEY
-        matchPattern = self._getClientData(connection, key, {})
-        self._setClientData(connection, key, func(matchPattern, pathOrPattern))
+        matchPattern = func(self._getClientData(connection, key, {}), pathOrPattern)
+        self._setClientData(connection, key, matchPattern)
+        self._changePatternIndexes[key].setPattern(connection.clientUUID, matchPattern)
 
     @remoteMethod
     async def editIncremental(self, liveChange, *, connection) -> None:
@@ -377,21 +535,72 @@ class FontHandler:
         else:
             matchPatternKeys = [LIVE_CHANGES_PATTERN_KEY, CHANGES_PATTERN_KEY]
 
+        self._registerConnectionClientUUIDs()
+        clientUUIDs = set()
+        for key in matchPatternKeys:
+            clientUUIDs.update(self._changePatternIndexes[key].matchChange(change))
+
         connections = [
             connection
-            for connection in self.connections
+            for clientUUID in clientUUIDs
+            for connection in self._connectionsByClientUUID.get(clientUUID, ())
             if connection != sourceConnection
-            and any(
-                matchChangePattern(change, self._getClientData(connection, k, {}))
-                for k in matchPatternKeys
-            )
         ]
 
         for connection in connections:
+            if isLiveChange and self.liveChangesFrameRate:
+                self._queueLiveChange(connection, change)
+                continue
+            # Queued live changes must arrive before anything that follows them
+            self._sendQueuedLiveChanges(connection)
             scheduleTaskAndLogException(
                 connection.proxy.externalChange(change, isLiveChange)
             )
 
+    def _registerConnectionClientUUIDs(self):
+        for connection in list(self._connectionsWithoutClientUUID):
+            if connection.clientUUID is not None:
+                self._connectionsWithoutClientUUID.discard(connection)
+                self._connectionsByClientUUID[connection.clientUUID].add(connection)
+
+    def _queueLiveChange(self, connection, change):
+        queue = self._liveChangeQueues.get(connection)
+        if queue is None:
+            queue = []
+            self._liveChangeQueues[connection] = queue
+            loop = asyncio.get_running_loop()
+            sendTime = self._liveChangeSendTimes.get(connection, 0)
+            delay = sendTime + 1 / self.liveChangesFrameRate - loop.time()
+            scheduleTaskAndLogException(
+                self._sendQueuedLiveChangesDelayed(connection, queue, delay)
+            )
+
+        targets = collectSetterTargets(change)
+        # A live change that assigns to everything the previous change assigned
+        # to makes the previous change redundant: think dragging a point around
+        while (
+            queue
+            and targets is not None
+            and queue[-1][1] is not None
+            and queue[-1][1] <= targets
+        ):
+            queue.pop()
+        queue.append((change, targets))
+
+    async def _sendQueuedLiveChangesDelayed(self, connection, queue, delay):
+        await asyncio.sleep(max(0, delay))
+        if self._liveChangeQueues.get(connection) is queue:
+            self._sendQueuedLiveChanges(connection)
+
+    def _sendQueuedLiveChanges(self, connection):
+        queue = self._liveChangeQueues.pop(connection, None)
+        if not queue:
+            return
+        self._liveChangeSendTimes[connection] = asyncio.get_running_loop().time()
+        changes = [change for change, targets in queue]
+        change = changes[0] if len(changes) == 1 else {"c": changes}
+        scheduleTaskAndLogException(connection.proxy.externalChange(change, True))
+
     async def updateLocalDataWithExternalChange(self, change):
         await self._updateLocalDataAndWriteToBackend(change, None, True)
 
@@ -468,16 +677,17 @@ class FontHandler:
                     writeKey = ("glyphs", glyphName)
                     if glyphName in glyphSet.newKeys:
                         self.localData[writeKey] = glyphSet[glyphName]
+                    else:
+                        # The cached glyph was changed in place
+                        self.localData.updateSize(writeKey)
                     if not writeToBackEnd:
                         continue
-                    assert self.writableBackend is not None
-                    writeFunc = functools.partial(
-                        self.writableBackend.putGlyph,
-                        glyphName,
-                        deepcopy(glyphSet[glyphName]),
-                        glyphMap.get(glyphName, []),
+                    glyphWrite = GlyphWrite(
+                        glyphName=glyphName,
+                        glyph=deepcopy(glyphSet[glyphName]),
+                        codePoints=glyphMap.get(glyphName, []),
                     )
-                    await self.scheduleDataWrite(writeKey, writeFunc, sourceConnection)
+                    await self.scheduleDataWrite(writeKey, glyphWrite, sourceConnection)
                 for glyphName in sorted(glyphSet.deletedKeys):
                     writeKey = ("glyphs", glyphName)
                     _ = self.localData.pop(writeKey, None)
@@ -510,7 +720,11 @@ class FontHandler:
                 await self.scheduleDataWrite(rootKey, writeFunc, sourceConnection)
 
     async def scheduleDataWrite(
-        self, writeKey, writeFunc, connection, reloadPattern=None
+        self,
+        writeKey,
+        write: Callable[[], Awaitable[None]] | GlyphWrite,
+        connection,
+        reloadPattern=None,
     ):
         if self._dataScheduledForWriting is None:
             # The write-"thread" is no longer running
@@ -524,7 +738,7 @@ class FontHandler:
         shouldSignal = not self._dataScheduledForWriting
         if reloadPattern is None:
             reloadPattern = _writeKeyToPattern(writeKey)
-        self._dataScheduledForWriting[writeKey] = (writeFunc, connection, reloadPattern)
+        self._dataScheduledForWriting[writeKey] = (write, connection, reloadPattern)
         if shouldSignal:
             self._processWritesEvent.set()  # write: go!
             self._writingInProgressEvent.clear()
@@ -1,5 +1,11 @@
+import heapq
 from dataclasses import dataclass, field
-from typing import Sequence
+from typing import Iterable, Mapping, Sequence
+
+# The name and format version of the persistent cache for the component names
+# of glyph files, see core/filecache.py
+GLYPH_DEPENDENCIES_CACHE_NAME = "glyph-dependencies"
+GLYPH_DEPENDENCIES_CACHE_FORMAT_VERSION = 1
 
 
 @dataclass(kw_only=True)
@@ -7,7 +13,20 @@ class GlyphDependencies:
     usedBy: dict[str, set[str]] = field(init=False, default_factory=dict)
     madeOf: dict[str, set[str]] = field(init=False, default_factory=dict)
 
+    # Memoized transitive queries, invalidated by update()
+    _usedByClosures: dict[str, frozenset[str]] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _madeOfClosures: dict[str, frozenset[str]] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _topologicalIndex: dict[str, int] | None = field(
+        init=False, repr=False, compare=False, default=None
+    )
+
     def update(self, glyphName: str, componentNames: Sequence[str]) -> None:
+        self._invalidateClosures(glyphName, componentNames)
+
         # Zap previous used-by data for this glyph, if any
         for componentName in self.madeOf.get(glyphName, ()):
             if componentName in self.usedBy:
@@ -27,3 +46,104 @@ class GlyphDependencies:
             if componentName not in self.usedBy:
                 self.usedBy[componentName] = set()
             self.usedBy[componentName].add(glyphName)
+
+    def usedByClosure(self, glyphName: str) -> frozenset[str]:
+        # Return all glyphs that use `glyphName`, directly or indirectly
+        closure = self._usedByClosures.get(glyphName)
+        if closure is None:
+            closure = frozenset(_reachable(self.usedBy, [glyphName]))
+            self._usedByClosures[glyphName] = closure
+        return closure
+
+    def madeOfClosure(self, glyphName: str) -> frozenset[str]:
+        # Return all glyphs that `glyphName` uses as a component, directly or
+        # indirectly
+        closure = self._madeOfClosures.get(glyphName)
+        if closure is None:
+            closure = frozenset(_reachable(self.madeOf, [glyphName]))
+            self._madeOfClosures[glyphName] = closure
+        return closure
+
+    def componentsClosure(self, glyphNames: Iterable[str]) -> set[str]:
+        # Return `glyphNames` plus all glyphs they use as components, recursively
+        closure = set(glyphNames)
+        for glyphName in list(closure):
+            closure.update(self.madeOfClosure(glyphName))
+        return closure
+
+    def topologicalOrder(self, glyphNames: Iterable[str] | None = None) -> list[str]:
+        # Return `glyphNames` (by default all glyphs that use or are used as a
+        # component) ordered so that each glyph comes after all glyphs it uses as
+        # a component. Glyphs that take part in, or depend on, a component cycle
+        # are placed last.
+        if self._topologicalIndex is None:
+            self._topologicalIndex = {
+                glyphName: index
+                for index, glyphName in enumerate(
+                    _topologicalSort(self.madeOf, self.usedBy)
+                )
+            }
+        index = self._topologicalIndex
+        if glyphNames is None:
+            return list(index)
+        # Glyphs without dependencies can go anywhere: put them first
+        return sorted(glyphNames, key=lambda glyphName: index.get(glyphName, -1))
+
+    def _invalidateClosures(self, glyphName: str, componentNames: Sequence[str]):
+        self._topologicalIndex = None
+
+        if self._madeOfClosures:
+            # The made-of closures change for the glyph itself and for all glyphs
+            # that use it
+            self._madeOfClosures.pop(glyphName, None)
+            for parentGlyphName in _reachable(self.usedBy, [glyphName]):
+                self._madeOfClosures.pop(parentGlyphName, None)
+
+        if self._usedByClosures:
+            # The used-by closures change for the old and new components of the
+            # glyph, and for all glyphs they use
+            affectedNames = set(componentNames) | self.madeOf.get(glyphName, set())
+            self._usedByClosures.pop(glyphName, None)
+            for componentName in affectedNames | _reachable(self.madeOf, affectedNames):
+                self._usedByClosures.pop(componentName, None)
+
+
+def _reachable(graph: Mapping[str, set[str]], glyphNames: Iterable[str]) -> set[str]:
+    reachable: set[str] = set()
+    stack = list(glyphNames)
+    while stack:
+        for nextGlyphName in graph.get(stack.pop(), ()):
+            if nextGlyphName not in reachable:
+                reachable.add(nextGlyphName)
+                stack.append(nextGlyphName)
+    return reachable
+
+
+def _topologicalSort(
+    madeOf: Mapping[str, set[str]], usedBy: Mapping[str, set[str]]
+) -> list[str]:
+    # Kahn's algorithm, with a heap to make the order deterministic
+    numDependencies = {
+        glyphName: len(componentNames) for glyphName, componentNames in madeOf.items()
+    }
+    for glyphName in usedBy:
+        numDependencies.setdefault(glyphName, 0)
+
+    ready = [glyphName for glyphName, count in numDependencies.items() if not count]
+    heapq.heapify(ready)
+
+    order = []
+    while ready:
+        glyphName = heapq.heappop(ready)
+        order.append(glyphName)
+        for parentGlyphName in usedBy.get(glyphName, ()):
+            numDependencies[parentGlyphName] -= 1
+            if not numDependencies[parentGlyphName]:
+                heapq.heappush(ready, parentGlyphName)
+
+    if len(order) < len(numDependencies):
+        # There are cycles
+        seen = set(order)
+        order.extend(sorted(set(numDependencies) - seen))
+
+    return order
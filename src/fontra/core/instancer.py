@@ -3,7 +3,8 @@ from __future__ import annotations
 import logging
 from collections import defaultdict
 from contextlib import contextmanager
-from dataclasses import dataclass, replace
+from copy import deepcopy
+from dataclasses import dataclass, fields, replace
 from enum import Enum
 from functools import cached_property, singledispatch
 from types import SimpleNamespace
@@ -29,7 +30,7 @@ from .classes import (
 )
 from .discretevariationmodel import DiscreteDeltas, DiscreteVariationModel
 from .lrucache import LRUCache
-from .path import InterpolationError, PackedPath, joinPaths
+from .path import InterpolationError, PackedPath, copyContourInfo, joinPaths
 from .protocols import ReadableFontBackend
 from .varutils import (
     AxisRange,
@@ -42,6 +43,11 @@ from .varutils import (
 logger = logging.getLogger(__name__)
 
 
+# Location values are rounded to this many decimals for instance cache keys,
+# so tiny floating point differences don't cause cache misses
+LOCATION_CACHE_KEY_PRECISION = 6
+
+
 class LocationCoordinateSystem(Enum):
     USER = 1
     SOURCE = 2  # "designspace coords"
@@ -55,9 +61,32 @@ class GlyphNotFoundError(Exception):
 class FontInstancer:
     backend: ReadableFontBackend
     failOnInterpolationError: bool = False
+    # The maximum number of cached glyph instances, for all glyphs together. The
+    # cache is off by default: cached instances are shared between callers, so
+    # only enable it if the callers don't modify the instances they get.
+    instanceCacheSize: int = 0
+    # The maximum number of memoized decomposed paths of component glyphs, see
+    # getDecomposedComponentPath(). These are internal, so they are safe to
+    # share.
+    decomposedPathCacheSize: int = 1000
 
     def __post_init__(self) -> None:
         self.glyphInstancers: dict[str, GlyphInstancer] = {}
+        # Instances of the glyphs in self.glyphInstancers, keyed by
+        # (glyph name, quantized location)
+        self._instanceCache: LRUCache | None = (
+            LRUCache(self.instanceCacheSize) if self.instanceCacheSize else None
+        )
+        # Decomposed paths of the glyphs in self.glyphInstancers, keyed like
+        # the instances
+        self._decomposedPathCache: LRUCache | None = (
+            LRUCache(self.decomposedPathCacheSize)
+            if self.decomposedPathCacheSize
+            else None
+        )
+        # Component glyph name -> names of glyphs whose cached instances and
+        # decomposed paths depend on it, for invalidation
+        self._cachedComponentUsedBy: dict[str, set[str]] = defaultdict(set)
         self._fontAxes: list[FontAxis | DiscreteFontAxis] | None = None
         self._fontSources: dict[str, FontSource] | None = None
         self._glyphErrors: set[str] = set()
@@ -153,6 +182,69 @@ class FontInstancer:
 
     def dropGlyphInstancerFromCache(self, glyphName):
         self.glyphInstancers.pop(glyphName, None)
+        self._dropInstancesFromCache(glyphName)
+
+    def _dropInstancesFromCache(self, glyphName):
+        caches = [
+            cache
+            for cache in [self._instanceCache, self._decomposedPathCache]
+            if cache is not None
+        ]
+        if not caches:
+            return
+        # The decomposed paths of glyphs that use this glyph as a component
+        # (directly or indirectly) are stale
+        droppedGlyphNames = set()
+        glyphNames = [glyphName]
+        while glyphNames:
+            glyphName = glyphNames.pop()
+            droppedGlyphNames.add(glyphName)
+            glyphNames.extend(self._cachedComponentUsedBy.pop(glyphName, ()))
+        for cache in caches:
+            for key in [key for key in cache if key[0] in droppedGlyphNames]:
+                del cache[key]
+
+    def _isCachedInstancer(self, glyphInstancer: GlyphInstancer) -> bool:
+        # Only instancers owned by our glyph instancer cache are eligible for
+        # the instance and decomposed path caches, as only those are subject to
+        # dropGlyphInstancerFromCache()
+        return self.glyphInstancers.get(glyphInstancer.glyph.name) is glyphInstancer
+
+    def _getInstanceCache(self, glyphInstancer: GlyphInstancer) -> LRUCache | None:
+        if not self._isCachedInstancer(glyphInstancer):
+            return None
+        return self._instanceCache
+
+    def _registerComponentUse(self, glyphName: str, baseGlyphName: str) -> None:
+        if self._instanceCache is not None or self._decomposedPathCache is not None:
+            self._cachedComponentUsedBy[baseGlyphName].add(glyphName)
+
+    async def getDecomposedComponentPath(
+        self, glyphInstancer: GlyphInstancer, location: dict[str, float]
+    ) -> PackedPath:
+        # The decomposed path of a component glyph is memoized by glyph name and
+        # location, so a glyph that is used as a component by many glyphs is
+        # decomposed only once per location. The returned path is shared: don't
+        # modify it.
+        cache = self._decomposedPathCache
+        if (
+            cache is None
+            # Collecting axis ranges relies on all nested components being
+            # instantiated
+            or self.variableGlyphAxisRanges is not None
+            or not self._isCachedInstancer(glyphInstancer)
+        ):
+            return await glyphInstancer.instantiate(location).getDecomposedPath()
+
+        cacheKey = (
+            glyphInstancer.glyph.name,
+            glyphInstancer._getLocationCacheKey(location),
+        )
+        decomposedPath = cache.get(cacheKey)
+        if decomposedPath is None:
+            instance = glyphInstancer.instantiate(location)
+            decomposedPath = cache[cacheKey] = await instance.getDecomposedPath()
+        return decomposedPath
 
     def glyphError(self, errorMessage):
         if errorMessage not in self._glyphErrors:
@@ -308,6 +400,28 @@ class GlyphInstancer:
                 ),
             )
 
+        instanceCache = self.fontInstancer._getInstanceCache(self)
+        if instanceCache is None:
+            return self._instantiate(location)
+
+        cacheKey = (self.glyph.name, self._getLocationCacheKey(location))
+        instance = instanceCache.get(cacheKey)
+        if instance is None:
+            instance = instanceCache[cacheKey] = self._instantiate(location)
+        return instance
+
+    def _getLocationCacheKey(self, location: dict[str, float]) -> tuple:
+        # Axes that are not used by this glyph don't affect the instance
+        combinedAxisNames = self.combinedAxisNames
+        return tuple(
+            sorted(
+                (name, round(value, LOCATION_CACHE_KEY_PRECISION))
+                for name, value in location.items()
+                if name in combinedAxisNames
+            )
+        )
+
+    def _instantiate(self, location) -> GlyphInstance:
         try:
             result = self.model.interpolateFromDeltas(location, self.deltas)
         except Exception as e:
@@ -317,19 +431,24 @@ class GlyphInstancer:
                 f"glyph {self.glyph.name} caused an error: {e!r}"
             )
             # Fall back to default source
-            instantiatedGlyph = self.glyph.layers[self.fallbackSource.layerName].glyph
+            fallbackGlyph = self.glyph.layers[self.fallbackSource.layerName].glyph
             componentTypes = [
                 bool(
                     compo.location
                     or compo.transformation.tCenterX
                     or compo.transformation.tCenterY
                 )
-                for compo in instantiatedGlyph.components
+                for compo in fallbackGlyph.components
             ]
+            instantiatedGlyph: StaticGlyph | FlattenedGlyph = fallbackGlyph
         else:
-            assert isinstance(result.instance, MathWrapper)
-            assert isinstance(result.instance.subject, StaticGlyph)
-            instantiatedGlyph = result.instance.subject
+            if isinstance(result.instance, FlattenedGlyph):
+                # Unflattened lazily by GlyphInstance
+                instantiatedGlyph = result.instance
+            else:
+                assert isinstance(result.instance, MathWrapper)
+                assert isinstance(result.instance.subject, StaticGlyph)
+                instantiatedGlyph = result.instance.subject
             componentTypes = self.componentTypes
 
         # Only font axis values can be inherited, so filter out glyph axes
@@ -452,8 +571,14 @@ class GlyphInstancer:
                 for layerGlyph in layerGlyphs
             ]
 
-        sourceValues = [MathWrapper(layerGlyph) for layerGlyph in layerGlyphs]
-        return self.model.getDeltas(sourceValues)
+        flattenedGlyphs = flattenStaticGlyphs(layerGlyphs)
+        if flattenedGlyphs is None:
+            # The fast path can't handle these glyphs, take the generic route,
+            # which also produces the appropriate errors for incompatible glyphs
+            return self.model.getDeltas(
+                [MathWrapper(layerGlyph) for layerGlyph in layerGlyphs]
+            )
+        return self.model.getDeltas(flattenedGlyphs)
 
     def checkCompatibility(self):
         return self.model.checkCompatibilityFromDeltas(self.deltas)
@@ -484,23 +609,43 @@ class GlyphInstancer:
 @dataclass
 class GlyphInstance:
     glyphName: str
-    glyph: StaticGlyph
+    # A FlattenedGlyph is only turned into a StaticGlyph when the `glyph`
+    # property is accessed. Use the `path` and `components` properties if
+    # that's all that's needed.
+    instantiatedGlyph: StaticGlyph | FlattenedGlyph
     componentTypes: list[bool]
     parentLocation: dict[str, float]  # LocationCoordinateSystem.SOURCE
     fontInstancer: FontInstancer
 
+    @cached_property
+    def glyph(self) -> StaticGlyph:
+        # Shares its path and components with the `path` and `components`
+        # properties
+        if isinstance(self.instantiatedGlyph, FlattenedGlyph):
+            return self.instantiatedGlyph.unflatten(self.path, self.components)
+        return self.instantiatedGlyph
+
+    @cached_property
+    def path(self) -> PackedPath:
+        if isinstance(self.instantiatedGlyph, FlattenedGlyph):
+            return self.instantiatedGlyph.unflattenPath()
+        assert isinstance(self.instantiatedGlyph.path, PackedPath)
+        return self.instantiatedGlyph.path
+
+    @cached_property
+    def components(self) -> list[Component]:
+        if isinstance(self.instantiatedGlyph, FlattenedGlyph):
+            return self.instantiatedGlyph.unflattenComponents()
+        return self.instantiatedGlyph.components
+
     async def getDecomposedPath(self, transform: Transform | None = None) -> PackedPath:
-        assert isinstance(self.glyph.path, PackedPath)
-        paths: list[PackedPath] = [
-            (
-                self.glyph.path
-                if transform is None
-                else self.glyph.path.transformed(transform)
-            )
-        ]
-        for component in self.glyph.components:
-            paths.append(await self._getComponentPath(component, transform))
-        return joinPaths(paths)
+        paths: list[PackedPath] = [self.path]
+        for component in self.components:
+            paths.append(await self._getComponentPath(component))
+        decomposedPath = joinPaths(paths)
+        if transform is not None:
+            decomposedPath = decomposedPath.transformed(transform)
+        return decomposedPath
 
     async def drawPoints(
         self,
@@ -512,11 +657,11 @@ class GlyphInstance:
         assert self.componentTypes is not None
         assert self.parentLocation is not None
 
-        paths = [self.glyph.path]
+        paths = [self.path]
         components = []
 
         for component, isVarComponent in zip(
-            self.glyph.components, self.componentTypes, strict=True
+            self.components, self.componentTypes, strict=True
         ):
             if decomposeComponents or (isVarComponent and decomposeVarComponents):
                 paths.append(await self._getComponentPath(component))
@@ -536,9 +681,7 @@ class GlyphInstance:
             else:
                 pen.addComponent(component.name, component.transformation.toTransform())
 
-    async def _getComponentPath(
-        self, component, parentTransform: Transform | None = None
-    ) -> PackedPath:
+    async def _getComponentPath(self, component) -> PackedPath:
         try:
             instancer = await self.fontInstancer.getGlyphInstancer(component.name, True)
         except GlyphNotFoundError:
@@ -547,11 +690,14 @@ class GlyphInstance:
             )
             return PackedPath()
 
-        instance = instancer.instantiate(self.parentLocation | component.location)
-        transform = component.transformation.toTransform()
-        if parentTransform is not None:
-            transform = parentTransform.transform(transform)
-        return await instance.getDecomposedPath(transform)
+        self.fontInstancer._registerComponentUse(self.glyphName, component.name)
+        # The component's decomposed path is transformed as a whole, rather than
+        # the outlines of nested components with a combined transformation,
+        # so the decomposed path can be shared
+        decomposedPath = await self.fontInstancer.getDecomposedComponentPath(
+            instancer, self.parentLocation | component.location
+        )
+        return decomposedPath.transformed(component.transformation.toTransform())
 
     async def shallowDecomposeComponent(self, component: Component) -> StaticGlyph:
         try:
@@ -564,9 +710,9 @@ class GlyphInstance:
 
         instance = instancer.instantiate(self.parentLocation | component.location)
         transform = component.transformation.toTransform()
-        path = instance.glyph.path.transformed(transform)
+        path = instance.path.transformed(transform)
         components = [
-            transformComponent(compo, transform) for compo in instance.glyph.components
+            transformComponent(compo, transform) for compo in instance.components
         ]
         return StaticGlyph(path=path, components=components)
 
@@ -704,6 +850,185 @@ def areCustomDatasCompatible(parents):
     return True
 
 
+@dataclass
+class FlattenedGlyph:
+    """A StaticGlyph with all its interpolatable values (path coordinates,
+    component transformations and locations, advances and anchor positions)
+    in a single flat list, so it can be interpolated without walking the
+    StaticGlyph object tree for each arithmetic operation.
+
+    The non-interpolatable parts are taken from `template` when the glyph is
+    rebuilt with `unflatten()`. Like with MathWrapper, the result of an
+    operation takes these from the left operand.
+    """
+
+    values: list[float]
+    template: StaticGlyph
+    structureKey: tuple
+
+    def __add__(self, other: FlattenedGlyph) -> FlattenedGlyph:
+        self._ensureCompatibility(other)
+        return FlattenedGlyph(
+            [v1 + v2 for v1, v2 in zip(self.values, other.values)],
+            self.template,
+            self.structureKey,
+        )
+
+    def __sub__(self, other: FlattenedGlyph) -> FlattenedGlyph:
+        self._ensureCompatibility(other)
+        return FlattenedGlyph(
+            [v1 - v2 for v1, v2 in zip(self.values, other.values)],
+            self.template,
+            self.structureKey,
+        )
+
+    def __mul__(self, scalar: float) -> FlattenedGlyph:
+        return FlattenedGlyph(
+            [v * scalar for v in self.values], self.template, self.structureKey
+        )
+
+    def _ensureCompatibility(self, other: FlattenedGlyph) -> None:
+        if (
+            other.structureKey is not self.structureKey
+            and other.structureKey != self.structureKey
+        ):
+            raise InterpolationError("incompatible glyphs")
+
+    def unflatten(
+        self,
+        path: PackedPath | None = None,
+        components: list[Component] | None = None,
+    ) -> StaticGlyph:
+        # The path and components can be passed if they were unflattened
+        # before, with unflattenPath() and unflattenComponents()
+        template = self.template
+        values = self.values
+        assert isinstance(template.path, PackedPath)
+
+        if path is None:
+            path = self.unflattenPath()
+        if components is None:
+            components = self.unflattenComponents()
+
+        index = len(template.path.coordinates) + sum(
+            _numTransformFields + len(compo.location) for compo in template.components
+        )
+
+        metrics = []
+        for value in (template.xAdvance, template.yAdvance, template.verticalOrigin):
+            if value is not None:
+                value = values[index]
+                index += 1
+            metrics.append(value)
+        xAdvance, yAdvance, verticalOrigin = metrics
+
+        anchors = []
+        for anchor in template.anchors:
+            anchors.append(replace(anchor, x=values[index], y=values[index + 1]))
+            index += 2
+
+        assert index == len(values)
+
+        return StaticGlyph(
+            path=path,
+            components=components,
+            xAdvance=xAdvance,
+            yAdvance=yAdvance,
+            verticalOrigin=verticalOrigin,
+            anchors=anchors,
+        )
+
+    def unflattenPath(self) -> PackedPath:
+        templatePath = self.template.path
+        assert isinstance(templatePath, PackedPath)
+        return PackedPath(
+            self.values[: len(templatePath.coordinates)],
+            list(templatePath.pointTypes),
+            copyContourInfo(templatePath.contourInfo),
+            deepcopy(templatePath.pointAttributes),
+        )
+
+    def unflattenComponents(self) -> list[Component]:
+        values = self.values
+        assert isinstance(self.template.path, PackedPath)
+        index = len(self.template.path.coordinates)
+        components = []
+        for compo in self.template.components:
+            transformation = DecomposedTransform(
+                *values[index : index + _numTransformFields]
+            )
+            index += _numTransformFields
+            location = dict(zip(compo.location, values[index:]))
+            index += len(location)
+            components.append(
+                Component(
+                    name=compo.name, transformation=transformation, location=location
+                )
+            )
+        return components
+
+
+_transformFieldNames = [f.name for f in fields(DecomposedTransform)]
+_numTransformFields = len(_transformFieldNames)
+
+
+def flattenStaticGlyphs(glyphs: list[StaticGlyph]) -> list[FlattenedGlyph] | None:
+    """Return a list of FlattenedGlyph objects for `glyphs`, or None if the
+    glyphs can't be flattened or are not compatible. In that case the glyphs
+    should be interpolated with MathWrapper.
+    """
+    flattenedGlyphs: list[FlattenedGlyph] = []
+    for glyph in glyphs:
+        flattenedGlyph = flattenStaticGlyph(glyph)
+        if flattenedGlyph is None:
+            return None
+        flattenedGlyphs.append(flattenedGlyph)
+    if not flattenedGlyphs:
+        return None
+    structureKey = flattenedGlyphs[0].structureKey
+    for flattenedGlyph in flattenedGlyphs:
+        if flattenedGlyph.structureKey != structureKey:
+            return None
+        # Share the key, so compatibility checks are identity checks
+        flattenedGlyph.structureKey = structureKey
+    return flattenedGlyphs
+
+
+def flattenStaticGlyph(glyph: StaticGlyph) -> FlattenedGlyph | None:
+    if (
+        not isinstance(glyph.path, PackedPath)
+        or glyph.guidelines
+        or glyph.backgroundImage is not None
+    ):
+        return None
+
+    values = list(glyph.path.coordinates)
+
+    for compo in glyph.components:
+        transformation = compo.transformation
+        values.extend(getattr(transformation, name) for name in _transformFieldNames)
+        values.extend(compo.location.values())
+
+    metrics = (glyph.xAdvance, glyph.yAdvance, glyph.verticalOrigin)
+    values.extend(value for value in metrics if value is not None)
+
+    for anchor in glyph.anchors:
+        values.append(anchor.x)
+        values.append(anchor.y)
+
+    structureKey = (
+        len(glyph.path.coordinates),
+        tuple(
+            (contour.endPoint, contour.isClosed) for contour in glyph.path.contourInfo
+        ),
+        tuple((compo.name, tuple(compo.location)) for compo in glyph.components),
+        tuple(value is None for value in metrics),
+        tuple(anchor.name for anchor in glyph.anchors),
+    )
+
+    return FlattenedGlyph(values, glyph, structureKey)
+
+
 @dataclass
 class MathWrapper:
     subject: Any
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import AsyncGenerator, Callable, Iterable
+
+from .classes import VariableGlyph
+from .protocols import IterGlyphs, ReadableFontBackend
+
+
+async def iterGlyphs(
+    backend: ReadableFontBackend,
+    glyphNames: Iterable[str],
+    onError: Callable[[str, Exception], None] | None = None,
+) -> AsyncGenerator[tuple[str, VariableGlyph | None], None]:
+    # Yield (glyphName, glyph) tuples, using the backend's iterGlyphs() if it
+    # has one, else getGlyph(). If onError is given, it is called for glyphs
+    # that cause an error, and the iteration continues with the next glyph.
+    # Otherwise the error is raised.
+    glyphNames = list(glyphNames)
+
+    if not isinstance(backend, IterGlyphs):
+        for glyphName in glyphNames:
+            try:
+                glyph = await backend.getGlyph(glyphName)
+            except Exception as e:
+                if onError is None:
+                    raise
+                onError(glyphName, e)
+                continue
+            yield glyphName, glyph
+        return
+
+    index = 0
+    while index < len(glyphNames):
+        try:
+            async for glyphName, glyph in backend.iterGlyphs(glyphNames[index:]):
+                assert glyphName == glyphNames[index], (glyphName, glyphNames[index])
+                index += 1
+                yield glyphName, glyph
+        except Exception as e:
+            if onError is None:
+                raise
+            # The error belongs to the first glyph that was not yielded;
+            # resume the iteration after it
+            onError(glyphNames[index], e)
+            index += 1
+        else:
+            assert index == len(glyphNames), "iterGlyphs() did not yield all glyphs"
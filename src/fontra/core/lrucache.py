@@ -30,3 +30,103 @@ class LRUCache(dict):
         super().__setitem__(key, value)
         while len(self) > self._maxSize:
             del self[next(iter(self))]
+
+
+class SizedLRUCache(LRUCache):
+    """A Least Recently Used cache that limits the total *size* of its values,
+    rather than the number of items. The size of a value is computed with
+    `sizeFunc(value)`, using whatever unit `maxSize` is expressed in.
+
+    Items for which `isPinnedFunc(key)` returns True do not count towards the
+    total size, and are never evicted.
+
+    The `hits`, `misses` and `evictions` attributes count what their names say.
+    """
+
+    def __init__(self, maxSize, sizeFunc, isPinnedFunc=None):
+        super().__init__(maxSize)
+        self._sizeFunc = sizeFunc
+        self._isPinnedFunc = isPinnedFunc if isPinnedFunc is not None else _noPin
+        # Sizes of the unpinned items, in the same LRU order as the items
+        self._sizes = {}
+        self.totalSize = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getitem__(self, key):
+        try:
+            value = dict.__getitem__(self, key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        # Move key/value to the end, without recomputing the size
+        dict.__delitem__(self, key)
+        dict.__setitem__(self, key, value)
+        size = self._sizes.pop(key, None)
+        if size is not None:
+            self._sizes[key] = size
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self:
+            # Ensure key/value get inserted at the end
+            del self[key]
+        dict.__setitem__(self, key, value)
+        if not self._isPinnedFunc(key):
+            size = self._sizeFunc(value)
+            self._sizes[key] = size
+            self.totalSize += size
+            self._evict(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        size = self._sizes.pop(key, None)
+        if size is not None:
+            self.totalSize -= size
+
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = dict.__getitem__(self, key)
+        del self[key]
+        return value
+
+    def updateSize(self, key):
+        # Recompute the size of the item for `key`, after it was modified in
+        # place, and mark it as used. Does nothing if there is no such item, or
+        # if it is pinned.
+        size = self._sizes.get(key)
+        if size is None:
+            return
+        # Make it the most recently used item, so that _evict() can evict all
+        # other items
+        value = dict.pop(self, key)
+        dict.__setitem__(self, key, value)
+        del self._sizes[key]
+        newSize = self._sizeFunc(value)
+        self._sizes[key] = newSize
+        self.totalSize += newSize - size
+        self._evict(key)
+
+    def clear(self):
+        dict.clear(self)
+        self._sizes.clear()
+        self.totalSize = 0
+
+    def _evict(self, keepKey):
+        # Evict the least recently used unpinned items, but never the item that
+        # was just added: a single oversized item is allowed to stay
+        while self.totalSize > self._maxSize:
+            oldestKey = next(iter(self._sizes))
+            if oldestKey == keepKey:
+                break
+            del self[oldestKey]
+            self.evictions += 1
+
+
+def _noPin(key):
+    return False
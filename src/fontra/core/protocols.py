@@ -2,7 +2,15 @@ from __future__ import annotations
 
 import argparse
 from types import SimpleNamespace
-from typing import Any, Awaitable, Callable, Protocol, runtime_checkable
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Protocol,
+    runtime_checkable,
+)
 
 from aiohttp import web
 
@@ -15,6 +23,7 @@ from .classes import (
     OpenTypeFeatures,
     VariableGlyph,
 )
+from .glyphdependencies import GlyphDependencies
 
 
 @runtime_checkable
@@ -85,6 +94,50 @@ class WritableFontBackend(ReadableFontBackend, Protocol):
         pass
 
 
+@runtime_checkable
+class WriteGlyphs(Protocol):
+    # Optional bulk version of putGlyph(): backends can implement this to share
+    # work (such as updating glyph set contents and glyph order) between glyphs
+    async def putGlyphs(
+        self, glyphs: dict[str, tuple[VariableGlyph, list[int]]]
+    ) -> None:
+        pass
+
+
+@runtime_checkable
+class IterGlyphs(Protocol):
+    # Optional streaming version of getGlyph(): yield (glyphName, glyph) tuples
+    # for the given glyph names, in the same order. Backends can implement this
+    # to read ahead. An error for a glyph is raised when that glyph is due, and
+    # ends the iteration. Use fontra.core.iterglyphs.iterGlyphs() to iterate
+    # over the glyphs of any backend.
+    def iterGlyphs(
+        self, glyphNames: Iterable[str]
+    ) -> AsyncIterator[tuple[str, VariableGlyph | None]]:
+        pass
+
+
+@runtime_checkable
+class GlyphFingerprints(Protocol):
+    # Optional: return a cheap fingerprint of the source data of a glyph, such
+    # as the paths, modification times and sizes of its files, or None if that
+    # isn't possible. As long as the fingerprint doesn't change, the glyph
+    # doesn't either. fontra-copy --incremental uses this to skip unchanged
+    # glyphs without reading them.
+    async def getGlyphFingerprint(self, glyphName: str) -> list | None:
+        pass
+
+
+@runtime_checkable
+class GlyphDependenciesProvider(Protocol):
+    # Optional: an index of which glyphs use which glyphs as components, kept
+    # up to date by the backend. This is an async property (see
+    # core/async_property.py): `await backend.glyphDependencies`.
+    @property
+    def glyphDependencies(self) -> Awaitable[GlyphDependencies]:
+        pass
+
+
 @runtime_checkable
 class WatchableFontBackend(Protocol):
     async def watchExternalChanges(
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import traceback
 from typing import Any, AsyncGenerator, Generator
 
 from aiohttp import WSMsgType, web
 
+from .binarymessage import decodeBinaryMessage, encodeBinaryMessage
 from .classes import unstructure
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,10 @@ class RemoteObjectConnectionException(Exception):
     pass
 
 
+# The message encodings a client can choose from in the initial handshake
+MESSAGE_ENCODINGS = {"json", "binary"}
+
+
 class RemoteObjectConnection:
     def __init__(
         self,
@@ -24,15 +30,24 @@ class RemoteObjectConnection:
         subject: Any,
         verboseErrors: bool,
         authorizationToken: str = "",
+        maxChunkSize: int = 0x100000,
     ):
         self.websocket = websocket
         self.path = path
         self.subject = subject
         self.verboseErrors = verboseErrors
         self.authorizationToken = authorizationToken
+        # Encoded messages larger than this are sent in chunks
+        self.maxChunkSize = maxChunkSize
         self.clientUUID = None
+        self.encoding = "json"
         self.callReturnFutures: dict[str, asyncio.Future] = {}
         self.getNextServerCallID = _genNextServerCallID()
+        self.getNextChunkedMessageID = _genNextServerCallID()
+        # Serializes the sending of chunked messages and server -> client calls,
+        # see sendMessage()
+        self._sendLock = asyncio.Lock()
+        self._numQueuedServerCalls = 0
 
     @property
     def proxy(self) -> RemoteClientProxy:
@@ -44,6 +59,11 @@ class RemoteObjectConnection:
         self.clientUUID = messageObj.get("client-uuid")
         if self.clientUUID is None:
             raise RemoteObjectConnectionException("unrecognized message")
+        self.encoding = messageObj.get("encoding", "json")
+        if self.encoding not in MESSAGE_ENCODINGS:
+            raise RemoteObjectConnectionException(
+                f"unknown message encoding: {self.encoding}"
+            )
         try:
             await self._handleConnection()
         except Exception as e:
@@ -73,7 +93,10 @@ class RemoteObjectConnection:
                 # message.json() will fail with a TypeError.
                 # https://github.com/aio-libs/aiohttp/issues/7313#issuecomment-1586150267
                 raise message.data
-            messageObj = message.json()
+            if message.type == WSMsgType.BINARY:
+                messageObj = decodeBinaryMessage(message.data)
+            else:
+                messageObj = message.json()
 
             if messageObj.get("connection") == "close":
                 logger.info("client requested connection close")
@@ -120,7 +143,63 @@ class RemoteObjectConnection:
         await self.sendMessage(response)
 
     async def sendMessage(self, message):
-        await self.websocket.send_json(message)
+        # Large messages are sent in chunks, so a single large reply doesn't
+        # hold up the other replies: small replies may be sent between its
+        # chunks. Server -> client calls (such as externalChange) must not
+        # overtake a reply that is still being sent, as the client would apply
+        # the change to the data the reply then overwrites. So chunked messages
+        # and server -> client calls are sent one after the other, as are small
+        # replies while a server -> client call is waiting its turn.
+        data = self._encodeMessage(message)
+        isServerCall = "server-call-id" in message
+        if (
+            len(data) <= self.maxChunkSize
+            and not isServerCall
+            and not self._numQueuedServerCalls
+        ):
+            await self._sendData(data)
+            return
+
+        if isServerCall:
+            self._numQueuedServerCalls += 1
+        try:
+            async with self._sendLock:
+                if len(data) <= self.maxChunkSize:
+                    await self._sendData(data)
+                else:
+                    await self._sendChunks(data)
+        finally:
+            if isServerCall:
+                self._numQueuedServerCalls -= 1
+
+    async def _sendChunks(self, data: str | bytes) -> None:
+        # The chunks are always sent as binary messages, so the JSON encoding
+        # doesn't need to be escaped as a JSON string. The "encoding" tells the
+        # client how to decode the reassembled message.
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        chunkedMessageID = next(self.getNextChunkedMessageID)
+        for start in range(0, len(data), self.maxChunkSize):
+            end = start + self.maxChunkSize
+            chunkMessage = {
+                "chunked-message-id": chunkedMessageID,
+                "encoding": self.encoding,
+                "chunk": data[start:end],
+                "more": end < len(data),
+            }
+            await self._sendData(encodeBinaryMessage(chunkMessage))
+            await asyncio.sleep(0)
+
+    def _encodeMessage(self, message) -> str | bytes:
+        if self.encoding == "binary":
+            return encodeBinaryMessage(message)
+        return json.dumps(message)
+
+    async def _sendData(self, data: str | bytes) -> None:
+        if isinstance(data, bytes):
+            await self.websocket.send_bytes(data)
+        else:
+            await self.websocket.send_str(data)
 
     async def callMethod(self, methodName, *args):
         serverCallID = next(self.getNextServerCallID)
@@ -53,6 +53,7 @@ class FontraServer:
     cookieMaxAge: int = 7 * 24 * 60 * 60
     allowedFileExtensions: frozenset[str] = frozenset(mimeTypes.keys())
     contentRoot: Traversable | None = None
+    websocketCompression: bool = True  # permessage-deflate, if the client supports it
 
     def setup(self) -> None:
         self.startupTime = datetime.now(timezone.utc).replace(microsecond=0)
@@ -155,7 +156,11 @@ class FontraServer:
 
         token = await self.projectManager.authorize(request) or ""
 
-        websocket = web.WebSocketResponse(heartbeat=55, max_msg_size=0x2000000)
+        websocket = web.WebSocketResponse(
+            heartbeat=55,
+            max_msg_size=0x2000000,
+            compress=self.websocketCompression,
+        )
         await websocket.prepare(request)
         self._activeWebsockets.add(websocket)
         try:
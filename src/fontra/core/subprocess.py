@@ -1,6 +1,7 @@
 import asyncio
 import atexit
 import concurrent.futures
+import os
 
 _processPool = None
 
@@ -23,4 +24,13 @@ def shutdownProcessPool():
         _processPool = None
 
 
+def _forgetProcessPool():
+    # A forked child process must not use its parent's pool
+    global _processPool
+
+    _processPool = None
+
+
 atexit.register(shutdownProcessPool)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forgetProcessPool)
@@ -1,6 +1,7 @@
 import asyncio
 import atexit
 import concurrent.futures
+import os
 
 _threadPool = None
 
@@ -23,4 +24,13 @@ def shutdownThreadPool():
         _threadPool = None
 
 
+def _forgetThreadPool():
+    # A forked child process does not inherit the pool's worker threads
+    global _threadPool
+
+    _threadPool = None
+
+
 atexit.register(shutdownThreadPool)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forgetThreadPool)
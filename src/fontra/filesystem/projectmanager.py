@@ -34,6 +34,12 @@ class FileSystemProjectManagerFactory:
         )
         parser.add_argument("--max-folder-depth", type=int, default=3)
         parser.add_argument("--read-only", action="store_true")
+        parser.add_argument(
+            "--backend-thread",
+            action="store_true",
+            help="Run each font backend in a dedicated thread, so that reading "
+            "and writing font files does not block the server.",
+        )
 
     @staticmethod
     def getProjectManager(arguments: SimpleNamespace) -> ProjectManager:
@@ -41,6 +47,7 @@ class FileSystemProjectManagerFactory:
             rootPath=arguments.path,
             maxFolderDepth=arguments.max_folder_depth,
             readOnly=arguments.read_only,
+            backendThread=arguments.backend_thread,
         )
 
 
@@ -61,11 +68,13 @@ class FileSystemProjectManager:
         maxFolderDepth: int = 3,
         readOnly: bool = False,
         exportManager: ExportManager | None = None,
+        backendThread: bool = False,
     ):
         self.rootPath = rootPath
         self.singleFilePath = None
         self.maxFolderDepth = maxFolderDepth
         self.readOnly = readOnly
+        self.backendThread = backendThread
         if self.rootPath is not None and self.rootPath.suffix.lower() in fileExtensions:
             self.singleFilePath = self.rootPath
             self.rootPath = self.rootPath.parent
@@ -107,6 +116,7 @@ class FileSystemProjectManager:
                 metaInfoProvider=self,
                 exportManager=self.exportManager,
                 readOnly=self.readOnly,
+                backendThread=self.backendThread,
                 allConnectionsClosedCallback=closeFontHandler,
             )
             await fontHandler.startTasks()
@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 import pathlib
 from functools import partial
-from typing import AsyncContextManager, Protocol, runtime_checkable
+from typing import AsyncContextManager, Callable, Protocol, runtime_checkable
 
 from ...core.protocols import ReadableFontBackend
 
@@ -42,6 +42,23 @@ class OutputProcessorProtocol(Protocol):
         pass
 
 
+@runtime_checkable
+class ParallelOutputProcessorProtocol(Protocol):
+    # An output processor that can have its input glyphs processed by worker
+    # processes. Each worker opens its own copy of the input with inputOpener.
+    input: ReadableFontBackend
+
+    async def processInSubProcesses(
+        self,
+        inputOpener: Callable[[], AsyncContextManager[ReadableFontBackend]],
+        outputDir: os.PathLike = pathlib.Path(),
+        *,
+        numProcesses: int,
+        continueOnError=False,
+    ) -> None:
+        pass
+
+
 _actionRegistry: dict[str, dict[str, type]] = {
     "filter": {},
     "input": {},
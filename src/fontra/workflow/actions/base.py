@@ -8,10 +8,10 @@ import tempfile
 from contextlib import aclosing, asynccontextmanager
 from dataclasses import dataclass, field
 from functools import cached_property
-from typing import Any, AsyncGenerator, ClassVar
+from typing import Any, AsyncGenerator, ClassVar, Iterable
 
 from ...backends import getFileSystemBackend, newFileSystemBackend
-from ...backends.copy import copyFont
+from ...backends.copy import SourceOpener, copyFont
 from ...backends.filenames import stringToFileName
 from ...backends.null import NullBackend
 from ...core.async_property import async_cached_property
@@ -23,10 +23,13 @@ from ...core.classes import (
     Kerning,
     OpenTypeFeatures,
     VariableGlyph,
+    approximateGlyphSize,
     structure,
     unstructure,
 )
 from ...core.instancer import FontInstancer
+from ...core.iterglyphs import iterGlyphs
+from ...core.lrucache import LRUCache, SizedLRUCache
 from ...core.protocols import ReadableFontBackend
 from . import (
     OutputProcessorProtocol,
@@ -81,17 +84,43 @@ class FontraWrite:
     async def process(
         self, outputDir: os.PathLike = pathlib.Path(), *, continueOnError=False
     ) -> None:
+        await self._process(outputDir, continueOnError=continueOnError)
+
+    async def processInSubProcesses(
+        self,
+        inputOpener: SourceOpener,
+        outputDir: os.PathLike = pathlib.Path(),
+        *,
+        numProcesses: int,
+        continueOnError=False,
+    ) -> None:
+        await self._process(
+            outputDir,
+            continueOnError=continueOnError,
+            numProcesses=numProcesses,
+            sourceOpener=inputOpener,
+        )
+
+    async def _process(self, outputDir: os.PathLike, **kwargs) -> None:
         outputDir = pathlib.Path(outputDir)
         output = newFileSystemBackend((outputDir / self.destination).resolve())
 
         async with aclosing(output):
-            await copyFont(self.validatedInput, output, continueOnError=continueOnError)
+            await copyFont(self.validatedInput, output, **kwargs)
 
 
 @dataclass(kw_only=True)
 class BaseFilter:
     input: ReadableFontBackend = field(init=False, default=NullBackend())
     actionName: ClassVar[str]
+    # Set to True if getGlyph() only depends on the action's arguments, on the
+    # input glyph and its components, and on the input axes, sources and
+    # unitsPerEm: the results can then be kept in a persistent step cache
+    cacheableGlyphs: ClassVar[bool] = False
+    # The size of the font instancer's instance cache. Cached glyph instances
+    # are shared, so only enable it for actions that don't modify the glyph
+    # instances they get from the font instancer.
+    instanceCacheSize: ClassVar[int] = 0
 
     @cached_property
     def validatedInput(self) -> ReadableFontBackend:
@@ -100,7 +129,9 @@ class BaseFilter:
 
     @cached_property
     def fontInstancer(self):
-        return FontInstancer(self.validatedInput)
+        return FontInstancer(
+            self.validatedInput, instanceCacheSize=self.instanceCacheSize
+        )
 
     @async_cached_property
     def inputAxes(self):
@@ -142,6 +173,20 @@ class BaseFilter:
             return None
         return await self.processGlyph(glyph)
 
+    async def iterGlyphs(
+        self, glyphNames: Iterable[str]
+    ) -> AsyncGenerator[tuple[str, VariableGlyph | None], None]:
+        if type(self).getGlyph is not BaseFilter.getGlyph:
+            # getGlyph() is overridden, so we can't stream through processGlyph()
+            for glyphName in glyphNames:
+                yield glyphName, await self.getGlyph(glyphName)
+            return
+
+        async for glyphName, glyph in iterGlyphs(self.validatedInput, glyphNames):
+            yield glyphName, (
+                await self.processGlyph(glyph) if glyph is not None else None
+            )
+
     async def getFontInfo(self) -> FontInfo:
         fontInfo = await self.validatedInput.getFontInfo()
         return await self.processFontInfo(fontInfo)
@@ -222,13 +267,91 @@ class BaseFilter:
 @registerFilterAction("memory-cache")
 @dataclass(kw_only=True)
 class MemoryCache(BaseFilter):
+    maxGlyphs: int = 0  # 0 means no limit
+    maxBytes: int = 0  # an approximation of the glyph memory usage, 0 means no limit
+
     def __post_init__(self):
-        self._glyphCache = {}
+        self._glyphCache: dict[str, VariableGlyph | None]
+        if self.maxBytes:
+            self._glyphCache = SizedLRUCache(self.maxBytes, approximateGlyphSize)
+        elif self.maxGlyphs:
+            self._glyphCache = LRUCache(self.maxGlyphs)
+        else:
+            self._glyphCache = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # by maxGlyphs, on top of those of a SizedLRUCache
+
+    async def aclose(self) -> None:
+        await super().aclose()
+        if isinstance(self._glyphCache, SizedLRUCache):
+            hits = self._glyphCache.hits
+            misses = self._glyphCache.misses
+            evictions = self._glyphCache.evictions + self.evictions
+        else:
+            hits = self.hits
+            misses = self.misses
+            # Each miss adds a glyph to the cache, glyphs only leave by eviction
+            evictions = misses - len(self._glyphCache)
+        logger.info(
+            f"{self.actionName}: {hits} hits, {misses} misses, "
+            f"{evictions} evictions, {len(self._glyphCache)} glyphs cached"
+        )
 
     async def getGlyph(self, glyphName: str) -> VariableGlyph | None:
-        if glyphName not in self._glyphCache:
-            self._glyphCache[glyphName] = await self.validatedInput.getGlyph(glyphName)
-        return self._glyphCache[glyphName]
+        try:
+            glyph = self._glyphCache[glyphName]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            return glyph
+
+        glyph = await self.validatedInput.getGlyph(glyphName)
+        self._glyphCache[glyphName] = glyph
+        if self.maxGlyphs:
+            # SizedLRUCache only limits the total size, not the number of glyphs
+            while len(self._glyphCache) > self.maxGlyphs:
+                del self._glyphCache[next(iter(self._glyphCache))]
+                self.evictions += 1
+        return glyph
+
+    @async_cached_property
+    def inputFontInfo(self):
+        return self.validatedInput.getFontInfo()
+
+    @async_cached_property
+    def inputFeatures(self):
+        return self.validatedInput.getFeatures()
+
+    @async_cached_property
+    def inputCustomData(self):
+        return self.validatedInput.getCustomData()
+
+    @async_cached_property
+    def inputUnitsPerEm(self):
+        return self.validatedInput.getUnitsPerEm()
+
+    async def getFontInfo(self) -> FontInfo:
+        return await self.inputFontInfo
+
+    async def getAxes(self) -> Axes:
+        return await self.inputAxes
+
+    async def getSources(self) -> dict[str, FontSource]:
+        return await self.inputSources
+
+    async def getKerning(self) -> dict[str, Kerning]:
+        return await self.inputKerning
+
+    async def getFeatures(self) -> OpenTypeFeatures:
+        return await self.inputFeatures
+
+    async def getCustomData(self) -> dict[str, Any]:
+        return await self.inputCustomData
+
+    async def getUnitsPerEm(self) -> int:
+        return await self.inputUnitsPerEm
 
 
 @registerFilterAction("disk-cache")
@@ -9,6 +9,7 @@ from types import SimpleNamespace
 from fontTools.varLib.models import piecewiseLinearMap
 
 from ...core.classes import Kerning, OpenTypeFeatures
+from ...core.iterglyphs import iterGlyphs
 from ...core.varutils import locationToTuple
 from ..features import mergeFeatures
 from ..featurewriter import FeatureWriter, VariableScalar
@@ -78,17 +79,12 @@ class GeneratePaltVpalFeature(BaseFilter):
         fontInstancer = self.fontInstancer
         mapLocation = _makeLocationMapFunc(axes)
 
+        def logError(glyphName, e):
+            logger.error(f"{self.actionName}: glyph {glyphName} caused an error: {e!r}")
+
         horAdjustments = {}
         verAdjustments = {}
-        for glyphName in glyphMap:
-            try:
-                glyph = await self.getGlyph(glyphName)
-            except Exception as e:
-                logger.error(
-                    f"{self.actionName}: glyph {glyphName} caused an error: {e!r}"
-                )
-                continue
-
+        async for glyphName, glyph in iterGlyphs(self, glyphMap, logError):
             hAdjustments = []
             vAdjustments = []
             for source in getActiveSources(glyph.sources):
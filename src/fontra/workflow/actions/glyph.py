@@ -48,6 +48,7 @@ logger = logging.getLogger(__name__)
 @registerFilterAction("scale")
 @dataclass(kw_only=True)
 class Scale(BaseFilter):
+    cacheableGlyphs = True
     scaleFactor: float
     scaleFontMetrics: bool = True
     scaleKerning: bool = True
@@ -175,6 +176,8 @@ def scaleKerning(kernTable: Kerning, scaleFactor) -> Kerning:
 @registerFilterAction("decompose-composites")
 @dataclass(kw_only=True)
 class DecomposeComposites(BaseFilter):
+    cacheableGlyphs = True
+    instanceCacheSize = 1000
     onlyVariableComposites: bool = False
 
     async def getGlyph(self, glyphName: str) -> VariableGlyph:
@@ -326,6 +329,8 @@ class MoveDefaultBehavior(Enum):
 @registerFilterAction("shallow-decompose-composites")
 @dataclass(kw_only=True)
 class ShallowDecomposeComposites(BaseFilter):
+    cacheableGlyphs = True
+    instanceCacheSize = 1000
     glyphNames: set[str] = field(default_factory=set)
     componentGlyphNames: set[str] = field(default_factory=set)
 
@@ -550,6 +555,7 @@ def trimGlyphByAxisRanges(
 @registerFilterAction("drop-shapes")
 @dataclass(kw_only=True)
 class DropShapes(BaseFilter):
+    cacheableGlyphs = True
     dropPath: bool = True
     dropComponents: bool = True
     dropAnchors: bool = True
@@ -578,6 +584,7 @@ class DropShapes(BaseFilter):
 @registerFilterAction("round-coordinates")
 @dataclass(kw_only=True)
 class RoundCoordinates(BaseFilter):
+    cacheableGlyphs = True
     roundPathCoordinates: bool = True
     roundComponentOrigins: bool = True
     roundGlyphMetrics: bool = True
@@ -697,6 +704,7 @@ def roundKerning(kernTable: Kerning) -> Kerning:
 @registerFilterAction("set-vertical-glyph-metrics")
 @dataclass(kw_only=True)
 class SetVerticalGlyphMetrics(BaseFilter):
+    cacheableGlyphs = True
     verticalOrigin: int
     yAdvance: int
 
@@ -732,6 +740,7 @@ class SetVerticalGlyphMetrics(BaseFilter):
 @registerFilterAction("set-vertical-glyph-metrics-from-anchors")
 @dataclass(kw_only=True)
 class SetVerticalGlyphMetricsFromAnchors(BaseFilter):
+    cacheableGlyphs = True
     tsbAnchorName: str = "TSB_DEFAULT"
     bsbAnchorName: str = "BSB_DEFAULT"
 
@@ -768,6 +777,8 @@ class SetVerticalGlyphMetricsFromAnchors(BaseFilter):
 @registerFilterAction("drop-background-images")
 @dataclass(kw_only=True)
 class DropBackgroundImages(BaseFilter):
+    cacheableGlyphs = True
+
     async def processGlyph(self, glyph: VariableGlyph) -> VariableGlyph:
         if any(
             layer.glyph.backgroundImage is not None for layer in glyph.layers.values()
@@ -811,6 +822,7 @@ class Cu2QuGlyphGlue:
 @registerFilterAction("convert-to-quadratics")
 @dataclass(kw_only=True)
 class ConvertToQuadratics(BaseFilter):
+    cacheableGlyphs = True
     maximumError: float | None = None
     reverseDirection: bool = False
 
@@ -842,6 +854,8 @@ class ConvertToQuadratics(BaseFilter):
 @registerFilterAction("remove-overlaps")
 @dataclass(kw_only=True)
 class RemoveOverlaps(BaseFilter):
+    cacheableGlyphs = True
+
     async def processGlyph(self, glyph):
         newLayers = {
             layerName: replace(
@@ -6,6 +6,7 @@ from dataclasses import dataclass, field, replace
 
 from ...core.async_property import async_cached_property
 from ...core.classes import Kerning, OpenTypeFeatures, VariableGlyph
+from ...core.iterglyphs import iterGlyphs
 from ..features import LayoutHandling, subsetFeatures
 from . import ActionError
 from .base import BaseFilter, getActiveSources, registerFilterAction
@@ -78,24 +79,29 @@ class BaseGlyphSubsetter(BaseFilter):
         glyphsToCheck = set(glyphNames)  # this set will shrink
         glyphNamesExpanded = set(glyphNames)  # this set may grow
 
+        def logError(glyphName, e):
+            if glyphName != ".notdef":
+                logger.error(
+                    f"{self.actionName}: glyph {glyphName} caused an error: {e!r}"
+                )
+
         while glyphsToCheck:
-            glyphName = glyphsToCheck.pop()
+            glyphNamesToRead = sorted(glyphsToCheck)
+            glyphsToCheck.clear()
 
-            try:
-                glyph = await self.validatedInput.getGlyph(glyphName)
+            async for glyphName, glyph in iterGlyphs(
+                self.validatedInput, glyphNamesToRead, logError
+            ):
                 if glyph is None:
-                    raise ActionError(f"Unexpected missing glyph {glyphName}")
-            except Exception as e:
-                if glyphName != ".notdef":
-                    logger.error(
-                        f"{self.actionName}: glyph {glyphName} caused an error: {e!r}"
+                    logError(
+                        glyphName, ActionError(f"Unexpected missing glyph {glyphName}")
                     )
-                continue
+                    continue
 
-            componentNames = getComponentNames(glyph)
-            uncheckedGlyphs = componentNames - glyphNamesExpanded
-            glyphNamesExpanded.update(uncheckedGlyphs)
-            glyphsToCheck.update(uncheckedGlyphs)
+                componentNames = getComponentNames(glyph)
+                uncheckedGlyphs = componentNames - glyphNamesExpanded
+                glyphNamesExpanded.update(uncheckedGlyphs)
+                glyphsToCheck.update(uncheckedGlyphs)
 
         return glyphNamesExpanded
 
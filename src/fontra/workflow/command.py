@@ -4,11 +4,11 @@ import json
 import logging
 import pathlib
 import sys
-from contextlib import AsyncExitStack
 
 import yaml
 
-from .workflow import Workflow
+from .stepcache import STEP_CACHE_DEFAULT_MAX_AGE_DAYS, StepCache
+from .workflow import Workflow, chainWorkflows, processOutputs
 
 if hasattr(logging, "getLevelNamesMapping"):
     levelNamesMapping = logging.getLevelNamesMapping()
@@ -86,6 +86,29 @@ async def mainAsync() -> None:
         help="Continue copying if reading or processing a glyph causes an error. "
         "The error will be logged, but the glyph will not be present in the output.",
     )
+    parser.add_argument(
+        "--num-processes",
+        type=int,
+        default=1,
+        help="The number of worker processes that pull glyphs through the workflow "
+        "steps. Each worker sets up the workflow by itself. The default is 1, "
+        "which means all glyphs are processed by the main process.",
+    )
+    parser.add_argument(
+        "--step-cache-dir",
+        type=pathlib.Path,
+        help="A path to a folder for a persistent cache of the glyphs produced by "
+        "the workflow steps. Running a workflow again with the same cache folder "
+        "will only process glyphs that changed, and glyphs using those.",
+    )
+    parser.add_argument(
+        "--step-cache-max-age",
+        type=float,
+        default=STEP_CACHE_DEFAULT_MAX_AGE_DAYS,
+        help="Remove the step cache files that were not used in this many days, "
+        f"after running the workflow. The default is {STEP_CACHE_DEFAULT_MAX_AGE_DAYS}"
+        ". Use 0 to keep all files.",
+    )
     parser.add_argument(
         "--substitute",
         action="append",
@@ -129,24 +152,33 @@ async def mainAsync() -> None:
         {k: yaml.safe_load(v) for k, v in args.substitute} if args.substitute else {}
     )
 
-    output_dir = args.output_dir
-
-    nextInput = None
-
-    async with AsyncExitStack() as exitStack:
-        outputs = []
-        for config, config_path in args.config:
-            workflow = Workflow(
-                config=config, parentDir=config_path.parent, substitutions=substitutions
-            )
-            endPoints = await exitStack.enter_async_context(
-                workflow.endPoints(nextInput)
-            )
-            outputs.extend(endPoints.outputs)
-            nextInput = endPoints.endPoint
+    workflows = [
+        Workflow(
+            config=config,
+            parentDir=config_path.parent,
+            substitutions=substitutions,
+            stepCacheDir=(
+                args.step_cache_dir.resolve()
+                if args.step_cache_dir is not None
+                else None
+            ),
+        )
+        for config, config_path in args.config
+    ]
+
+    async with chainWorkflows(workflows) as endPoints:
+        await processOutputs(
+            workflows,
+            endPoints.outputs,
+            args.output_dir,
+            continueOnError=args.continue_on_error,
+            numProcesses=args.num_processes,
+        )
 
-        for output in outputs:
-            await output.process(output_dir, continueOnError=args.continue_on_error)
+    if args.step_cache_dir is not None and args.step_cache_max_age > 0:
+        StepCache(cacheDir=args.step_cache_dir).prune(
+            args.step_cache_max_age * 24 * 60 * 60
+        )
 
 
 def main():
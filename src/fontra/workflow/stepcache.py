@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator
+
+from .. import __version__ as fontraVersion
+from ..backends.null import NullBackend
+from ..core.async_property import async_cached_property
+from ..core.classes import VariableGlyph, structure, unstructure
+from ..core.protocols import ReadableFontBackend
+from .actions import FilterActionProtocol
+from .actions.base import BaseFilter
+
+logger = logging.getLogger(__name__)
+
+# Bump this when the cache file format, or the way keys are computed, changes
+STEP_CACHE_FORMAT_VERSION = 1
+
+# Cache files that haven't been used for this long are removed by prune()
+STEP_CACHE_DEFAULT_MAX_AGE_DAYS = 30
+
+
+@dataclass(kw_only=True)
+class StepCache:
+    # A persistent, content-addressed cache for the glyphs produced by workflow
+    # filter steps. A glyph is stored under a key that is a hash of:
+    # - the action name and its arguments
+    # - the axes, sources and unitsPerEm of the step's input
+    # - the input glyph and all glyphs it uses as components, recursively
+    # so a cached glyph is reused as long as none of these change.
+    # A cache file's modification time is updated when it is used, and prune()
+    # removes the files that weren't used for a while.
+    cacheDir: os.PathLike
+
+    def __post_init__(self) -> None:
+        self.cacheDir = pathlib.Path(self.cacheDir).resolve()
+
+    @asynccontextmanager
+    async def connect(
+        self,
+        actionName: str,
+        arguments: dict[str, Any],
+        action: FilterActionProtocol,
+        actionInput: ReadableFontBackend,
+    ) -> AsyncGenerator[ReadableFontBackend, None]:
+        # Connect `action` to `actionInput`, and serve its glyphs from the cache
+        # when possible. The action reads its input through an InputGlyphHandoff
+        # filter, so on a cache miss it gets the input glyph that was already
+        # read to compute the cache key, instead of reading it again.
+        inputHandoff = InputGlyphHandoff()
+        cachedStep = CachedGlyphsFilter(
+            stepCache=self,
+            stepActionName=actionName,
+            stepKey=hashObject(
+                [STEP_CACHE_FORMAT_VERSION, fontraVersion, actionName, arguments]
+            ),
+            actionInput=actionInput,
+            inputHandoff=inputHandoff,
+        )
+        async with inputHandoff.connect(actionInput) as handoffInput:
+            async with action.connect(handoffInput) as actionOutput:
+                async with cachedStep.connect(actionOutput) as backend:
+                    yield backend
+
+    def readGlyph(self, key: str) -> tuple[bool, VariableGlyph | None]:
+        path = self._getPath(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return False, None
+        try:
+            # Mark the file as recently used, for prune()
+            os.utime(path)
+        except OSError:
+            pass
+        obj = json.loads(text)["glyph"]
+        return True, (structure(obj, VariableGlyph) if obj is not None else None)
+
+    def writeGlyph(self, key: str, glyph: VariableGlyph | None) -> None:
+        path = self._getPath(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        obj = {"glyph": unstructure(glyph) if glyph is not None else None}
+        text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+        # Write to a temporary file first, so concurrent workflow runs (or worker
+        # processes) never see a partially written file
+        tempPath = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tempPath.write_text(text, encoding="utf-8")
+        os.replace(tempPath, path)
+
+    def prune(self, maxAge: float) -> int:
+        # Remove the cache files that were not used in the last `maxAge`
+        # seconds, and return how many were removed
+        assert isinstance(self.cacheDir, pathlib.Path)
+        cutOffTime = time.time() - maxAge
+        numRemoved = 0
+        for path in self.cacheDir.glob("*/*"):
+            try:
+                if path.stat().st_mtime < cutOffTime:
+                    path.unlink()
+                    numRemoved += 1
+            except OSError:
+                # It may have been removed, or used, by a concurrent run
+                pass
+        if numRemoved:
+            logger.info(f"step-cache: removed {numRemoved} unused files")
+        return numRemoved
+
+    def _getPath(self, key: str) -> pathlib.Path:
+        assert isinstance(self.cacheDir, pathlib.Path)
+        return self.cacheDir / key[:2] / f"{key}.json"
+
+
+@dataclass(kw_only=True)
+class CachedGlyphsFilter(BaseFilter):
+    # Wraps the output of a filter action, and serves its glyphs from the
+    # step cache when possible
+    stepCache: StepCache
+    stepActionName: str
+    stepKey: str
+    actionInput: ReadableFontBackend = field(default_factory=NullBackend)
+    inputHandoff: InputGlyphHandoff | None = None
+
+    def __post_init__(self) -> None:
+        self._inputGlyphHashes: dict[str, str | None] = {}
+        # Input glyphs that were read to compute their cache key, and that the
+        # action may need on a cache miss
+        self._keptInputGlyphs: dict[str, VariableGlyph] = {}
+        self._inputComponentNames: dict[str, list[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def aclose(self) -> None:
+        await super().aclose()
+        logger.info(
+            f"step-cache: {self.stepActionName}: {self.hits} hits, {self.misses} misses"
+        )
+
+    @async_cached_property
+    async def inputFontHash(self) -> str:
+        axes = await self.actionInput.getAxes()
+        sources = await self.actionInput.getSources()
+        unitsPerEm = await self.actionInput.getUnitsPerEm()
+        return hashObject([unstructure(axes), unstructure(sources), unitsPerEm])
+
+    async def getGlyph(self, glyphName: str) -> VariableGlyph | None:
+        key = await self._getGlyphKey(glyphName)
+        inputGlyph = self._keptInputGlyphs.pop(glyphName, None)
+        if key is None:
+            return await self.validatedInput.getGlyph(glyphName)
+
+        found, glyph = self.stepCache.readGlyph(key)
+        if found:
+            self.hits += 1
+            return glyph
+
+        self.misses += 1
+        if inputGlyph is not None and self.inputHandoff is not None:
+            self.inputHandoff.handOff(glyphName, inputGlyph)
+        try:
+            glyph = await self.validatedInput.getGlyph(glyphName)
+        finally:
+            if self.inputHandoff is not None:
+                self.inputHandoff.discard(glyphName)
+        self.stepCache.writeGlyph(key, glyph)
+        return glyph
+
+    async def _getGlyphKey(self, glyphName: str) -> str | None:
+        if await self._getInputGlyphHash(glyphName, keepGlyph=True) is None:
+            return None
+
+        dependencies = {glyphName}
+        glyphNames = [glyphName]
+        while glyphNames:
+            for componentName in self._inputComponentNames.get(glyphNames.pop(), ()):
+                if componentName not in dependencies:
+                    await self._getInputGlyphHash(componentName)
+                    dependencies.add(componentName)
+                    glyphNames.append(componentName)
+
+        return hashObject(
+            [
+                self.stepKey,
+                await self.inputFontHash,
+                glyphName,
+                [(name, self._inputGlyphHashes[name]) for name in sorted(dependencies)],
+            ]
+        )
+
+    async def _getInputGlyphHash(
+        self, glyphName: str, keepGlyph: bool = False
+    ) -> str | None:
+        if glyphName not in self._inputGlyphHashes:
+            glyph = await self.actionInput.getGlyph(glyphName)
+            if glyph is None:
+                self._inputGlyphHashes[glyphName] = None
+            else:
+                if keepGlyph:
+                    self._keptInputGlyphs[glyphName] = glyph
+                self._inputGlyphHashes[glyphName] = hashObject(unstructure(glyph))
+                self._inputComponentNames[glyphName] = sorted(
+                    {
+                        compo.name
+                        for layer in glyph.layers.values()
+                        for compo in layer.glyph.components
+                    }
+                )
+        return self._inputGlyphHashes[glyphName]
+
+
+@dataclass(kw_only=True)
+class InputGlyphHandoff(BaseFilter):
+    # Passes its input through, except for glyphs that were handed off to it:
+    # those are served once, without reading them from the input again
+    def __post_init__(self) -> None:
+        self._glyphs: dict[str, VariableGlyph] = {}
+
+    def handOff(self, glyphName: str, glyph: VariableGlyph) -> None:
+        self._glyphs[glyphName] = glyph
+
+    def discard(self, glyphName: str) -> None:
+        self._glyphs.pop(glyphName, None)
+
+    async def getGlyph(self, glyphName: str) -> VariableGlyph | None:
+        glyph = self._glyphs.pop(glyphName, None)
+        if glyph is None:
+            glyph = await self.validatedInput.getGlyph(glyphName)
+        return glyph
+
+
+def hashObject(obj: Any) -> str:
+    text = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
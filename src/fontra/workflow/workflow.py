@@ -16,9 +16,11 @@ from .actions import (
     InputActionProtocol,
     OutputActionProtocol,
     OutputProcessorProtocol,
+    ParallelOutputProcessorProtocol,
     getActionClass,
 )
 from .merger import FontBackendMerger
+from .stepcache import StepCache
 
 
 class WorkflowError(Exception):
@@ -30,6 +32,7 @@ class Workflow:
     config: dict
     parentDir: os.PathLike = field(default_factory=pathlib.Path)
     substitutions: dict[str, Any] = field(default_factory=dict)
+    stepCacheDir: os.PathLike | None = None
     steps: list[ActionStep] = field(init=False)
 
     def __post_init__(self) -> None:
@@ -44,9 +47,16 @@ class Workflow:
     ) -> AsyncGenerator[WorkflowEndPoints, None]:
         if input is None:
             input = NullBackend()
+        stepCache = (
+            StepCache(cacheDir=self.stepCacheDir)
+            if self.stepCacheDir is not None
+            else None
+        )
         async with AsyncExitStack() as exitStack:
             with chdir(self.parentDir):
-                endPoints = await _prepareEndPoints(input, self.steps, exitStack)
+                endPoints = await _prepareEndPoints(
+                    input, self.steps, exitStack, stepCache
+                )
             yield endPoints
 
 
@@ -56,9 +66,86 @@ class WorkflowEndPoints:
     outputs: list[OutputProcessorProtocol]
 
 
+@asynccontextmanager
+async def chainWorkflows(
+    workflows: list[Workflow],
+) -> AsyncGenerator[WorkflowEndPoints, None]:
+    # Set up the workflows so that the end point of each workflow is the input
+    # of the next
+    nextInput = None
+    outputs = []
+    async with AsyncExitStack() as exitStack:
+        for workflow in workflows:
+            endPoints = await exitStack.enter_async_context(
+                workflow.endPoints(nextInput)
+            )
+            outputs.extend(endPoints.outputs)
+            nextInput = endPoints.endPoint
+        assert nextInput is not None
+        yield WorkflowEndPoints(endPoint=nextInput, outputs=outputs)
+
+
+@dataclass(frozen=True)
+class WorkflowOutputInputOpener:
+    # A picklable recipe to rebuild the input of a workflow output in another
+    # process: the worker sets up the (substituted) workflow configs again, and
+    # uses the input of the output at outputIndex.
+    configs: list[tuple[dict, os.PathLike, os.PathLike | None]]
+    outputIndex: int
+
+    @classmethod
+    def fromWorkflows(
+        cls, workflows: list[Workflow], outputIndex: int
+    ) -> WorkflowOutputInputOpener:
+        return cls(
+            configs=[
+                (workflow.config, workflow.parentDir, workflow.stepCacheDir)
+                for workflow in workflows
+            ],
+            outputIndex=outputIndex,
+        )
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncGenerator[ReadableFontBackend, None]:
+        workflows = [
+            Workflow(config=config, parentDir=parentDir, stepCacheDir=stepCacheDir)
+            for config, parentDir, stepCacheDir in self.configs
+        ]
+        async with chainWorkflows(workflows) as endPoints:
+            output = endPoints.outputs[self.outputIndex]
+            assert isinstance(output, ParallelOutputProcessorProtocol)
+            yield output.input
+
+
+async def processOutputs(
+    workflows: list[Workflow],
+    outputs: list[OutputProcessorProtocol],
+    outputDir: os.PathLike = pathlib.Path(),
+    *,
+    continueOnError=False,
+    numProcesses=1,
+) -> None:
+    # With numProcesses > 1, the glyphs of outputs that support it are pulled
+    # through the workflow steps by worker processes, which each set up the
+    # workflows again
+    for outputIndex, output in enumerate(outputs):
+        if numProcesses > 1 and isinstance(output, ParallelOutputProcessorProtocol):
+            await output.processInSubProcesses(
+                WorkflowOutputInputOpener.fromWorkflows(workflows, outputIndex),
+                outputDir,
+                numProcesses=numProcesses,
+                continueOnError=continueOnError,
+            )
+        else:
+            await output.process(outputDir, continueOnError=continueOnError)
+
+
 class ActionStep(Protocol):
     async def setup(
-        self, currentInput: ReadableFontBackend, exitStack
+        self,
+        currentInput: ReadableFontBackend,
+        exitStack,
+        stepCache: StepCache | None = None,
     ) -> WorkflowEndPoints:
         pass
 
@@ -96,7 +183,10 @@ class InputActionStep:
     steps: list[ActionStep] = field(default_factory=list)
 
     async def setup(
-        self, currentInput: ReadableFontBackend, exitStack
+        self,
+        currentInput: ReadableFontBackend,
+        exitStack,
+        stepCache: StepCache | None = None,
     ) -> WorkflowEndPoints:
         action = getAction("input", self.actionName, self.arguments)
         assert isinstance(action, InputActionProtocol)
@@ -105,7 +195,7 @@ class InputActionStep:
         assert isinstance(backend, ReadableFontBackend)
 
         # set up nested steps
-        endPoints = await _prepareEndPoints(backend, self.steps, exitStack)
+        endPoints = await _prepareEndPoints(backend, self.steps, exitStack, stepCache)
 
         endPoint = FontBackendMerger(inputA=currentInput, inputB=endPoints.endPoint)
         return WorkflowEndPoints(endPoint=endPoint, outputs=endPoints.outputs)
@@ -119,15 +209,23 @@ class FilterActionStep:
     steps: list[ActionStep] = field(default_factory=list)
 
     async def setup(
-        self, currentInput: ReadableFontBackend, exitStack
+        self,
+        currentInput: ReadableFontBackend,
+        exitStack,
+        stepCache: StepCache | None = None,
     ) -> WorkflowEndPoints:
         action = getAction("filter", self.actionName, self.arguments)
         assert isinstance(action, FilterActionProtocol)
 
-        backend = await exitStack.enter_async_context(action.connect(currentInput))
+        if stepCache is not None and getattr(action, "cacheableGlyphs", False):
+            backend = await exitStack.enter_async_context(
+                stepCache.connect(self.actionName, self.arguments, action, currentInput)
+            )
+        else:
+            backend = await exitStack.enter_async_context(action.connect(currentInput))
 
         # set up nested steps
-        return await _prepareEndPoints(backend, self.steps, exitStack)
+        return await _prepareEndPoints(backend, self.steps, exitStack, stepCache)
 
 
 @registerActionStepClass("output")
@@ -138,7 +236,10 @@ class OutputActionStep:
     steps: list[ActionStep] = field(default_factory=list)
 
     async def setup(
-        self, currentInput: ReadableFontBackend, exitStack
+        self,
+        currentInput: ReadableFontBackend,
+        exitStack,
+        stepCache: StepCache | None = None,
     ) -> WorkflowEndPoints:
         assert currentInput is not None
         action = getAction("output", self.actionName, self.arguments)
@@ -147,7 +248,9 @@ class OutputActionStep:
         outputs = []
 
         # set up nested steps
-        endPoints = await _prepareEndPoints(currentInput, self.steps, exitStack)
+        endPoints = await _prepareEndPoints(
+            currentInput, self.steps, exitStack, stepCache
+        )
         outputs.extend(endPoints.outputs)
 
         assert isinstance(endPoints.endPoint, ReadableFontBackend)
@@ -177,10 +280,15 @@ class ForkActionStep:
             raise WorkflowError("fork does not expect arguments")
 
     async def setup(
-        self, currentInput: ReadableFontBackend, exitStack
+        self,
+        currentInput: ReadableFontBackend,
+        exitStack,
+        stepCache: StepCache | None = None,
     ) -> WorkflowEndPoints:
         # set up nested steps
-        endPoints = await _prepareEndPoints(currentInput, self.steps, exitStack)
+        endPoints = await _prepareEndPoints(
+            currentInput, self.steps, exitStack, stepCache
+        )
         return WorkflowEndPoints(endPoint=currentInput, outputs=endPoints.outputs)
 
 
@@ -201,10 +309,15 @@ class ForkMergeActionStep:
             raise WorkflowError("fork-merge does not expect arguments")
 
     async def setup(
-        self, currentInput: ReadableFontBackend, exitStack
+        self,
+        currentInput: ReadableFontBackend,
+        exitStack,
+        stepCache: StepCache | None = None,
     ) -> WorkflowEndPoints:
         # set up nested steps
-        endPoints = await _prepareEndPoints(currentInput, self.steps, exitStack)
+        endPoints = await _prepareEndPoints(
+            currentInput, self.steps, exitStack, stepCache
+        )
 
         endPoint = FontBackendMerger(
             inputA=currentInput, inputB=endPoints.endPoint, warnAboutDuplicates=False
@@ -245,11 +358,12 @@ async def _prepareEndPoints(
     currentInput: ReadableFontBackend,
     steps: list[ActionStep],
     exitStack: AsyncExitStack,
+    stepCache: StepCache | None = None,
 ) -> WorkflowEndPoints:
     outputs: list[OutputProcessorProtocol] = []
 
     for step in steps:
-        endPoints = await step.setup(currentInput, exitStack)
+        endPoints = await step.setup(currentInput, exitStack, stepCache)
         currentInput = endPoints.endPoint
         outputs.extend(endPoints.outputs)
 
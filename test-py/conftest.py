@@ -1,5 +1,9 @@
+import os
+
 import pytest
 
+from fontra.core.filecache import CACHE_DIR_ENV_VAR
+
 
 def pytest_addoption(parser):
     parser.addoption("--write-expected-data", action="store_true", default=False)
@@ -8,3 +12,12 @@ def pytest_addoption(parser):
 @pytest.fixture(scope="session")
 def writeExpectedData(pytestconfig):
     return pytestconfig.getoption("write_expected_data")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def persistentCacheDir(tmp_path_factory):
+    # Keep persistent caches out of the user's cache folder
+    cacheDir = tmp_path_factory.mktemp("fontra-cache")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv(CACHE_DIR_ENV_VAR, os.fspath(cacheDir))
+        yield cacheDir
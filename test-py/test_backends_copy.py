@@ -1,11 +1,15 @@
+import os
 import pathlib
+import shutil
 import subprocess
+from contextlib import aclosing
 
 import pytest
 from test_backends_designspace import fileNamesFromDir
 
 from fontra.backends import UnknownFileType, getFileSystemBackend, newFileSystemBackend
-from fontra.backends.copy import copyFont
+from fontra.backends.copy import COPY_MANIFEST_CACHE_NAME, CopyManifest, copyFont
+from fontra.core.filecache import getProjectCachePath
 
 mutatorDSPath = (
     pathlib.Path(__file__).resolve().parent
@@ -39,6 +43,109 @@ async def test_copyFont(tmpdir, glyphNames):
     assert glyphNames == reopenedGlyphNames
 
 
+@pytest.mark.parametrize("glyphNames", [None, ["A", "C", "period"]])
+async def test_copyFont_numProcesses(tmpdir, glyphNames):
+    tmpdir = pathlib.Path(tmpdir)
+    destPath = tmpdir / "MutatorCopy.designspace"
+    sourceFont = getFileSystemBackend(mutatorDSPath)
+    destFont = newFileSystemBackend(destPath)
+    await copyFont(
+        sourceFont,
+        destFont,
+        glyphNames=glyphNames,
+        numProcesses=2,
+        sourcePath=mutatorDSPath,
+    )
+
+    sourceFont = getFileSystemBackend(mutatorDSPath)
+    reopenedFont = getFileSystemBackend(destPath)
+    reopenedGlyphNames = sorted(await reopenedFont.getGlyphMap())
+    if glyphNames is None:
+        glyphNames = sorted(await sourceFont.getGlyphMap())
+    assert glyphNames == reopenedGlyphNames
+    for glyphName in glyphNames:
+        sourceGlyph = await sourceFont.getGlyph(glyphName)
+        copiedGlyph = await reopenedFont.getGlyph(glyphName)
+        assert sourceGlyph.layers.keys() == copiedGlyph.layers.keys()
+        for layerName, layer in sourceGlyph.layers.items():
+            assert layer.glyph.path == copiedGlyph.layers[layerName].glyph.path
+
+
+@pytest.mark.parametrize("numProcesses", [1, 2])
+async def test_copyFont_incremental(tmpdir, numProcesses):
+    tmpdir = pathlib.Path(tmpdir)
+    sourcePath = tmpdir / "source" / mutatorDSPath.name
+    shutil.copytree(mutatorDSPath.parent, sourcePath.parent)
+    destPath = tmpdir / "MutatorCopy.fontra"
+
+    manifest = CopyManifest()
+    async with aclosing(newFileSystemBackend(destPath)) as destFont:
+        await copyFont(
+            getFileSystemBackend(sourcePath),
+            destFont,
+            numProcesses=numProcesses,
+            sourcePath=sourcePath,
+            manifest=manifest,
+        )
+    sourceGlyphNames = sorted(await getFileSystemBackend(sourcePath).getGlyphMap())
+    assert sourceGlyphNames == sorted(manifest.glyphs.entries)
+
+    sourceFont = getFileSystemBackend(sourcePath)
+    glyph = await sourceFont.getGlyph("A")
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance += 10
+    await sourceFont.putGlyph("A", glyph, [ord("A")])
+    await sourceFont.deleteGlyph("B")
+    await sourceFont.aclose()
+
+    # A glyph file that was touched, but not changed, is read but not written
+    glifPath = (
+        sourcePath.parent / "MutatorSansLightCondensed.ufo" / "glyphs" / "C_.glif"
+    )
+    stat = glifPath.stat()
+    os.utime(glifPath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    sourceFont = getFileSystemBackend(sourcePath)
+    readGlyphNames = []
+    getGlyph = sourceFont.getGlyph
+
+    async def recordGetGlyph(glyphName):
+        readGlyphNames.append(glyphName)
+        return await getGlyph(glyphName)
+
+    sourceFont.getGlyph = recordGetGlyph
+
+    destFont = getFileSystemBackend(destPath)
+    writtenGlyphNames = []
+    putGlyph = destFont.putGlyph
+
+    async def recordPutGlyph(glyphName, glyph, codePoints):
+        writtenGlyphNames.append(glyphName)
+        await putGlyph(glyphName, glyph, codePoints)
+
+    destFont.putGlyph = recordPutGlyph
+    async with aclosing(destFont), aclosing(sourceFont):
+        await copyFont(
+            sourceFont,
+            destFont,
+            numProcesses=numProcesses,
+            sourcePath=sourcePath,
+            manifest=manifest,
+        )
+    assert ["A"] == writtenGlyphNames
+    if numProcesses == 1:
+        # Unchanged glyphs are not even read
+        assert ["A", "C"] == readGlyphNames
+    assert "B" not in manifest.glyphs.entries
+
+    reopenedFont = getFileSystemBackend(destPath)
+    assert "B" not in await reopenedFont.getGlyphMap()
+    copiedGlyph = await reopenedFont.getGlyph("A")
+    assert sorted(layer.glyph.xAdvance for layer in glyph.layers.values()) == sorted(
+        layer.glyph.xAdvance for layer in copiedGlyph.layers.values()
+    )
+
+
 def test_fontra_copy(tmpdir):
     tmpdir = pathlib.Path(tmpdir)
     destPath = tmpdir / "MutatorCopy.designspace"
@@ -53,6 +160,24 @@ def test_fontra_copy(tmpdir):
     ] == fileNamesFromDir(tmpdir)
 
 
+def test_fontra_copy_incremental(tmpdir):
+    tmpdir = pathlib.Path(tmpdir)
+    destPath = tmpdir / "MutatorCopy.fontra"
+    manifestPath = getProjectCachePath(destPath, COPY_MANIFEST_CACHE_NAME)
+    for i in range(2):
+        result = subprocess.run(
+            ["fontra-copy", "--incremental", mutatorDSPath, destPath],
+            capture_output=True,
+            text=True,
+        )
+        assert 0 == result.returncode, result.stderr
+        assert manifestPath.exists()
+    assert "0 glyphs to copy" in result.stderr
+    # The manifest is not stored in, or next to, the destination
+    assert ["MutatorCopy.fontra"] == fileNamesFromDir(tmpdir)
+    assert "fontra-copy-manifest.json" not in fileNamesFromDir(destPath)
+
+
 def test_fontra_copy_missing_source(tmpdir):
     tmpdir = pathlib.Path(tmpdir)
     destPath = tmpdir / "MutatorCopy.designspace"
@@ -1,3 +1,4 @@
+import asyncio
 import pathlib
 import shutil
 import uuid
@@ -8,9 +9,15 @@ from dataclasses import asdict, replace
 import pytest
 from fontTools.designspaceLib import DesignSpaceDocument
 
-from fontra.backends import getFileSystemBackend, newFileSystemBackend
+from fontra.backends import designspace, getFileSystemBackend, newFileSystemBackend
 from fontra.backends.copy import copyFont
-from fontra.backends.designspace import DesignspaceBackend, UFOBackend, convertImageData
+from fontra.backends.designspace import (
+    DesignspaceBackend,
+    UFOBackend,
+    _extractComponentInfoFromUFO,
+    convertImageData,
+)
+from fontra.backends.filewatcher import Change
 from fontra.backends.null import NullBackend
 from fontra.core.classes import (
     Anchor,
@@ -30,6 +37,8 @@ from fontra.core.classes import (
     StaticGlyph,
     unstructure,
 )
+from fontra.core.filecache import getProjectCachePath
+from fontra.core.glyphdependencies import GLYPH_DEPENDENCIES_CACHE_NAME
 
 dataDir = pathlib.Path(__file__).resolve().parent / "data"
 
@@ -254,6 +263,37 @@ async def test_addNewGlyph_glyphOrder(writableTestFont):
     assert count > 0, (count, len(writableTestFont.ufoLayers))
 
 
+async def test_putGlyphs(writableTestFont, monkeypatch):
+    sourceGlyph = await writableTestFont.getGlyph("period")
+    glyphNames = [f"testglyph{i}" for i in range(10)]
+
+    updatedGlyphSets = []
+    updateGlyphSetContents = writableTestFont.updateGlyphSetContents
+
+    def recordUpdateGlyphSetContents(glyphSet):
+        updatedGlyphSets.append(glyphSet)
+        updateGlyphSetContents(glyphSet)
+
+    monkeypatch.setattr(
+        writableTestFont, "updateGlyphSetContents", recordUpdateGlyphSetContents
+    )
+
+    await writableTestFont.putGlyphs(
+        {glyphName: (sourceGlyph, []) for glyphName in glyphNames}
+    )
+
+    assert len(updatedGlyphSets) == len(set(updatedGlyphSets))
+    assert len(updatedGlyphSets) == len(sourceGlyph.layers)
+
+    reopenedFont = DesignspaceBackend.fromPath(writableTestFont.dsDoc.path)
+    for glyphName in glyphNames:
+        glyph = await reopenedFont.getGlyph(glyphName)
+        assert glyph.layers == sourceGlyph.layers
+
+    lib = writableTestFont.defaultReader.readLib()
+    assert glyphNames == lib["public.glyphOrder"][-len(glyphNames) :]
+
+
 # NOTE: font guidelines are tested via test_getSources, no need to repeat here
 
 
@@ -1022,6 +1062,200 @@ async def test_glyphDependencies_new_font(tmpdir) -> None:
     assert deps.madeOf == {}
 
 
+def test_glyphDependencies_persistentCache(
+    tmpdir, persistentCacheDir, monkeypatch
+) -> None:
+    tmpdir = pathlib.Path(tmpdir)
+    ufoPath = tmpdir / "MutatorSansLightCondensed.ufo"
+    shutil.copytree(dataDir / "mutatorsans" / ufoPath.name, ufoPath)
+    cachePath = getProjectCachePath(ufoPath, GLYPH_DEPENDENCIES_CACHE_NAME)
+    assert cachePath is not None
+    assert cachePath.is_relative_to(persistentCacheDir)
+    assert not cachePath.exists()
+
+    componentInfo = _extractComponentInfoFromUFO(ufoPath, "foreground", cachePath)
+    assert componentInfo["Aacute"] == {"A", "acute"}
+    assert cachePath.exists()
+
+    glifPath = ufoPath / "glyphs" / "A_acute.glif"
+    glifData = glifPath.read_text(encoding="utf-8")
+    glifPath.write_text(glifData.replace('<component base="A"/>', ""), encoding="utf-8")
+
+    parsedGlyphNames = []
+    originalReadGLIFComponentNames = designspace.readGLIFComponentNames
+
+    def readGLIFComponentNames(glyphSet, glyphName):
+        parsedGlyphNames.append(glyphName)
+        return originalReadGLIFComponentNames(glyphSet, glyphName)
+
+    monkeypatch.setattr(designspace, "readGLIFComponentNames", readGLIFComponentNames)
+    cachedComponentInfo = _extractComponentInfoFromUFO(ufoPath, "foreground", cachePath)
+    # Only the modified glyph was parsed again
+    assert parsedGlyphNames == ["Aacute"]
+    assert cachedComponentInfo == {**componentInfo, "Aacute": {"acute"}}
+
+
+async def test_glyphDependencies_externalChange(writableTestFont) -> None:
+    async with aclosing(writableTestFont):
+        assert ["Aacute", "Adieresis", "varcotest1"] == (
+            await writableTestFont.findGlyphsThatUseGlyph("A")
+        )
+        glifPath = pathlib.Path(writableTestFont.defaultUFOLayer.path) / (
+            "glyphs/A_acute.glif"
+        )
+        glifData = glifPath.read_text(encoding="utf-8")
+        glifPath.write_text(
+            glifData.replace('<component base="A"/>', ""), encoding="utf-8"
+        )
+        await writableTestFont.processExternalChanges(
+            {(Change.modified, str(glifPath))}
+        )
+        assert ["Adieresis", "varcotest1"] == (
+            await writableTestFont.findGlyphsThatUseGlyph("A")
+        )
+        assert ["Aacute"] == await writableTestFont.findGlyphsThatUseGlyph("acute")
+
+
+async def test_lazyStartup(writableTestFont) -> None:
+    assert not any(ufoLayer.glyphSetIsLoaded for ufoLayer in writableTestFont.ufoLayers)
+    glyphMap = await writableTestFont.getGlyphMap()
+    assert glyphMap["A"] == [ord("A"), ord("a")]
+    assert [
+        ufoLayer.name
+        for ufoLayer in writableTestFont.ufoLayers
+        if ufoLayer.glyphSetIsLoaded
+    ] == [writableTestFont.defaultUFOLayer.name]
+
+
+async def test_glyphMap_persistentCache(writableTestFont, monkeypatch) -> None:
+    ufoLayer = writableTestFont.defaultUFOLayer
+    cachePath = getProjectCachePath(ufoLayer.path, designspace.GLYPH_MAP_CACHE_NAME)
+    assert cachePath is not None
+    assert not cachePath.exists()
+
+    glyphMap = await writableTestFont.getGlyphMap()
+    assert glyphMap["A"] == [ord("A"), ord("a")]
+    assert cachePath.exists()
+
+    glifPath = pathlib.Path(ufoLayer.path) / "glyphs" / "A_.glif"
+    glifData = glifPath.read_text(encoding="utf-8")
+    glifPath.write_text(glifData.replace('<unicode hex="0061"/>', ""), encoding="utf-8")
+
+    parsedGlyphNames = []
+    originalReadGLIFCodePoints = designspace.readGLIFCodePoints
+
+    def readGLIFCodePoints(glyphSet, glyphName):
+        parsedGlyphNames.append(glyphName)
+        return originalReadGLIFCodePoints(glyphSet, glyphName)
+
+    monkeypatch.setattr(designspace, "readGLIFCodePoints", readGLIFCodePoints)
+    writableTestFont._reloadDesignSpaceFromFile()
+    cachedGlyphMap = await writableTestFont.getGlyphMap()
+    # Only the modified glyph was parsed again
+    assert parsedGlyphNames == ["A"]
+    assert cachedGlyphMap == {**glyphMap, "A": [ord("A")]}
+    assert list(cachedGlyphMap) == list(glyphMap)
+
+
+async def test_glyphMap_singleLoadTask(writableTestFont, monkeypatch) -> None:
+    numLoads = 0
+    originalGetGlyphMapFromUFOLayer = designspace.getGlyphMapFromUFOLayer
+
+    async def getGlyphMapFromUFOLayer(*args, **kwargs):
+        nonlocal numLoads
+        numLoads += 1
+        await asyncio.sleep(0)
+        return await originalGetGlyphMapFromUFOLayer(*args, **kwargs)
+
+    def getGlyphMapFromGlyphSet(*args, **kwargs):
+        raise AssertionError("the glyph map should not be loaded synchronously")
+
+    monkeypatch.setattr(designspace, "getGlyphMapFromUFOLayer", getGlyphMapFromUFOLayer)
+    monkeypatch.setattr(designspace, "getGlyphMapFromGlyphSet", getGlyphMapFromGlyphSet)
+
+    # Cancelling one caller doesn't cancel the load for the others
+    cancelledTask = asyncio.create_task(writableTestFont.getGlyphMap())
+    await asyncio.sleep(0)
+    cancelledTask.cancel()
+
+    glyphMap, glyph, fingerprint, glyphMap2 = await asyncio.gather(
+        writableTestFont.getGlyphMap(),
+        writableTestFont.getGlyph("A"),
+        writableTestFont.getGlyphFingerprint("A"),
+        writableTestFont.getGlyphMap(),
+    )
+    assert cancelledTask.cancelled()
+    assert numLoads == 1
+    assert glyphMap["A"] == [ord("A"), ord("a")]
+    assert glyphMap == glyphMap2
+    assert glyph is not None
+    assert fingerprint is not None
+
+
+async def test_glyphMap_subProcess(writableTestFont, monkeypatch) -> None:
+    ufoLayer = writableTestFont.defaultUFOLayer
+    expectedGlyphMap = designspace.getGlyphMapFromGlyphSet(ufoLayer.glyphSet)
+    monkeypatch.setattr(designspace, "GLYPH_MAP_SUBPROCESS_THRESHOLD", 1)
+    monkeypatch.setattr(designspace, "GLYPH_MAP_SUBPROCESS_CHUNK_SIZE", 10)
+    glyphMap = await designspace.getGlyphMapFromUFOLayer(ufoLayer)
+    assert glyphMap == expectedGlyphMap
+    assert list(glyphMap) == list(expectedGlyphMap)
+
+
+@pytest.mark.parametrize("glyphName", ["A", "B", "varcotest1"])
+async def test_getGlyph_layersInThreads(testFont, glyphName, monkeypatch) -> None:
+    expectedGlyph = await testFont.getGlyph(glyphName)
+    monkeypatch.setattr(designspace, "GLYPH_LAYERS_THREAD_THRESHOLD", 1)
+    glyph = await getTestFont().getGlyph(glyphName)
+    assert len(glyph.layers) > 1
+    assert glyph == expectedGlyph
+    assert list(glyph.layers) == list(expectedGlyph.layers)
+
+
+async def test_glyphLayerIndex_lazy(writableTestFont) -> None:
+    glyph = await writableTestFont.getGlyph("A")
+    glyphLayers = writableTestFont.glyphLayerIndex.getLayers("A")
+    assert len(glyphLayers) == len(glyph.layers)
+    # Indexing the layers didn't open their glyph sets: only the layers that
+    # contain the glyph were loaded, to read it
+    loadedLayers = {
+        ufoLayer for ufoLayer in writableTestFont.ufoLayers if ufoLayer.glyphSetIsLoaded
+    }
+    assert loadedLayers == set(glyphLayers) | {writableTestFont.defaultUFOLayer}
+    assert len(loadedLayers) < len(writableTestFont.ufoLayers)
+
+
+async def test_glyphLayerIndex(writableTestFont) -> None:
+    def checkIndex():
+        index = writableTestFont.glyphLayerIndex
+        for glyphName in writableTestFont.glyphMap:
+            expectedLayers = tuple(
+                ufoLayer
+                for ufoLayer in writableTestFont.ufoLayers
+                if glyphName in ufoLayer.glyphSet
+            )
+            assert index.getLayers(glyphName) == expectedLayers, glyphName
+
+    glyph = await writableTestFont.getGlyph("A")
+    checkIndex()
+
+    layerName, layer = next(iter(glyph.layers.items()))
+    glyph.layers[f"{layerName}^background"] = deepcopy(layer)
+    await writableTestFont.putGlyph("A", glyph, [ord("A")])
+    assert f"{layerName}^background" in (await writableTestFont.getGlyph("A")).layers
+    checkIndex()
+
+    del glyph.layers[f"{layerName}^background"]
+    await writableTestFont.putGlyph("A", glyph, [ord("A")])
+    assert len(writableTestFont.glyphLayerIndex.getLayers("A")) == len(glyph.layers)
+    checkIndex()
+
+    await writableTestFont.putGlyph("A.new", glyph, [])
+    await writableTestFont.deleteGlyph("B")
+    assert writableTestFont.glyphLayerIndex.getLayers("B") == ()
+    checkIndex()
+
+
 async def test_write_designspace_after_first_implicit_source_issue_1468(
     tmpdir, testFontSingleUFO
 ) -> None:
@@ -1,14 +1,18 @@
 import asyncio
 import pathlib
 import shutil
+import time
 from contextlib import aclosing
 
 import pytest
 
+from fontra.backends import fontra as fontraBackendModule
 from fontra.backends import getFileSystemBackend, newFileSystemBackend
 from fontra.backends.copy import copyFont
 from fontra.backends.fontra import longestCommonPrefix
 from fontra.core.classes import ImageType, Kerning, OpenTypeFeatures
+from fontra.core.iterglyphs import iterGlyphs
+from fontra.core.protocols import IterGlyphs
 
 dataDir = pathlib.Path(__file__).resolve().parent / "data"
 commonFontsDir = pathlib.Path(__file__).parent.parent / "test-common" / "fonts"
@@ -241,3 +245,57 @@ async def test_kerningEdgeCases(
             assert numLines == expectedNumLines
     else:
         assert not kerningPath.exists()
+
+
+async def test_iterGlyphs(writableFontraFont):
+    # Make one glyph file unreadable, to test that the error is raised in turn
+    writableFontraFont.getGlyphFilePath("B").write_text("{", encoding="utf-8")
+    glyphNames = sorted(await writableFontraFont.getGlyphMap()) + ["does-not-exist"]
+    assert isinstance(writableFontraFont, IterGlyphs)
+
+    errors = []
+    iteratedGlyphs = {
+        glyphName: glyph
+        async for glyphName, glyph in iterGlyphs(
+            writableFontraFont,
+            glyphNames,
+            lambda glyphName, error: errors.append(glyphName),
+        )
+    }
+
+    assert ["B"] == errors
+    assert [name for name in glyphNames if name != "B"] == list(iteratedGlyphs)
+    assert iteratedGlyphs["does-not-exist"] is None
+    for glyphName, glyph in iteratedGlyphs.items():
+        assert await writableFontraFont.getGlyph(glyphName) == glyph
+
+    with pytest.raises(ValueError):
+        async for glyphName, glyph in iterGlyphs(writableFontraFont, glyphNames):
+            pass
+
+
+async def test_iterGlyphs_stopEarly(testFontraFont, monkeypatch):
+    monkeypatch.setattr(fontraBackendModule, "GLYPH_READ_AHEAD_CHUNK_SIZE", 4)
+    glyphNames = sorted(await testFontraFont.getGlyphMap())
+    assert len(glyphNames) > 12
+
+    readGlyphNames = []
+    getGlyphData = testFontraFont.getGlyphData
+
+    def recordingGetGlyphData(glyphName):
+        readGlyphNames.append(glyphName)
+        time.sleep(0.01)
+        return getGlyphData(glyphName)
+
+    monkeypatch.setattr(testFontraFont, "getGlyphData", recordingGetGlyphData)
+
+    async with aclosing(testFontraFont.iterGlyphs(glyphNames)) as iterator:
+        async for glyphName, glyph in iterator:
+            if glyphName == glyphNames[5]:
+                break
+
+    # The read-ahead of the third chunk was stopped, and waited for
+    numReadGlyphs = len(readGlyphNames)
+    assert 8 <= numReadGlyphs < 12
+    await asyncio.sleep(0.1)
+    assert numReadGlyphs == len(readGlyphNames)
@@ -0,0 +1,173 @@
+import asyncio
+import pathlib
+import threading
+
+import pytest
+
+from fontra.backends.fontra import FontraBackend
+from fontra.core.backendthread import ThreadedFontBackend
+from fontra.core.iterglyphs import iterGlyphs
+from fontra.core.protocols import (
+    GlyphDependenciesProvider,
+    ReadableFontBackend,
+    WatchableFontBackend,
+    WritableFontBackend,
+)
+
+dataDir = pathlib.Path(__file__).resolve().parent / "data"
+
+
+class RecordingBackend:
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+        self.callback = None
+
+    async def aclose(self):
+        self.threads.add(threading.get_ident())
+
+    async def getGlyph(self, glyphName):
+        self.threads.add(threading.get_ident())
+        # Yield to the event loop, so that concurrent calls could interleave
+        await asyncio.sleep(0)
+        self.calls.append(glyphName)
+        return None
+
+    async def getGlyphMap(self):
+        return {"A": [65], "B": [66]}
+
+    async def iterGlyphs(self, glyphNames):
+        for glyphName in glyphNames:
+            self.threads.add(threading.get_ident())
+            yield glyphName, None
+
+    def startOptionalBackgroundTasks(self):
+        self.threads.add(threading.get_ident())
+        asyncio.get_running_loop()
+
+    async def watchExternalChanges(self, callback):
+        self.callback = callback
+
+    async def triggerExternalChange(self, reloadPattern):
+        await self.callback(reloadPattern)
+
+
+@pytest.mark.asyncio
+async def test_threadedBackend_calls():
+    backend = RecordingBackend()
+    threadedBackend = ThreadedFontBackend(backend)
+    glyphNames = [f"glyph{i}" for i in range(50)]
+
+    await asyncio.gather(*(threadedBackend.getGlyph(name) for name in glyphNames))
+    threadedBackend.startOptionalBackgroundTasks()
+    assert [("A", None), ("B", None)] == [
+        item async for item in threadedBackend.iterGlyphs(["A", "B"])
+    ]
+    assert {"A": [65], "B": [66]} == await threadedBackend.getGlyphMap()
+    await threadedBackend.aclose()
+
+    # All calls ran in the same, other, thread, in the order they were made
+    assert glyphNames == backend.calls
+    assert [threadedBackend._thread.ident] == list(backend.threads)
+    assert threading.get_ident() not in backend.threads
+    assert not threadedBackend._thread.is_alive()
+
+
+@pytest.mark.asyncio
+async def test_threadedBackend_syncMethodDoesNotBlock():
+    released = threading.Event()
+
+    class Backend:
+        async def aclose(self):
+            pass
+
+        def startOptionalBackgroundTasks(self):
+            # If the caller waited for us, this would time out
+            return released.wait(timeout=5)
+
+    threadedBackend = ThreadedFontBackend(Backend())
+    result = threadedBackend.startOptionalBackgroundTasks()
+    released.set()
+    assert await result
+    await threadedBackend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_threadedBackend_methodIdentity():
+    threadedBackend = ThreadedFontBackend(RecordingBackend())
+    assert threadedBackend.getGlyph is threadedBackend.getGlyph
+    assert not hasattr(threadedBackend, "putGlyph")
+    await threadedBackend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_threadedBackend_attributesNotForwarded():
+    class Backend:
+        def __init__(self):
+            self.attribute = 1
+            self.propertyThreads = []
+
+        @property
+        def lazyProperty(self):
+            self.propertyThreads.append(threading.get_ident())
+            return 2
+
+        async def aclose(self):
+            pass
+
+    backend = Backend()
+    threadedBackend = ThreadedFontBackend(backend)
+    for name in ["attribute", "lazyProperty"]:
+        with pytest.raises(AttributeError, match="only methods and async properties"):
+            getattr(threadedBackend, name)
+        assert not hasattr(threadedBackend, name)
+    with pytest.raises(AttributeError, match="^nonExisting$"):
+        threadedBackend.nonExisting
+    await threadedBackend.aclose()
+
+    # The property was never evaluated, in any thread
+    assert [] == backend.propertyThreads
+
+
+@pytest.mark.asyncio
+async def test_threadedBackend_externalChanges():
+    backend = RecordingBackend()
+    threadedBackend = ThreadedFontBackend(backend)
+    callerThreads = []
+
+    async def callback(reloadPattern):
+        callerThreads.append(threading.get_ident())
+        assert {"glyphs": {"A": None}} == reloadPattern
+        # Calling back into the backend must not deadlock
+        await threadedBackend.getGlyph("A")
+
+    await threadedBackend.watchExternalChanges(callback)
+    await threadedBackend.triggerExternalChange({"glyphs": {"A": None}})
+    await threadedBackend.aclose()
+
+    assert [threading.get_ident()] == callerThreads
+    assert ["A"] == backend.calls
+
+
+@pytest.mark.asyncio
+async def test_threadedBackend_protocols():
+    backend = FontraBackend.fromPath(
+        dataDir / "mutatorsans" / "MutatorSansLocationBase.fontra"
+    )
+    threadedBackend = ThreadedFontBackend(backend)
+    assert isinstance(threadedBackend, ReadableFontBackend)
+    assert isinstance(threadedBackend, WritableFontBackend)
+    assert not isinstance(threadedBackend, WatchableFontBackend)
+    assert isinstance(backend, GlyphDependenciesProvider)
+    assert isinstance(threadedBackend, GlyphDependenciesProvider)
+    assert not isinstance(RecordingBackend(), GlyphDependenciesProvider)
+
+    dependencies = await threadedBackend.glyphDependencies
+    assert dependencies is await backend.glyphDependencies
+    assert {"A.alt"} == dependencies.usedByClosure("A")
+
+    glyphMap = await threadedBackend.getGlyphMap()
+    glyphs = [item async for item in iterGlyphs(threadedBackend, sorted(glyphMap))]
+    assert sorted(glyphMap) == [glyphName for glyphName, _ in glyphs]
+    assert all(glyph is not None for _, glyph in glyphs)
+    await threadedBackend.aclose()
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from fontra.core.binarymessage import decodeBinaryMessage, encodeBinaryMessage
+
+testMessages = [
+    {"client-call-id": 1, "return-value": None},
+    {"client-call-id": 2, "return-value": {"A": [65, 97], "B": []}},
+    {
+        "client-call-id": 3,
+        "return-value": {
+            "name": "A",
+            "layers": {
+                "default": {
+                    "glyph": {
+                        "path": {
+                            "contourInfo": [{"endPoint": 2, "isClosed": True}],
+                            "coordinates": [0, 0, 100.5, 0, -50, 700.25],
+                            "pointTypes": [0, 0, 0],
+                        },
+                    },
+                },
+                "empty": {"glyph": {"path": {"coordinates": []}}},
+            },
+        },
+    },
+    {
+        "server-call-id": 4,
+        "method-name": "externalChange",
+        "arguments": [
+            {"p": ["glyphs", "A"], "f": "=xy", "a": [0, 20, 55]},
+            True,
+        ],
+    },
+    {"client-call-id": 5, "return-value": {"coordinates": ["not", "numbers"]}},
+    {
+        "client-call-id": 6,
+        "return-value": {
+            "customData": {"coordinates": [True, 1, 2.5, 3]},
+            "path": {"coordinates": [True, 1, 2.5, 3], "pointTypes": [0, 0]},
+            "bigPath": {"coordinates": [2**60 + 1, 0], "pointTypes": [0]},
+        },
+    },
+]
+
+
+@pytest.mark.parametrize("message", testMessages)
+def test_binaryMessageRoundTrip(message):
+    data = encodeBinaryMessage(message)
+    assert isinstance(data, bytes)
+    assert message == decodeBinaryMessage(data)
+
+
+def test_binaryMessageArrays():
+    coordinates = [i / 3 for i in range(1, 1001)]
+    message = {"path": {"coordinates": coordinates, "pointTypes": [0] * 500}}
+    data = encodeBinaryMessage(message)
+    assert len(data) < len(json.dumps(message))
+    arraysStart = 4 + int.from_bytes(data[:4], "little")
+    arraysStart += -arraysStart % 8
+    assert len(data) == arraysStart + 8 * len(coordinates)
+    decoded = decodeBinaryMessage(data)
+    assert coordinates == decoded["path"]["coordinates"]
+
+
+@pytest.mark.parametrize(
+    "container, packed",
+    [
+        ({"path": {"coordinates": [0, 1.5], "pointTypes": [0]}}, True),
+        ({"path": {"coordinates": [0, 2**53], "pointTypes": [0]}}, True),
+        ({"path": {"coordinates": [0, 2**53 + 1], "pointTypes": [0]}}, False),
+        ({"path": {"coordinates": [0, True], "pointTypes": [0]}}, False),
+        ({"path": {"coordinates": [0, 1.5]}}, False),
+    ],
+)
+def test_binaryMessageOnlyPacksPathCoordinates(container, packed):
+    data = encodeBinaryMessage(container)
+    assert (b"__binary-array__" in data) == packed
+    decoded = decodeBinaryMessage(data)
+    assert container == decoded
+    if not packed:
+        # The values come back as they were, not as ints or floats
+        coordinates = container["path"]["coordinates"]
+        decodedCoordinates = decoded["path"]["coordinates"]
+        assert [type(v) for v in coordinates] == [type(v) for v in decodedCoordinates]
+
+
+def test_binaryMessageBytes():
+    message = {
+        "chunk": b"abc",
+        "items": [{"coordinates": [1, 2.5]}, b"", b"0123456789"],
+    }
+    assert message == decodeBinaryMessage(encodeBinaryMessage(message))
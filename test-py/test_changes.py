@@ -5,14 +5,17 @@ from copy import deepcopy
 import pytest
 
 from fontra.core.changes import (
+    ChangePatternIndex,
     applyChange,
     collectChangePaths,
+    collectSetterTargets,
     filterChangePattern,
     matchChangePattern,
     patternDifference,
     patternFromPath,
     patternIntersect,
     patternUnion,
+    wildcard,
 )
 
 
@@ -178,6 +181,50 @@ def test_matchChangePattern(change, pattern, expectedResult):
     assert expectedResult == result
 
 
+@pytest.mark.parametrize(
+    "change, pattern, expectedResult",
+    getTestData("match-change-pattern-test-data.json"),
+)
+def test_changePatternIndex(change, pattern, expectedResult):
+    index = ChangePatternIndex()
+    index.setPattern("subscriber", pattern)
+    index.setPattern("other", {"some-other-key": None})
+    expectedMatches = {"subscriber"} if expectedResult else set()
+    assert expectedMatches == index.matchChange(change)
+
+
+def test_changePatternIndex_update():
+    index = ChangePatternIndex()
+    index.setPattern("a", {"glyphs": {"A": None, "B": None}, "kerning": None})
+    index.setPattern("b", {"glyphs": {"B": None}})
+    index.setPattern("c", {"glyphs": {wildcard: {"layers": None}, "C": None}})
+
+    changeA = {"p": ["glyphs", "A", "layers"], "f": "=", "a": ["x", None]}
+    changeB = {"p": ["glyphs", "B"], "f": "=", "a": ["name", "B"]}
+    changeC = {"p": ["glyphs", "C", "layers"], "f": "=", "a": ["x", None]}
+    changeGlyphs = {"p": ["glyphs"], "f": "=", "a": ["B", None]}
+    changeKerning = {"p": ["kerning"], "f": "=", "a": ["kern", None]}
+    compoundChange = {"c": [changeB, changeKerning]}
+
+    assert {"a", "c"} == index.matchChange(changeA)
+    assert {"a", "b"} == index.matchChange(changeB)
+    assert {"c"} == index.matchChange(changeC)
+    assert {"a", "b"} == index.matchChange(changeGlyphs)
+    assert {"a"} == index.matchChange(changeKerning)
+    assert {"a", "b"} == index.matchChange(compoundChange)
+
+    index.setPattern("a", patternDifference(index.getPattern("a"), {"glyphs": None}))
+    assert {"kerning": None} == index.getPattern("a")
+    assert {"c"} == index.matchChange(changeA)
+    assert {"b"} == index.matchChange(changeB)
+    assert {"a"} == index.matchChange(changeKerning)
+
+    for subscriber in ["a", "b", "c"]:
+        index.setPattern(subscriber, {})
+    assert {} == index._root.children
+    assert set() == index.matchChange(changeA)
+
+
 @pytest.mark.parametrize(
     "change, pattern, inverse, expectedResult",
     getTestData("filter-change-pattern-test-data.json"),
@@ -209,3 +256,28 @@ def test_collectChangePaths(change, depth, expectedPaths):
 def test_patternFromPath(path, expectedPattern):
     pattern = patternFromPath(path)
     assert expectedPattern == pattern
+
+
+@pytest.mark.parametrize(
+    "change, expectedTargets",
+    [
+        ({}, set()),
+        ({"p": ["a"], "f": "=", "a": ["b", 1]}, {("=", ("a",), "b")}),
+        (
+            {
+                "p": ["glyphs", "A", "path"],
+                "c": [
+                    {"f": "=xy", "a": [0, 10, 20]},
+                    {"f": "=xy", "a": [3, 10, 20]},
+                    {"f": "=xy", "a": [0, 30, 40]},
+                ],
+            },
+            {("=xy", ("glyphs", "A", "path"), 0), ("=xy", ("glyphs", "A", "path"), 3)},
+        ),
+        ({"p": ["a"], "f": "-", "a": [0, 1]}, None),
+        ({"c": [{"f": "=", "a": ["x", 1]}, {"f": "d", "a": ["y"]}]}, None),
+    ],
+)
+def test_collectSetterTargets(change, expectedTargets):
+    targets = collectSetterTargets(change)
+    assert expectedTargets == targets
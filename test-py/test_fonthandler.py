@@ -7,6 +7,8 @@ from contextlib import aclosing
 import pytest
 
 from fontra.backends.designspace import DesignspaceBackend
+from fontra.core.backendthread import ThreadedFontBackend
+from fontra.core.classes import approximateGlyphSize
 from fontra.core.fonthandler import FontHandler
 from fontra.filesystem.projectmanager import FileSystemProjectManager
 
@@ -25,34 +27,57 @@ mutatorFiles = [
 ]
 
 
-@pytest.fixture(scope="session")
-def testFontPath(tmp_path_factory):
-    tmpDir = tmp_path_factory.mktemp("font")
+@pytest.fixture
+def testFontPath(tmp_path):
     for fn in mutatorFiles:
         srcPath = mutatorSansDir / fn
-        dstPath = tmpDir / fn
+        dstPath = tmp_path / fn
         if srcPath.is_dir():
             shutil.copytree(srcPath, dstPath)
         else:
             shutil.copy(srcPath, dstPath)
-    return tmpDir / dsFileName
+    return tmp_path / dsFileName
 
 
-@pytest.fixture
-async def testFontHandler(testFontPath):
+@pytest.fixture(params=[False, True], ids=["mainThread", "backendThread"])
+async def testFontHandler(testFontPath, request):
     assert testFontPath.exists(), testFontPath
     backend = DesignspaceBackend.fromPath(testFontPath)
     return FontHandler(
         backend=backend,
         projectIdentifier="dummy",
         metaInfoProvider=FileSystemProjectManager(),
+        backendThread=request.param,
     )
 
 
+def getDesignspaceBackend(fontHandler):
+    # The threaded backend wrapper doesn't forward plain attributes
+    backend = fontHandler.backend
+    if isinstance(backend, ThreadedFontBackend):
+        backend = backend._backend
+    assert isinstance(backend, DesignspaceBackend)
+    return backend
+
+
 class MockRemoteObjectConnection:
     pass
 
 
+class MockClientProxy:
+    def __init__(self):
+        self.externalChanges = []
+
+    async def externalChange(self, change, isLiveChange):
+        self.externalChanges.append((change, isLiveChange))
+
+
+class MockObserverConnection:
+    def __init__(self, clientUUID):
+        self.clientUUID = clientUUID
+        self.proxy = MockClientProxy()
+
+
 @pytest.mark.asyncio
 async def test_fontHandler_basic(testFontHandler):
     async with aclosing(testFontHandler):
@@ -67,6 +92,83 @@ async def test_fontHandler_basic(testFontHandler):
     assert 20 == layer.glyph.path.coordinates[0]
 
 
+@pytest.mark.asyncio
+async def test_fontHandler_getGlyphs(testFontHandler):
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        glyphA = await testFontHandler.getGlyph("A")
+        glyphs = await testFontHandler.getGlyphs(
+            ["B", "A", "nonexistent", "B"], connection=MockRemoteObjectConnection()
+        )
+
+    assert ["B", "A", "nonexistent"] == list(glyphs)
+    assert glyphs["A"] is glyphA
+    assert glyphs["B"] is not None
+    assert glyphs["nonexistent"] is None
+    assert glyphs["B"] is testFontHandler.localData[("glyphs", "B")]
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_localDataMaxSize(testFontPath):
+    fontHandler = FontHandler(
+        backend=DesignspaceBackend.fromPath(testFontPath),
+        projectIdentifier="dummy",
+        metaInfoProvider=FileSystemProjectManager(),
+        localDataMaxSize=1,
+    )
+    async with aclosing(fontHandler):
+        await fontHandler.startTasks()
+        glyphMap = await fontHandler.getData("glyphMap")
+        await fontHandler.getGlyph("A")
+        await fontHandler.getGlyph("B")
+        assert ["glyphMap", ("glyphs", "B")] == list(fontHandler.localData)
+        assert 1 == fontHandler.localData.evictions
+        assert glyphMap is await fontHandler.getData("glyphMap")
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_liveChangesCoalescing(testFontHandler):
+    editor = MockObserverConnection("editor")
+    observer = MockObserverConnection("observer")
+    path = ["glyphs", "A", "layers", "light-condensed", "glyph", "path"]
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        async with testFontHandler.useConnection(editor):
+            async with testFontHandler.useConnection(observer):
+                await testFontHandler.subscribeChanges(
+                    ["glyphs", "A"], True, connection=observer
+                )
+                for i in range(5):
+                    change = {"p": path, "f": "=xy", "a": [0, 20, i]}
+                    await testFontHandler.editIncremental(change, connection=editor)
+                otherChange = {"p": path, "f": "=xy", "a": [1, 20, 30]}
+                await testFontHandler.editIncremental(otherChange, connection=editor)
+                await asyncio.sleep(0.1)
+
+                assert [
+                    (
+                        {
+                            "c": [
+                                {"p": path, "f": "=xy", "a": [0, 20, 4]},
+                                otherChange,
+                            ]
+                        },
+                        True,
+                    )
+                ] == observer.proxy.externalChanges
+                assert [] == editor.proxy.externalChanges
+
+                # A final change must be sent after the queued live changes
+                observer.proxy.externalChanges.clear()
+                change = {"p": path, "f": "=xy", "a": [0, 20, 5]}
+                await testFontHandler.editIncremental(change, connection=editor)
+                await testFontHandler.broadcastChange(change, editor, False, False)
+                await asyncio.sleep(0.1)
+                assert [(change, True), (change, False)] == (
+                    observer.proxy.externalChanges
+                )
+
+
 @pytest.mark.asyncio
 async def test_fontHandler_externalChange(testFontHandler):
     async with aclosing(testFontHandler):
@@ -75,7 +177,7 @@ async def test_fontHandler_externalChange(testFontHandler):
         layerName, layer = firstLayerItem(glyph)
         assert 20 == layer.glyph.path.coordinates[0]
 
-        dsDoc = testFontHandler.backend.dsDoc
+        dsDoc = getDesignspaceBackend(testFontHandler).dsDoc
         ufoPath = pathlib.Path(dsDoc.sources[0].path)
         glifPath = ufoPath / "glyphs" / "A_.glif"
         glifData = glifPath.read_text()
@@ -134,7 +236,7 @@ async def test_fontHandler_editGlyph(testFontHandler):
         # give the write queue the opportunity to complete
         await testFontHandler.finishWriting()
 
-        dsDoc = testFontHandler.backend.dsDoc
+        dsDoc = getDesignspaceBackend(testFontHandler).dsDoc
         ufoPath = pathlib.Path(dsDoc.sources[0].path)
         glifPath = ufoPath / "glyphs" / "A_.glif"
         glifData = glifPath.read_text()
@@ -145,6 +247,104 @@ async def test_fontHandler_editGlyph(testFontHandler):
     await asyncio.sleep(0)
 
 
+@pytest.mark.asyncio
+async def test_fontHandler_editGlyph_localDataSize(testFontHandler):
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        glyph = await testFontHandler.getGlyph(
+            "A", connection=MockRemoteObjectConnection()
+        )
+        sizeBefore = testFontHandler.localData.totalSize
+        layerName, layer = firstLayerItem(glyph)
+        path = layer.glyph.path
+        numPoints = path.contourInfo[0].endPoint + 1
+        contour = {
+            "coordinates": path.coordinates[: 2 * numPoints],
+            "pointTypes": path.pointTypes[:numPoints],
+            "isClosed": path.contourInfo[0].isClosed,
+        }
+
+        change = {
+            "p": ["glyphs", "A", "layers", layerName, "glyph", "path"],
+            "f": "deleteContour",
+            "a": [0],
+        }
+        rollbackChange = {
+            "p": ["glyphs", "A", "layers", layerName, "glyph", "path"],
+            "f": "insertContour",
+            "a": [0, contour],
+        }
+        await testFontHandler.editFinal(
+            change,
+            rollbackChange,
+            "Test edit",
+            False,
+            connection=MockRemoteObjectConnection(),
+        )
+
+        # The glyph was changed in place, its size must have been updated
+        assert sizeBefore > testFontHandler.localData.totalSize
+        assert approximateGlyphSize(glyph) == testFontHandler.localData.totalSize
+
+        await testFontHandler.editFinal(
+            rollbackChange,
+            change,
+            "Test edit",
+            False,
+            connection=MockRemoteObjectConnection(),
+        )
+        await testFontHandler.finishWriting()
+        assert sizeBefore == testFontHandler.localData.totalSize
+
+
+class BulkWritingDesignspaceBackend(DesignspaceBackend):
+    putGlyphsCalls: list
+
+    async def putGlyphs(self, glyphs):
+        self.putGlyphsCalls.append(sorted(glyphs))
+        await super().putGlyphs(glyphs)
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_editGlyphs_batched(testFontPath):
+    backend = BulkWritingDesignspaceBackend.fromPath(testFontPath)
+    backend.putGlyphsCalls = []
+    fontHandler = FontHandler(
+        backend=backend,
+        projectIdentifier="dummy",
+        metaInfoProvider=FileSystemProjectManager(),
+    )
+    async with aclosing(fontHandler):
+        await fontHandler.startTasks()
+        glyphNames = ["A", "B", "E"]
+        changes = []
+        rollbackChanges = []
+        for glyphName in glyphNames:
+            glyph = await fontHandler.getGlyph(
+                glyphName, connection=MockRemoteObjectConnection()
+            )
+            layerName, layer = firstLayerItem(glyph)
+            path = ["glyphs", glyphName, "layers", layerName, "glyph", "path"]
+            x, y = layer.glyph.path.coordinates[:2]
+            changes.append({"p": path, "f": "=xy", "a": [0, x + 7, y]})
+            rollbackChanges.append({"p": path, "f": "=xy", "a": [0, x, y]})
+
+        await fontHandler.editFinal(
+            {"c": changes},
+            {"c": rollbackChanges},
+            "Test edit",
+            False,
+            connection=MockRemoteObjectConnection(),
+        )
+        await fontHandler.finishWriting()
+
+    assert [glyphNames] == backend.putGlyphsCalls
+    for glyphName, change in zip(glyphNames, changes):
+        glyph = await backend.getGlyph(glyphName)
+        layer = glyph.layers[change["p"][3]]
+        assert change["a"][1:] == layer.glyph.path.coordinates[:2]
+
+
 @pytest.mark.asyncio
 async def test_fontHandler_editGlyph_delete_layer(testFontHandler):
     async with aclosing(testFontHandler):
@@ -157,7 +357,7 @@ async def test_fontHandler_editGlyph_delete_layer(testFontHandler):
         source = glyph.sources[sourceIndex]
         layerName = source.layerName
 
-        dsDoc = testFontHandler.backend.dsDoc
+        dsDoc = getDesignspaceBackend(testFontHandler).dsDoc
         ufoPath = pathlib.Path(dsDoc.sources[3].path)
         glifPath = ufoPath / "glyphs" / "A_.glif"
         assert glifPath.exists()
@@ -252,7 +452,9 @@ async def test_fontHandler_setData_unitsPerEm(testFontHandler, caplog):
         unitsPerEm = await testFontHandler.getData("unitsPerEm")
         assert 2000 == unitsPerEm
 
-    assert 2000 == await testFontHandler.backend.getUnitsPerEm()
+        await testFontHandler.finishWriting()
+        assert 2000 == await testFontHandler.backend.getUnitsPerEm()
+
     assert "write unitsPerEm to backend" == caplog.records[0].message
 
 
@@ -263,7 +465,7 @@ async def test_fontHandler_new_glyph(testFontHandler):
 
         newGlyphName = "testglyph"
 
-        dsDoc = testFontHandler.backend.dsDoc
+        dsDoc = getDesignspaceBackend(testFontHandler).dsDoc
         ufoPath = pathlib.Path(dsDoc.sources[0].path)
         glifPath = ufoPath / "glyphs" / f"{newGlyphName}.glif"
         assert not glifPath.exists()
@@ -347,5 +549,18 @@ async def test_getKerning(testFontHandler):
     assert "kern" in kerning
 
 
+async def test_findGlyphsThatUseGlyph(testFontHandler):
+    connection = MockRemoteObjectConnection()
+    usedBy = await testFontHandler.findGlyphsThatUseGlyph("dot", connection=connection)
+    transitiveUsedBy = await testFontHandler.findGlyphsThatUseGlyph(
+        "dot", True, connection=connection
+    )
+    assert "dieresis" in usedBy
+    assert "Adieresis" not in usedBy
+    assert set(usedBy) < set(transitiveUsedBy)
+    assert "Adieresis" in transitiveUsedBy
+    assert transitiveUsedBy == sorted(transitiveUsedBy)
+
+
 def firstLayerItem(glyph):
     return next(iter(glyph.layers.items()))
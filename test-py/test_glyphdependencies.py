@@ -34,3 +34,58 @@ def test_glyphdependencies(updates, expectedUsedBy, expectedMadeOf):
         deps.update(glyphName, componentNames)
     assert expectedUsedBy == deps.usedBy
     assert expectedMadeOf == deps.madeOf
+
+
+closureTestUpdates = [
+    ("Aacute", ["A", "acute"]),
+    ("Aacute.sc", ["Aacute"]),
+    ("Adieresis", ["A", "dieresis"]),
+    ("dieresis", ["dot"]),
+    ("quotedbl", ["quotesingle"]),
+]
+
+
+def test_glyphdependencies_closures():
+    deps = GlyphDependencies()
+    for glyphName, componentNames in closureTestUpdates:
+        deps.update(glyphName, componentNames)
+
+    assert {"Aacute", "Aacute.sc", "Adieresis"} == deps.usedByClosure("A")
+    assert {"Adieresis", "dieresis"} == deps.usedByClosure("dot")
+    assert set() == deps.usedByClosure("Aacute.sc")
+    assert {"A", "acute", "Aacute"} == deps.madeOfClosure("Aacute.sc")
+    assert {"Aacute.sc", "Aacute", "A", "acute", "quotedbl", "quotesingle"} == (
+        deps.componentsClosure(["Aacute.sc", "quotedbl"])
+    )
+
+    # Memoized closures must be invalidated on update()
+    deps.update("acute", ["dot"])
+    assert {"Aacute", "Aacute.sc", "Adieresis", "acute", "dieresis"} == (
+        deps.usedByClosure("dot")
+    )
+    assert {"A", "acute", "Aacute", "dot"} == deps.madeOfClosure("Aacute.sc")
+    deps.update("Aacute", ["A"])
+    assert {"A", "Aacute"} == deps.madeOfClosure("Aacute.sc")
+    assert {"Adieresis", "acute", "dieresis"} == deps.usedByClosure("dot")
+    assert {"Aacute", "Aacute.sc", "Adieresis"} == deps.usedByClosure("A")
+
+
+def test_glyphdependencies_topologicalOrder():
+    deps = GlyphDependencies()
+    for glyphName, componentNames in closureTestUpdates:
+        deps.update(glyphName, componentNames)
+
+    order = deps.topologicalOrder()
+    assert sorted(order) == sorted(set(deps.usedBy) | set(deps.madeOf))
+    for glyphName, componentNames in deps.madeOf.items():
+        for componentName in componentNames:
+            assert order.index(componentName) < order.index(glyphName)
+
+    assert ["B", "A", "Aacute", "Aacute.sc"] == deps.topologicalOrder(
+        ["Aacute.sc", "B", "Aacute", "A"]
+    )
+
+    deps.update("A", ["Aacute.sc"])  # a cycle
+    order = deps.topologicalOrder()
+    assert sorted(order) == sorted(set(deps.usedBy) | set(deps.madeOf))
+    assert order[-4:] == ["A", "Aacute", "Aacute.sc", "Adieresis"]
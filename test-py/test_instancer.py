@@ -6,6 +6,7 @@ import pytest
 from fontTools.misc.transform import DecomposedTransform, Transform
 from fontTools.pens.recordingPen import RecordingPointPen
 
+import fontra.core.instancer as instancerModule
 from fontra.backends import getFileSystemBackend
 from fontra.core.classes import (
     Component,
@@ -16,9 +17,13 @@ from fontra.core.classes import (
     StaticGlyph,
 )
 from fontra.core.instancer import (
+    FlattenedGlyph,
     FontInstancer,
     FontSourcesInstancer,
+    GlyphInstance,
     LocationCoordinateSystem,
+    MathWrapper,
+    flattenStaticGlyph,
     prependTransformToDecomposed,
 )
 from fontra.core.path import Contour, Path
@@ -525,29 +530,29 @@ penTestData = [
             ),
             (
                 "addPoint",
-                ((2.02188947796526, 114.44248589396727), "line", False, "test-name"),
+                ((2.021889477965267, 114.44248589396727), "line", False, "test-name"),
                 {},
             ),
             (
                 "addPoint",
-                ((298.9376689130037, 475.11570144436826), "line", False, None),
+                ((298.93766891300373, 475.1157014443683), "line", False, None),
                 {"identifier": "test-identifier"},
             ),
             (
                 "addPoint",
-                ((250.6543270564456, 483.6293573324498), "line", False, None),
+                ((250.6543270564456, 483.62935733244984), "line", False, None),
                 {},
             ),
             ("endPath", (), {}),
             ("beginPath", (), {}),
             (
                 "addPoint",
-                ((36.94006021365214, 196.77967457268454), "line", False, None),
+                ((36.940060213652146, 196.77967457268454), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((223.78536451437924, 163.83380620578296), "line", False, None),
+                ((223.78536451437918, 163.83380620578296), "line", False, None),
                 {},
             ),
             (
@@ -557,7 +562,7 @@ penTestData = [
             ),
             (
                 "addPoint",
-                ((58.92577449936642, 234.86004875623456), "line", False, None),
+                ((58.925774499366426, 234.86004875623456), "line", False, None),
                 {},
             ),
             ("endPath", (), {}),
@@ -569,39 +574,39 @@ penTestData = [
             ),
             (
                 "addPoint",
-                ((222.8227346564206, 75.50933952577302), "line", False, None),
+                ((222.82273465642064, 75.509339525773), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((351.9819728503015, 465.7625594873224), "line", False, None),
+                ((351.9819728503015, 465.76255948732245), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((289.59540369796736, 476.7629948627134), "line", False, None),
+                ((289.59540369796736, 476.76299486271347), "line", False, None),
                 {},
             ),
             ("endPath", (), {}),
             ("beginPath", (), {}),
             (
                 "addPoint",
-                ((243.16222620971098, 435.5098008676184), "line", False, None),
+                ((243.16222620971098, 435.5098008676185), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((302.7640816921785, 425.00038564577267), "line", False, None),
+                ((302.7640816921785, 425.0003856457727), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((328.6712245493213, 469.87287335328926), "line", False, None),
+                ((328.6712245493214, 469.8728733532893), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((269.0693690668538, 480.382288575135), "line", False, None),
+                ((269.0693690668538, 480.3822885751351), "line", False, None),
                 {},
             ),
             ("endPath", (), {}),
@@ -613,12 +618,12 @@ penTestData = [
             ),
             (
                 "addPoint",
-                ((522.1845334668569, 267.2812134714493), "line", False, None),
+                ((522.184533466857, 267.2812134714493), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((542.6968355311285, 280.9818419783232), "line", False, None),
+                ((542.6968355311285, 280.98184197832313), "line", False, None),
                 {},
             ),
             (
@@ -628,7 +633,7 @@ penTestData = [
             ),
             (
                 "addPoint",
-                ((635.9667775150534, 372.1816653876062), "line", False, None),
+                ((635.9667775150534, 372.18166538760613), "line", False, None),
                 {},
             ),
             (
@@ -643,29 +648,29 @@ penTestData = [
             ),
             (
                 "addPoint",
-                ((505.0421836303484, 395.57106728257884), "line", False, None),
+                ((505.0421836303484, 395.5710672825789), "line", False, None),
                 {},
             ),
             ("endPath", (), {}),
             ("beginPath", (), {}),
             (
                 "addPoint",
-                ((340.6464215090458, -47.82393177752656), "line", False, None),
+                ((340.6464215090458, -47.82393177752658), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((466.8478484379359, -25.5712152060554), "line", False, None),
+                ((466.84784843793597, -25.5712152060554), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((477.3224877982471, 15.693289543226811), "line", False, None),
+                ((477.32248779824715, 15.693289543226797), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((507.8306312017506, 25.452425380683934), "line", False, None),
+                ((507.8306312017505, 25.452425380683948), "line", False, None),
                 {},
             ),
             (
@@ -675,17 +680,17 @@ penTestData = [
             ),
             (
                 "addPoint",
-                ((449.0698602755021, 219.82208518555004), "line", False, None),
+                ((449.06986027550215, 219.82208518555007), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((443.1310925992931, 186.14166003253254), "line", False, None),
+                ((443.13109259929314, 186.14166003253257), "line", False, None),
                 {},
             ),
             (
                 "addPoint",
-                ((379.93605818796544, 174.9986704190156), "line", False, None),
+                ((379.93605818796544, 174.99867041901564), "line", False, None),
                 {},
             ),
             ("endPath", (), {}),
@@ -722,6 +727,174 @@ async def test_anchorInterpolation(instancer):
     _ = glyphInstancer.instantiate({"Weight": 400})
 
 
+@pytest.mark.parametrize("glyphName", ["A", "B", "E", "Aacute", "varcotest1"])
+@pytest.mark.parametrize(
+    "location",
+    [{}, {"weight": 300, "width": 200}, {"weight": 850, "width": 1000}],
+)
+async def test_flattenedGlyphInterpolation(testFont, glyphName, location, monkeypatch):
+    glyphInstancer = await FontInstancer(testFont).getGlyphInstancer(glyphName)
+    assert all(
+        isinstance(value, FlattenedGlyph)
+        for values in glyphInstancer.deltas.sources.values()
+        for value in values
+    )
+    instance = glyphInstancer.instantiate(location)
+
+    # Compare with the generic interpolation route
+    monkeypatch.setattr(instancerModule, "flattenStaticGlyphs", lambda glyphs: None)
+    glyphInstancer = await FontInstancer(testFont).getGlyphInstancer(glyphName)
+    assert all(
+        isinstance(value, MathWrapper)
+        for values in glyphInstancer.deltas.sources.values()
+        for value in values
+    )
+    expectedInstance = glyphInstancer.instantiate(location)
+    assert expectedInstance.glyph == instance.glyph
+
+
+async def test_flattenedGlyphUnflattenedLazily(testFont):
+    glyphInstancer = await FontInstancer(testFont).getGlyphInstancer("Aacute")
+    instance = glyphInstancer.instantiate({"weight": 300, "width": 200})
+    assert isinstance(instance.instantiatedGlyph, FlattenedGlyph)
+
+    # Decomposing only needs the path and the components
+    decomposedPath = await instance.getDecomposedPath()
+    assert "glyph" not in instance.__dict__
+
+    glyph = instance.glyph
+    assert glyph == instance.instantiatedGlyph.unflatten()
+    assert glyph.path is instance.path
+    assert glyph.components is instance.components
+    assert decomposedPath == await instance.getDecomposedPath()
+
+
+@pytest.fixture
+def cachingInstancer(testFont):
+    return FontInstancer(testFont, instanceCacheSize=64)
+
+
+async def test_instanceCache(cachingInstancer):
+    instancer = cachingInstancer
+    glyphInstancer = await instancer.getGlyphInstancer("Aacute", True)
+    location = {"weight": 300, "width": 200}
+    instance = glyphInstancer.instantiate(location)
+    assert instance is glyphInstancer.instantiate(dict(location))
+    assert instance is glyphInstancer.instantiate(
+        {"weight": 300.0000000001, "width": 200, "not-an-axis": 1}
+    )
+    assert instance is not glyphInstancer.instantiate({"weight": 301, "width": 200})
+
+    path = await instance.getDecomposedPath()
+    assert path is not await instance.getDecomposedPath()
+    assert path == await instance.getDecomposedPath()
+
+    # Dropping a component glyph invalidates the instances of its users
+    instancer.dropGlyphInstancerFromCache("acute")
+    assert instance is not glyphInstancer.instantiate(location)
+    assert path == await glyphInstancer.instantiate(location).getDecomposedPath()
+
+    instance = glyphInstancer.instantiate(location)
+    instancer.dropGlyphInstancerFromCache("Aacute")
+    assert instance is not glyphInstancer.instantiate(location)
+
+
+async def test_instanceCache_nestedComponents(cachingInstancer):
+    instancer = cachingInstancer
+    glyphInstancer = await instancer.getGlyphInstancer("nestedcomponents", True)
+    instance = glyphInstancer.instantiate({"weight": 500})
+    path = await instance.getDecomposedPath()
+    transform = Transform().translate(100, 20).scale(2)
+    assert path.transformed(transform) == await instance.getDecomposedPath(transform)
+
+    # The base glyphs' instances are cached, their decomposed paths memoized
+    baseGlyphNames = set(glyphInstancer.componentNames)
+    assert baseGlyphNames
+    assert baseGlyphNames <= {glyphName for glyphName, _ in instancer._instanceCache}
+    assert baseGlyphNames <= {
+        glyphName for glyphName, _ in instancer._decomposedPathCache
+    }
+
+
+async def test_decomposedPathCache(testFont, monkeypatch):
+    decomposedGlyphNames = []
+    getDecomposedPath = GlyphInstance.getDecomposedPath
+
+    async def recordingGetDecomposedPath(self, transform=None):
+        decomposedGlyphNames.append(self.glyphName)
+        return await getDecomposedPath(self, transform)
+
+    monkeypatch.setattr(GlyphInstance, "getDecomposedPath", recordingGetDecomposedPath)
+
+    # The memo is independent of the instance cache, which is off
+    instancer = FontInstancer(testFont)
+    location = {"weight": 300, "width": 200}
+
+    async def decompose(glyphName):
+        glyphInstancer = await instancer.getGlyphInstancer(glyphName)
+        return await glyphInstancer.instantiate(location).getDecomposedPath()
+
+    path = await decompose("Aacute")
+    await decompose("Adieresis")
+    assert path == await decompose("Aacute")
+    assert path is not await decompose("Aacute")
+
+    # "A" was decomposed once, and reused for "Adieresis" and "Aacute"
+    assert [
+        "Aacute",
+        "A",
+        "acute",
+        "Adieresis",
+        "dieresis",
+        "dot",
+        "Aacute",
+        "Aacute",
+    ] == decomposedGlyphNames
+
+    # Dropping a component glyph invalidates the paths of the glyphs using it
+    decomposedGlyphNames.clear()
+    instancer.dropGlyphInstancerFromCache("dot")
+    await decompose("Adieresis")
+    assert ["Adieresis", "dieresis", "dot"] == decomposedGlyphNames
+
+    # Without the memo, each component is decomposed each time
+    decomposedGlyphNames.clear()
+    instancer = FontInstancer(testFont, decomposedPathCacheSize=0)
+    await decompose("Aacute")
+    await decompose("Aacute")
+    assert ["Aacute", "A", "acute"] * 2 == decomposedGlyphNames
+
+
+async def test_instanceCache_bounded(testFont):
+    instancer = FontInstancer(testFont, instanceCacheSize=3)
+    for glyphName in ["A", "B", "C"]:
+        glyphInstancer = await instancer.getGlyphInstancer(glyphName, True)
+        for weight in [100, 200]:
+            glyphInstancer.instantiate({"weight": weight})
+    assert 3 == len(instancer._instanceCache)
+    assert ["B", "C", "C"] == [glyphName for glyphName, _ in instancer._instanceCache]
+
+
+async def test_instanceCache_disabled(testFont):
+    # The cache is off by default
+    instancer = FontInstancer(testFont)
+    glyphInstancer = await instancer.getGlyphInstancer("A", True)
+    assert glyphInstancer.instantiate({}) is not glyphInstancer.instantiate({})
+
+    # Instancers that are not in the glyph instancer cache don't cache instances
+    instancer = FontInstancer(testFont, instanceCacheSize=64)
+    glyphInstancer = await instancer.getGlyphInstancer("A")
+    assert glyphInstancer.instantiate({}) is not glyphInstancer.instantiate({})
+
+
+def test_flattenStaticGlyph_unsupported():
+    assert flattenStaticGlyph(StaticGlyph(path=Path())) is None
+    assert flattenStaticGlyph(StaticGlyph(guidelines=[Guideline(x=10)])) is None
+    flattened = flattenStaticGlyph(StaticGlyph(xAdvance=500))
+    assert [500] == flattened.values
+    assert StaticGlyph(xAdvance=500) == flattened.unflatten()
+
+
 testData_FontSourcesInstancer = [
     (
         {},
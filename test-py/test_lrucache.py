@@ -1,4 +1,4 @@
-from fontra.core.lrucache import LRUCache
+from fontra.core.lrucache import LRUCache, SizedLRUCache
 
 
 def test_lruCache():
@@ -19,3 +19,69 @@ def test_lruCache():
     _ = cache["a"]
     cache["f"] = None
     assert ["c", "e", "a", "f"] == list(cache.keys())
+
+
+def test_sizedLRUCache():
+    cache = SizedLRUCache(10, len, lambda key: key.startswith("pinned"))
+    cache["pinned"] = "x" * 100
+    cache["a"] = "aaaa"
+    cache["b"] = "bbbb"
+    assert 8 == cache.totalSize
+    assert ["pinned", "a", "b"] == list(cache.keys())
+
+    _ = cache["a"]
+    cache["c"] = "cccc"
+    assert ["pinned", "a", "c"] == list(cache.keys())
+    assert 8 == cache.totalSize
+    assert 1 == cache.evictions
+
+    assert cache.get("b") is None
+    assert "cccc" == cache.get("c")
+    assert (2, 1) == (cache.hits, cache.misses)
+
+    assert "aaaa" == cache.pop("a")
+    assert cache.pop("a", None) is None
+    assert 4 == cache.totalSize
+
+    cache["d"] = "d" * 20
+    assert ["pinned", "d"] == list(cache.keys())
+    assert 20 == cache.totalSize
+
+    cache["e"] = "e"
+    assert ["pinned", "e"] == list(cache.keys())
+    assert 1 == cache.totalSize
+
+    value = ["x"]
+    cache["f"] = value
+    cache.updateSize("f")
+    assert 2 == cache.totalSize
+    value.extend("xxxx")
+    cache.updateSize("f")
+    assert 6 == cache.totalSize
+    value.extend("xxxxx")
+    cache.updateSize("f")
+    assert ["pinned", "f"] == list(cache.keys())
+    assert 10 == cache.totalSize
+    cache.updateSize("pinned")
+    cache.updateSize("missing")
+    assert 10 == cache.totalSize
+
+    cache.clear()
+    assert 0 == cache.totalSize
+    assert [] == list(cache.keys())
+
+
+def test_sizedLRUCache_updateSizeOfOldestItem():
+    cache = SizedLRUCache(100, len)
+    a = ["a"] * 10
+    cache["a"] = a
+    cache["b"] = ["b"] * 10
+    cache["c"] = ["c"] * 10
+
+    # Growing the least recently used item makes it the most recently used
+    # one, and evicts the others
+    a.extend(["a"] * 190)
+    cache.updateSize("a")
+    assert ["a"] == list(cache.keys())
+    assert 200 == cache.totalSize
+    assert 2 == cache.evictions
@@ -2,15 +2,18 @@ import operator
 from copy import deepcopy
 
 import pytest
+from fontTools.misc.transform import Transform
 from fontTools.pens.recordingPen import RecordingPointPen
 
 from fontra.core.classes import structure, unstructure
 from fontra.core.path import (
     Contour,
+    ContourInfo,
     InterpolationError,
     PackedPath,
     PackedPathPointPen,
     Path,
+    PointType,
 )
 
 pathTestData = [
@@ -473,3 +476,34 @@ def test_danglingOffCurveBug():
         ),
         ("endPath", (), {}),
     ]
+
+
+@pytest.mark.parametrize(
+    "transform",
+    [
+        Transform(),
+        Transform().translate(10, -20.5),
+        Transform().scale(2, 0.5).rotate(0.3).translate(5, 6),
+    ],
+)
+def test_transformed(transform):
+    path = structure(pathTestData[0], PackedPath)
+    expectedCoordinates = []
+    for x, y in zip(path.coordinates[0::2], path.coordinates[1::2]):
+        expectedCoordinates.extend(transform.transformPoint((x, y)))
+    transformedPath = path.transformed(transform)
+    assert transformedPath.coordinates == pytest.approx(expectedCoordinates)
+    assert transformedPath.pointTypes == path.pointTypes
+    assert transformedPath.contourInfo == path.contourInfo
+
+
+def test_getControlBounds():
+    assert PackedPath().getControlBounds() is None
+    path = PackedPath(
+        coordinates=[10, 20, -5, 30, 40, -15],
+        pointTypes=[PointType.ON_CURVE] * 3,
+        contourInfo=[ContourInfo(endPoint=2, isClosed=True)],
+    )
+    assert path.getControlBounds() == (-5, -15, 40, 30)
+    path.moveAllWithFirstPoint(0, 0)
+    assert path.coordinates == [0, 0, -15, 10, 30, -35]
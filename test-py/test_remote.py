@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+
+from fontra.core.binarymessage import decodeBinaryMessage
+from fontra.core.remote import RemoteObjectConnection
+
+
+class MockWebSocket:
+    def __init__(self):
+        self.sentData = []
+
+    async def send_str(self, data):
+        self.sentData.append(data)
+        # Give other tasks a chance to send messages, as a real websocket would
+        await asyncio.sleep(0)
+
+    async def send_bytes(self, data):
+        self.sentData.append(data)
+        await asyncio.sleep(0)
+
+
+def decodeMessages(sentData):
+    messages = []
+    chunks = []
+    for data in sentData:
+        message = (
+            decodeBinaryMessage(data) if isinstance(data, bytes) else json.loads(data)
+        )
+        if "chunked-message-id" in message:
+            chunks.append(message["chunk"])
+            if message["more"]:
+                continue
+            data = b"".join(chunks)
+            chunks = []
+            message = (
+                json.loads(data)
+                if message["encoding"] == "json"
+                else decodeBinaryMessage(data)
+            )
+        messages.append(message)
+    return messages
+
+
+@pytest.mark.parametrize("encoding", ["json", "binary"])
+@pytest.mark.parametrize("numGlyphs, expectChunks", [(10, False), (2000, True)])
+async def test_sendMessage_chunked(encoding, numGlyphs, expectChunks):
+    websocket = MockWebSocket()
+    connection = RemoteObjectConnection(
+        websocket, "test", None, False, maxChunkSize=0x2000
+    )
+    connection.encoding = encoding
+
+    message = {
+        "client-call-id": 0,
+        "return-value": {
+            f"glyph{i}": {"path": {"coordinates": [i / 3, i / 7]}}
+            for i in range(numGlyphs)
+        },
+    }
+    await connection.sendMessage(message)
+
+    assert expectChunks == (len(websocket.sentData) > 1)
+    assert [message] == decodeMessages(websocket.sentData)
+
+
+@pytest.mark.parametrize("encoding", ["json", "binary"])
+async def test_sendMessage_serverCallDoesNotOvertakeChunkedReply(encoding):
+    websocket = MockWebSocket()
+    connection = RemoteObjectConnection(websocket, "test", None, False)
+    connection.encoding = encoding
+
+    largeReply = {
+        "client-call-id": 0,
+        "return-value": {
+            f"glyph{i}": {"path": {"coordinates": [i / 3, i / 7], "pointTypes": [0]}}
+            for i in range(50000)
+        },
+    }
+    smallReply = {"client-call-id": 1, "return-value": "small"}
+
+    sendLargeReply = asyncio.create_task(connection.sendMessage(largeReply))
+    while not websocket.sentData:
+        await asyncio.sleep(0)
+    # The first chunk of the large reply is sent, and more are to come
+    externalChange = asyncio.create_task(
+        connection.proxy.externalChange({"p": ["glyphs"]}, False)
+    )
+    await connection.sendMessage(smallReply)
+    await sendLargeReply
+    while not connection.callReturnFutures:
+        await asyncio.sleep(0)
+    for future in connection.callReturnFutures.values():
+        future.set_result(None)
+    await externalChange
+
+    messages = decodeMessages(websocket.sentData)
+    assert len(websocket.sentData) > 3
+    # The small reply was sent between the chunks of the large reply, the
+    # server call had to wait for the large reply to be complete
+    assert [smallReply, largeReply] == messages[:2]
+    assert "externalChange" == messages[2]["method-name"]
@@ -1,7 +1,10 @@
 import logging
+import os
 import pathlib
 import shutil
 import subprocess
+import time
+from collections import Counter
 
 import pytest
 import yaml
@@ -9,11 +12,19 @@ from fontTools.misc.arrayTools import scaleRect
 from testSupport import directoryTreeToList
 
 from fontra.backends import getFileSystemBackend
+from fontra.core.instancer import GlyphInstancer
 from fontra.core.path import PackedPath
 from fontra.core.protocols import ReadableFontBackend
 from fontra.workflow.actions import FilterActionProtocol, getActionClass
 from fontra.workflow.actions import glyph as _  # noqa  for test_scaleAction
-from fontra.workflow.workflow import Workflow, substituteStrings
+from fontra.workflow.actions.glyph import ShallowDecomposeComposites
+from fontra.workflow.stepcache import StepCache
+from fontra.workflow.workflow import (
+    Workflow,
+    chainWorkflows,
+    processOutputs,
+    substituteStrings,
+)
 
 dataDir = pathlib.Path(__file__).resolve().parent / "data"
 workflowDataDir = dataDir / "workflow"
@@ -129,6 +140,48 @@ async def test_subsetAction(testFontraFont, tmp_path) -> None:
     assert expectedGlyphMap == glyphMap
 
 
+@pytest.mark.parametrize(
+    "arguments, expectedLog",
+    [
+        ({}, "memory-cache: 2 hits, 4 misses, 0 evictions, 4 glyphs cached"),
+        (
+            {"maxGlyphs": 2},
+            "memory-cache: 1 hits, 5 misses, 3 evictions, 2 glyphs cached",
+        ),
+        (
+            {"maxBytes": 1},
+            "memory-cache: 0 hits, 6 misses, 5 evictions, 1 glyphs cached",
+        ),
+        (
+            {"maxBytes": 10**9, "maxGlyphs": 2},
+            "memory-cache: 1 hits, 5 misses, 3 evictions, 2 glyphs cached",
+        ),
+    ],
+)
+async def test_memoryCacheAction(testFontraFont, arguments, expectedLog, caplog):
+    caplog.set_level(logging.INFO)
+    action = getActionClass("filter", "memory-cache")(**arguments)
+
+    async with action.connect(testFontraFont) as action:
+        for glyphName in ["A", "B", "A", "C", "D", "A"]:
+            glyph = await action.getGlyph(glyphName)
+            assert glyph == await testFontraFont.getGlyph(glyphName)
+
+        axes = await action.getAxes()
+        assert axes == await testFontraFont.getAxes()
+        assert axes is await action.getAxes()
+        assert await action.getSources() is await action.getSources()
+        assert await action.getKerning() is await action.getKerning()
+        assert await action.getFeatures() is await action.getFeatures()
+
+        # The statistics are logged when the next step closes its input
+        await action.aclose()
+
+    assert [expectedLog] == [
+        record.message for record in caplog.records if "memory-cache" in record.message
+    ]
+
+
 @pytest.mark.parametrize(
     "configYAMLSources, substitutions",
     [
@@ -1666,6 +1719,173 @@ async def test_workflow_actions(
     assert expectedLog == record_tuples
 
 
+async def test_workflow_numProcesses(tmpdir):
+    tmpdir = pathlib.Path(tmpdir)
+    config = yaml.safe_load(
+        """
+        steps:
+        - input: fontra-read
+          source: "test-py/data/workflow/input-variable-composites.fontra"
+        - filter: decompose-composites
+          onlyVariableComposites: true
+        - fork:
+          steps:
+          - filter: subset-glyphs
+            glyphNames: ["T_2FF0_80B2"]
+          - output: fontra-write
+            destination: "output-subset.fontra"
+        - output: fontra-write
+          destination: "output-all.fontra"
+        """
+    )
+
+    for numProcesses, outputDir in [(1, tmpdir / "single"), (2, tmpdir / "multi")]:
+        outputDir.mkdir()
+        workflows = [Workflow(config=config, parentDir=pathlib.Path())]
+        async with chainWorkflows(workflows) as endPoints:
+            assert len(endPoints.outputs) == 2
+            await processOutputs(
+                workflows, endPoints.outputs, outputDir, numProcesses=numProcesses
+            )
+
+    for destination in ["output-subset.fontra", "output-all.fontra"]:
+        expectedLines = directoryTreeToList(tmpdir / "single" / destination)
+        resultLines = directoryTreeToList(tmpdir / "multi" / destination)
+        assert expectedLines == resultLines
+
+
+async def test_workflow_stepCache(tmpdir, caplog):
+    caplog.set_level(logging.INFO, logger="fontra.workflow.stepcache")
+    tmpdir = pathlib.Path(tmpdir)
+    sourcePath = tmpdir / "MutatorSans.fontra"
+    shutil.copytree(commonFontsDir / "MutatorSans.fontra", sourcePath)
+    config = yaml.safe_load(
+        f"""
+        steps:
+        - input: fontra-read
+          source: {sourcePath}
+        - filter: subset-glyphs
+          glyphNames: ["A", "Aacute", "Adieresis", "B", "C"]
+        - filter: decompose-composites
+        - filter: round-coordinates
+        - output: fontra-write
+          destination: "output.fontra"
+        """
+    )
+
+    async def runWorkflow(outputDir):
+        caplog.clear()
+        outputDir.mkdir()
+        workflow = Workflow(
+            config=config, parentDir=tmpdir, stepCacheDir=tmpdir / "cache"
+        )
+        async with workflow.endPoints() as endPoints:
+            await processOutputs([workflow], endPoints.outputs, outputDir)
+        return sorted(
+            record.message
+            for record in caplog.records
+            if record.name == "fontra.workflow.stepcache"
+        )
+
+    # On a cache miss, the glyph that was read to compute the cache key is
+    # handed to the action, so the previous step's glyphs are read only once
+    assert [
+        "step-cache: decompose-composites: 0 hits, 8 misses",
+        "step-cache: round-coordinates: 0 hits, 8 misses",
+    ] == await runWorkflow(tmpdir / "run1")
+
+    assert [
+        "step-cache: decompose-composites: 8 hits, 0 misses",
+        "step-cache: round-coordinates: 8 hits, 0 misses",
+    ] == await runWorkflow(tmpdir / "run2")
+
+    assert directoryTreeToList(
+        tmpdir / "run1" / "output.fontra"
+    ) == directoryTreeToList(tmpdir / "run2" / "output.fontra")
+
+    # Changing "A" only invalidates "A" and the glyphs that use it as a component
+    font = getFileSystemBackend(sourcePath)
+    glyph = await font.getGlyph("A")
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance += 10
+    await font.putGlyph("A", glyph, [ord("A")])
+    await font.aclose()
+
+    # The decomposed "Aacute" and "Adieresis" do not change, as only the
+    # advance of "A" changed, so round-coordinates only needs to process "A"
+    assert [
+        "step-cache: decompose-composites: 5 hits, 3 misses",
+        "step-cache: round-coordinates: 7 hits, 1 misses",
+    ] == await runWorkflow(tmpdir / "run3")
+
+    # Pruning removes the cache files that were not used recently
+    stepCache = StepCache(cacheDir=tmpdir / "cache")
+    cacheFiles = sorted((tmpdir / "cache").glob("*/*.json"))
+    assert cacheFiles
+    assert 0 == stepCache.prune(3600)
+    oldTime = time.time() - 7200
+    os.utime(cacheFiles[0], (oldTime, oldTime))
+    assert 1 == stepCache.prune(3600)
+    assert not cacheFiles[0].exists()
+    assert cacheFiles[1:] == sorted((tmpdir / "cache").glob("*/*.json"))
+
+
+async def test_workflow_instanceCache(tmpdir, monkeypatch):
+    tmpdir = pathlib.Path(tmpdir)
+    config = yaml.safe_load(
+        f"""
+        steps:
+        - input: fontra-read
+          source: {commonFontsDir / "MutatorSans.fontra"}
+        - filter: subset-glyphs
+          glyphNames: ["Aacute", "Adieresis", "dieresis"]
+        - filter: shallow-decompose-composites
+        - output: fontra-write
+          destination: "output.fontra"
+        """
+    )
+
+    instantiateCounts: Counter[str] = Counter()
+    interpolateCounts: Counter[str] = Counter()
+    instantiate = GlyphInstancer.instantiate
+    _instantiate = GlyphInstancer._instantiate
+
+    def countingInstantiate(self, location, **kwargs):
+        instantiateCounts[self.glyph.name] += 1
+        return instantiate(self, location, **kwargs)
+
+    def countingInterpolate(self, location):
+        interpolateCounts[self.glyph.name] += 1
+        return _instantiate(self, location)
+
+    monkeypatch.setattr(GlyphInstancer, "instantiate", countingInstantiate)
+    monkeypatch.setattr(GlyphInstancer, "_instantiate", countingInterpolate)
+
+    async def runWorkflow(outputDir):
+        instantiateCounts.clear()
+        interpolateCounts.clear()
+        outputDir.mkdir()
+        workflow = Workflow(config=config, parentDir=tmpdir)
+        async with workflow.endPoints() as endPoints:
+            await processOutputs([workflow], endPoints.outputs, outputDir)
+
+    await runWorkflow(tmpdir / "cached")
+
+    # Glyphs that are instantiated more than once at the same location, as a
+    # component or as a component and a glyph of its own, are interpolated
+    # only once
+    instanceCacheHits = instantiateCounts - interpolateCounts
+    assert {"A": 4, "dieresis": 4, "dot": 4} == instanceCacheHits
+
+    monkeypatch.setattr(ShallowDecomposeComposites, "instanceCacheSize", 0)
+    await runWorkflow(tmpdir / "uncached")
+
+    assert instantiateCounts == interpolateCounts
+    assert directoryTreeToList(
+        tmpdir / "cached" / "output.fontra"
+    ) == directoryTreeToList(tmpdir / "uncached" / "output.fontra")
+
+
 @pytest.mark.parametrize(
     "sourceDict, substitutions, expectedDict",
     [
@@ -77,6 +77,11 @@ interface RemoteFont {
 
   getGlyph(identifier: string): Promise<IntoVariableGlyph>;
 
+  /**
+   * Get many glyphs in a single call. Glyphs that don't exist are null.
+   */
+  getGlyphs(identifiers: string[]): Promise<Record<string, IntoVariableGlyph | null>>;
+
   getSources(): Promise<Record<string, FontSource>>;
 
   getUnitsPerEm(): Promise<number>;